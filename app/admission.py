@@ -0,0 +1,143 @@
+import threading
+from contextlib import contextmanager
+
+from app.metrics import metrics
+from src.utils.config import (
+    ADMISSION_EWMA_ALPHA,
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_RETRY_AFTER_S,
+    MICROBATCH_MAX_SIZE,
+)
+
+
+STAGES = ("features", "model", "cascade", "rules")
+LATENCY_MS_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+QUEUE_DEPTH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+# Cheapest last: each level skips more work than the one before
+DEGRADATION_LEVELS = ("none", "skip_cascade", "rules", "review")
+
+
+class Overloaded(Exception):
+    """
+    Raised by `AdmissionController.admit` when the service is past its
+    in-flight limit; the request should be shed with 503 + Retry-After.
+    """
+
+    def __init__(self, in_flight: int, retry_after_s: int):
+        super().__init__(f"Service overloaded ({in_flight} transactions in flight)")
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """
+    Deadline-aware admission for the scoring endpoints.
+
+    Tracks transactions in flight (queued on the micro-batcher or being
+    scored) and an EWMA of every stage's latency. `admit` sheds requests
+    past `max_in_flight`; `plan` picks the most complete scoring path
+    whose estimated latency fits the time a request has left.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        retry_after_s: int = ADMISSION_RETRY_AFTER_S,
+        alpha: float = ADMISSION_EWMA_ALPHA,
+        batch_size: int = MICROBATCH_MAX_SIZE,
+    ):
+        self.max_in_flight = max_in_flight
+        self.retry_after_s = retry_after_s
+        self.alpha = alpha
+        self.batch_size = batch_size
+
+        self.in_flight = 0
+        self.estimates_ms = {stage: 0.0 for stage in STAGES}
+        self._lock = threading.Lock()
+
+        self._latency = {
+            stage: metrics.histogram(f"admission_{stage}_latency_ms", LATENCY_MS_BUCKETS)
+            for stage in STAGES
+        }
+        self._queue_depth = metrics.histogram("admission_queue_depth", QUEUE_DEPTH_BUCKETS)
+        self._shed = metrics.counter("admission_shed_total")
+        self._degradations = {
+            level: metrics.counter(f"degradation_{level}_total") for level in DEGRADATION_LEVELS
+        }
+
+    @contextmanager
+    def admit(self, n: int = 1):
+        """
+        Hold `n` in-flight slots for the duration of the block, or raise
+        Overloaded if they would take the service past its limit. An idle
+        service admits anything, so a batch larger than the limit still runs.
+        """
+        with self._lock:
+            if self.in_flight and self.in_flight + n > self.max_in_flight:
+                in_flight = self.in_flight
+                self._shed.inc()
+                raise Overloaded(in_flight, self.retry_after_s)
+            self.in_flight += n
+            depth = self.in_flight
+
+        self._queue_depth.observe(depth)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= n
+
+    def observe(self, stage: str, latency_ms: float):
+        self._latency[stage].observe(latency_ms)
+        with self._lock:
+            previous = self.estimates_ms[stage]
+            # First observation seeds the estimate
+            self.estimates_ms[stage] = (
+                latency_ms if previous == 0.0
+                else self.alpha * latency_ms + (1 - self.alpha) * previous
+            )
+
+    def estimate_ms(self, stage: str) -> float:
+        """
+        Expected latency of `stage` for a request admitted now. Model
+        calls wait behind the micro-batches already queued ahead of them;
+        "model" samples are per-batch scoring time only (see
+        MicroBatcher.on_scored), so queueing is counted once, here.
+        """
+        with self._lock:
+            estimate = self.estimates_ms[stage]
+            if stage == "model":
+                batches_ahead = max(self.in_flight - 1, 0) // self.batch_size
+                estimate *= 1 + batches_ahead
+            return estimate
+
+    def plan(self, remaining_ms: float = None, cascade: bool = False) -> str:
+        """
+        Degradation level for a request with `remaining_ms` left before
+        its deadline (None = no deadline): the full path if it fits, then
+        Isolation Forest only, then the rule-only score, else a review
+        verdict without scoring.
+        """
+        if remaining_ms is None:
+            level = "none"
+        else:
+            model_ms = self.estimate_ms("model")
+            if cascade and remaining_ms >= self.estimate_ms("cascade"):
+                level = "none"
+            elif remaining_ms >= model_ms:
+                level = "skip_cascade" if cascade else "none"
+            elif remaining_ms >= self.estimate_ms("rules"):
+                level = "rules"
+            else:
+                level = "review"
+
+        self._degradations[level].inc()
+        return level
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "estimates_ms": {k: round(v, 4) for k, v in self.estimates_ms.items()},
+            }
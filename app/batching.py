@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import numpy as np
+
+from app.logger import logger
+from app.metrics import metrics
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row scoring requests and scores them as one
+    matrix, so per-call model overhead is paid once per batch.
+
+    A batch is flushed when it holds `max_batch_size` rows or when
+    `max_wait_us` has passed since its first row arrived.
+
+    Each row can carry its own score function (e.g. the predict_batch of
+    the model version its features were built for); a flushed batch is
+    scored once per distinct function, so a model swap never applies a
+    new model to rows queued for the old one.
+
+    `on_scored`, if given, receives every batch's scoring time in ms
+    (the model call only, without time spent queued).
+    """
+
+    def __init__(
+        self,
+        score_fn,
+        max_batch_size: int = 64,
+        max_wait_us: int = 2000,
+        on_scored=None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_us = max_wait_us
+        self.on_scored = on_scored
+
+        self._queue = None
+        self._task = None
+        self._loop = None
+
+        self._batch_sizes = metrics.histogram("microbatch_size", BATCH_SIZE_BUCKETS)
+        self._batch_latency = metrics.histogram(
+            "microbatch_score_latency_ms", LATENCY_MS_BUCKETS
+        )
+        self._batches = metrics.counter("microbatch_batches_total")
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, x: np.ndarray, score_fn=None) -> float:
+        """
+        Queue one feature vector and wait for its score, computed by
+        `score_fn` (default: the batcher's).
+        """
+        self._ensure_running()
+        future = self._loop.create_future()
+        await self._queue.put((x, score_fn or self.score_fn, future))
+        return await future
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_us / 1_000_000
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without yielding
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _score(self, score_fn, rows: list):
+        futures = [future for _, future in rows]
+
+        try:
+            X = np.vstack([x for x, _ in rows])
+
+            start = time.perf_counter()
+            scores = await self._loop.run_in_executor(None, score_fn, X)
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._batch_latency.observe(latency_ms)
+        except Exception as e:
+            logger.exception("Micro-batch scoring failed")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches.inc()
+        self._batch_sizes.observe(len(rows))
+        if self.on_scored is not None:
+            self.on_scored(latency_ms)
+
+        for future, score in zip(futures, scores):
+            # Caller may have gone away (client disconnect / cancel)
+            if not future.done():
+                future.set_result(float(score))
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # One model call per score function (one group outside a swap)
+            groups = {}
+            for x, score_fn, future in batch:
+                groups.setdefault(score_fn, []).append((x, future))
+
+            for score_fn, rows in groups.items():
+                await self._score(score_fn, rows)
@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+
+from app.metrics import metrics
+
+
+STAGES = ("isolation_forest", "one_class_svm", "autoencoder")
+LATENCY_MS_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+_latency = {
+    stage: metrics.histogram(f"cascade_{stage}_latency_ms", LATENCY_MS_BUCKETS)
+    for stage in STAGES
+}
+_escalation = metrics.ratio("cascade_escalation_rate")
+
+
+def score_cascade(service, X: np.ndarray, band: float) -> list:
+    """
+    Cheap-first scoring of a raw feature matrix.
+
+    The Isolation Forest scores every row. Rows whose score lies within
+    `band` of its threshold are uncertain and escalate to the OCSVM and
+    the autoencoder; their verdict is the majority vote of the three
+    models. Rows outside the band keep the Isolation Forest decision.
+
+    Returns one dict per row: per-model scores and flags, the stages
+    that ran, and the combined vote.
+    """
+    X = np.asarray(X, dtype=np.float64)
+
+    start = time.perf_counter()
+    iso_scores = service.predict_batch(X)
+    _latency["isolation_forest"].observe((time.perf_counter() - start) * 1000)
+
+    escalate = np.abs(iso_scores - service.threshold) <= band
+    _escalation.observe(int(escalate.sum()), len(X))
+
+    svm_scores = np.full(len(X), np.nan)
+    ae_errors = np.full(len(X), np.nan)
+
+    if escalate.any():
+        ensemble = service.ensemble()
+        X_escalated = X[escalate]
+
+        start = time.perf_counter()
+        X_scaled = (X_escalated - ensemble["scaler_mean"]) / ensemble["scaler_scale"]
+        svm_scores[escalate] = ensemble["one_class_svm"].decision_function(X_scaled)
+        _latency["one_class_svm"].observe((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        ae_errors[escalate] = ensemble["autoencoder"].reconstruction_error(X_escalated)
+        _latency["autoencoder"].observe((time.perf_counter() - start) * 1000)
+
+    results = []
+    for i in range(len(X)):
+        iso_flag = bool(iso_scores[i] >= service.threshold)
+        result = {
+            "stages": ["isolation_forest"],
+            "scores": {"isolation_forest": round(float(iso_scores[i]), 6)},
+            "flags": {"isolation_forest": iso_flag},
+        }
+
+        if escalate[i]:
+            result["stages"] += ["one_class_svm", "autoencoder"]
+            result["scores"]["one_class_svm"] = round(float(svm_scores[i]), 6)
+            result["scores"]["autoencoder"] = round(float(ae_errors[i]), 6)
+            # Same flag rules as run_one_class_svm / run_autoencoder
+            result["flags"]["one_class_svm"] = bool(
+                svm_scores[i] < ensemble["one_class_svm_threshold"]
+            )
+            result["flags"]["autoencoder"] = bool(
+                ae_errors[i] > ensemble["autoencoder_threshold"]
+            )
+
+        result["votes"] = sum(result["flags"].values())
+        result["escalated"] = bool(escalate[i])
+        results.append(result)
+
+    return results
@@ -1,21 +1,96 @@
-from fastapi import FastAPI, HTTPException
-import pandas as pd
+import time
+
+# Startup clock: time-to-first-prediction is measured from here
+_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+import json
 import math
+from contextlib import asynccontextmanager
+from typing import Optional
 from app.schemas import TransactionRequest
-from app.model_loader import ModelService
+from app.model_registry import ModelRegistry
+from app.admission import AdmissionController, Overloaded
+from app.batching import MicroBatcher
+from app.cascade import score_cascade
+from app.rules import score_rules
+from app.metrics import metrics
 from app.logger import logger
 
-# Reuse existing feature engineering
-from src.feature_engineering.preprocess import build_features
+# Online counterpart of the batch feature engineering
+from src.feature_engineering.online_features import (
+    CustomerStateStore,
+    FeatureVectorBuilder,
+    build_online_feature_matrix,
+    to_epoch_us,
+)
+from src.feature_engineering.merchant_sketches import MerchantSketchStore
+from src.feature_engineering.reference_index import ReferenceIndex
+from src.utils.config import (
+    ONLINE_STATE_MAX_CUSTOMERS,
+    MICROBATCH_MAX_SIZE,
+    MICROBATCH_MAX_WAIT_US,
+    CASCADE_BAND,
+)
+
+
+# Versioned models (models/manifest_<version>.json), hot-reloadable
+registry = ModelRegistry()
+state_store = CustomerStateStore(max_customers=ONLINE_STATE_MAX_CUSTOMERS)
+# Per-merchant amount sketches; reported with each response as merchant_risk
+merchant_store = MerchantSketchStore()
+_feature_builders = {}
+
+# Merchant / customer reference tables (memory-mapped, shared by workers)
+reference_index = ReferenceIndex.load()
+logger.info(
+    f"Reference index loaded | customers={reference_index.n_customers} | "
+    f"merchants={reference_index.n_merchants}"
+)
+
+# Registry warm-up already scored a batch, so the service is ready
+logger.info(
+    f"STARTUP | time_to_first_prediction={time.perf_counter() - _STARTED:.3f}s | "
+    f"model={registry.active.version}"
+)
+
+# In-flight limit (503 + Retry-After past it) and per-stage latency
+# estimates that decide how far a request with a deadline is degraded
+admission = AdmissionController()
+
+# Concurrent /predict calls share one decision_function call; each row
+# is scored by the version its features were built for. Batch scoring
+# time (without queueing) feeds the "model" latency estimate
+batcher = MicroBatcher(
+    registry.predict_batch,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_wait_us=MICROBATCH_MAX_WAIT_US,
+    on_scored=lambda latency_ms: admission.observe("model", latency_ms),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await batcher.stop()
 
 
 app = FastAPI(
     title="Fraud Anomaly Detection API",
     description="Real-time fraud detection using Isolation Forest with online feature engineering",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-model_service = ModelService()
+def feature_builder_for(service) -> FeatureVectorBuilder:
+    # One builder per model version (feature order can change between versions)
+    builder = _feature_builders.get(service.version)
+    if builder is None or builder.features != service.features:
+        builder = FeatureVectorBuilder(service.features, state_store)
+        _feature_builders[service.version] = builder
+    return builder
+
 
 def score_to_probability(score: float, threshold: float) -> float:
     # distance from decision boundary
@@ -25,60 +100,206 @@ def score_to_probability(score: float, threshold: float) -> float:
     prob = 1 / (1 + math.exp(-10 * margin))
     return round(prob, 4)
 
+
+def build_prediction_response(score: float, threshold: float) -> dict:
+    fraud_probability = score_to_probability(score, threshold)
+    is_fraud = fraud_probability >= 0.5
+
+    return {
+        "fraud_probability": round(float(fraud_probability), 4),
+        "fraud_score": round(float(score), 4),
+        "is_fraud": bool(is_fraud),
+        "explanation": (
+            "Transaction shows anomalous behavior compared to customer's, historical spending patterns (amount/velocity/location deviation)."
+        if is_fraud
+            else "Transaction falls within the customer's normal behavioral range "
+                    "based on historical patterns."
+        ),
+    }
+
+
+def build_cascade_response(result: dict, threshold: float) -> dict:
+    response = build_prediction_response(result["scores"]["isolation_forest"], threshold)
+    # fraud_score stays the Isolation Forest score; decision_source says
+    # whether it or the three-model vote made the call
+    response["decision_source"] = "isolation_forest"
+
+    if result["escalated"]:
+        # Uncertain screen: majority vote of the three models
+        is_fraud = result["votes"] >= 2
+        response["is_fraud"] = is_fraud
+        response["fraud_probability"] = round(result["votes"] / len(result["flags"]), 4)
+        response["decision_source"] = "majority_vote"
+        response["explanation"] = (
+            f"Borderline Isolation Forest score; {result['votes']} of "
+            f"{len(result['flags'])} models flagged an anomaly."
+            if is_fraud
+            else "Borderline Isolation Forest score; the One-Class SVM and "
+            "autoencoder did not confirm an anomaly."
+        )
+
+    response["stages"] = result["stages"]
+    response["model_scores"] = result["scores"]
+    response["model_flags"] = result["flags"]
+    return response
+
+
+def update_merchant_risk(txn: dict) -> Optional[dict]:
+    # Merchant features as of before this transaction (None without merchant_id)
+    if txn.get("merchant_id") is None:
+        return None
+    features = merchant_store.update(txn["merchant_id"], txn["amount"])
+    # NaN (first sighting of a merchant) is not valid JSON
+    return {
+        name: None if math.isnan(value) else round(value, 4)
+        for name, value in features.items()
+    }
+
+
+def remaining_ms(deadline_ms: Optional[float], received: float) -> Optional[float]:
+    # Deadline is a budget in ms from when the request reached the handler
+    if deadline_ms is None:
+        return None
+    return deadline_ms - (time.perf_counter() - received) * 1000
+
+
+def build_degraded_response(level: str, x, service) -> dict:
+    if level == "rules":
+        # Rule-only score: no model call, no micro-batch queue
+        start = time.perf_counter()
+        result = score_rules(x, service.features)
+        admission.observe("rules", (time.perf_counter() - start) * 1000)
+
+        fired = ", ".join(result["rules_fired"]) or "none"
+        return {
+            "fraud_probability": round(result["score"], 4),
+            "fraud_score": round(result["score"], 4),
+            "is_fraud": result["is_fraud"],
+            "explanation": f"Rule-only score (deadline too short for the model); rules fired: {fired}.",
+            "rules_fired": result["rules_fired"],
+        }
+
+    # Nothing fits the deadline: answer now and leave the decision to review
+    return {
+        "fraud_probability": None,
+        "fraud_score": None,
+        "is_fraud": False,
+        "review_required": True,
+        "explanation": "Deadline too short to score the transaction; route to manual review.",
+    }
+
+
+def overloaded(e: Overloaded) -> HTTPException:
+    logger.warning(str(e))
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after_s)},
+    )
+
+
+def parse_batch_body(body: bytes, content_type: str) -> list:
+    # NDJSON: one transaction per line; otherwise a JSON array
+    if "ndjson" in content_type:
+        items = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        items = json.loads(body)
+
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        raise ValueError("Batch body must be a JSON array or NDJSON lines of transactions")
+
+    return [TransactionRequest(**item).dict() for item in items]
+
+
 # Health check
 @app.get("/")
 def health_check():
     return {"status": "ok", "message": "Fraud Detection API is running"}
 
 
-# Prediction endpoint
-@app.post("/predict")
-def predict_fraud(request: TransactionRequest):
+# In-process metrics (micro-batch sizes, scoring latency, admission)
+@app.get("/metrics")
+def get_metrics():
+    return {**metrics.snapshot(), "admission": admission.status()}
+
+
+# Model versions: active, available and last reload result
+@app.get("/models")
+def get_models():
+    return registry.status()
+
+
+# Hot reload: load + warm up + parity check in the background, then swap
+@app.post("/models/reload", status_code=202)
+def reload_models(version: str = None):
     try:
-        logger.info(f"Incoming transaction: {request}")
+        started = registry.reload(version)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-        # Raw input → DataFrame
-        raw_df = pd.DataFrame([request.dict()])
+    if not started:
+        raise HTTPException(status_code=409, detail="A model reload is already running")
+    return registry.status()
 
-        #Feature engineering (same as training)
-        features_df = build_features(raw_df)
 
-        #One-row → dict
-        features_dict = features_df.iloc[0].to_dict()
+def build_feature_vector(request: TransactionRequest, service) -> tuple:
+    # Always runs, even for degraded requests, so customer and merchant
+    # state stay complete
+    start = time.perf_counter()
+    txn = reference_index.enrich(request.dict())
+    x = feature_builder_for(service).build(txn)
+    merchant_risk = update_merchant_risk(txn)
+    admission.observe("features", (time.perf_counter() - start) * 1000)
+    return x, merchant_risk
 
-        #Model prediction
-        score = model_service.predict(features_dict)
-        fraud_probability = score_to_probability(# Convert score → probability
-            score,
-            model_service.threshold 
-        )
-        is_fraud = fraud_probability >= 0.5
+
+async def score_model(x, service) -> dict:
+    # Isolation Forest score, micro-batched with concurrent requests
+    score = await batcher.submit(x, service.predict_batch)
+
+    return build_prediction_response(score, service.threshold)
+
+
+# Prediction endpoint; optional X-Deadline-Ms header (time budget in ms)
+@app.post("/predict")
+async def predict_fraud(
+    request: TransactionRequest,
+    deadline_ms: Optional[float] = Header(None, alias="X-Deadline-Ms"),
+):
+    received = time.perf_counter()
+    try:
+        with admission.admit():
+            logger.info(f"Incoming transaction: {request}")
+
+            #Feature engineering (same as training, from per-customer state)
+            service = registry.active
+            x, merchant_risk = build_feature_vector(request, service)
+
+            #Model prediction, unless the deadline forces a cheaper path
+            level = admission.plan(remaining_ms(deadline_ms, received))
+            if level == "none":
+                response = await score_model(x, service)
+            else:
+                response = build_degraded_response(level, x, service)
+            response["degradation"] = level
+            response["merchant_risk"] = merchant_risk
 
         #MONITORING / DEBUG LOG (ADD THIS)
         logger.info(
             f"SCORE_DEBUG | "
-            f"score={round(score, 4)} | "
-            f"threshold={round(model_service.threshold, 4)} | "
-            f"fraud_probability={fraud_probability} | "
-            f"is_fraud={is_fraud}"
+            f"score={response['fraud_score']} | "
+            f"threshold={round(service.threshold, 4)} | "
+            f"fraud_probability={response['fraud_probability']} | "
+            f"is_fraud={response['is_fraud']} | "
+            f"degradation={level}"
         )
 
-        response = {
-            "fraud_probability": round(float(fraud_probability), 4),
-            "fraud_score": round(float(score), 4),
-            "is_fraud": bool(is_fraud),
-            "explanation": (
-                "Transaction shows anomalous behavior compared to customer's, historical spending patterns (amount/velocity/location deviation)."
-            if is_fraud
-                else "Transaction falls within the customer's normal behavioral range "
-                        "based on historical patterns."
-            ),
-        }
-
-
         logger.info(f"Prediction response: {response}")
         return response
 
+    except Overloaded as e:
+        raise overloaded(e)
+
     except ValueError as ve:
         logger.error(str(ve))
         raise HTTPException(status_code=400, detail=str(ve))
@@ -89,3 +310,125 @@ def predict_fraud(request: TransactionRequest):
             status_code=500,
             detail="Internal server error during prediction",
         )
+
+
+def score_batch(txns: list, mode: str = "default") -> list:
+    # One feature pass and one model call per batch (per stage in cascade mode)
+    txns = [reference_index.enrich(txn) for txn in txns]
+    service = registry.active
+    X = build_online_feature_matrix(txns, state_store, service.features)
+
+    # Merchant sketches see the batch in timestamp order, like customer state
+    merchant_risk = [None] * len(txns)
+    for i in sorted(range(len(txns)), key=lambda i: to_epoch_us(txns[i]["timestamp"])):
+        merchant_risk[i] = update_merchant_risk(txns[i])
+
+    if mode == "cascade":
+        responses = [
+            build_cascade_response(result, service.threshold)
+            for result in score_cascade(service, X, CASCADE_BAND)
+        ]
+    else:
+        responses = [
+            build_prediction_response(score, service.threshold)
+            for score in service.predict_batch(X)
+        ]
+
+    for response, risk in zip(responses, merchant_risk):
+        response["merchant_risk"] = risk
+    return responses
+
+
+# Cascade endpoint: IF screens, borderline scores escalate to OCSVM + AE;
+# with a tight X-Deadline-Ms the second stage (or the model) is skipped
+@app.post("/predict_cascade")
+async def predict_fraud_cascade(
+    request: TransactionRequest,
+    deadline_ms: Optional[float] = Header(None, alias="X-Deadline-Ms"),
+):
+    received = time.perf_counter()
+    try:
+        with admission.admit():
+            service = registry.active
+            x, merchant_risk = build_feature_vector(request, service)
+
+            level = admission.plan(remaining_ms(deadline_ms, received), cascade=True)
+            if level == "none":
+                # The call that loads the second-stage models is not a latency sample
+                loaded = service.ensemble_loaded
+                start = time.perf_counter()
+                result = (
+                    await run_in_threadpool(score_cascade, service, x[None, :], CASCADE_BAND)
+                )[0]
+                if service.ensemble_loaded == loaded:
+                    admission.observe("cascade", (time.perf_counter() - start) * 1000)
+                response = build_cascade_response(result, service.threshold)
+            elif level == "skip_cascade":
+                response = await score_model(x, service)
+                response["stages"] = ["isolation_forest"]
+            else:
+                response = build_degraded_response(level, x, service)
+                response["stages"] = []
+            response["degradation"] = level
+            response["merchant_risk"] = merchant_risk
+
+        logger.info(
+            f"CASCADE_DEBUG | "
+            f"stages={','.join(response['stages'])} | "
+            f"degradation={level} | "
+            f"is_fraud={response['is_fraud']}"
+        )
+        return response
+
+    except Overloaded as e:
+        raise overloaded(e)
+
+    except ValueError as ve:
+        logger.error(str(ve))
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as e:
+        logger.exception("Cascade prediction failed")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during cascade prediction",
+        )
+
+
+# Batch prediction endpoint (JSON array or NDJSON body); mode=cascade
+# runs the cascade on the whole batch
+@app.post("/predict_batch")
+async def predict_fraud_batch(request: Request, mode: str = "default"):
+    try:
+        if mode not in ("default", "cascade"):
+            raise ValueError(f"Unknown mode: {mode}")
+
+        body = await request.body()
+        txns = parse_batch_body(body, request.headers.get("content-type", ""))
+
+        logger.info(f"Incoming batch: {len(txns)} transactions")
+
+        # Every row of the batch holds an in-flight slot while it is scored
+        with admission.admit(len(txns)):
+            results = await run_in_threadpool(score_batch, txns, mode) if txns else []
+
+        logger.info(
+            f"BATCH_DEBUG | "
+            f"size={len(results)} | "
+            f"flagged={sum(r['is_fraud'] for r in results)}"
+        )
+        return {"results": results}
+
+    except Overloaded as e:
+        raise overloaded(e)
+
+    except ValueError as ve:
+        logger.error(str(ve))
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as e:
+        logger.exception("Batch prediction failed")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during batch prediction",
+        )
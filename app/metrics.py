@@ -0,0 +1,109 @@
+import threading
+from bisect import bisect_left
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Ratio:
+    """
+    Share of observed items that were hits (e.g. escalation rate).
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def observe(self, hits: int, total: int):
+        with self._lock:
+            self.hits += hits
+            self.total += total
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "total": self.total,
+                "rate": self.hits / self.total if self.total else 0.0,
+            }
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus style) with count / sum / max.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.bucket_counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def snapshot(self):
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for upper, n in zip(self.buckets + ("+Inf",), self.bucket_counts):
+                cumulative += n
+                buckets[str(upper)] = cumulative
+
+            return {
+                "count": self.count,
+                "sum": self.total,
+                "mean": self.total / self.count if self.count else 0.0,
+                "max": self.max,
+                "buckets": buckets,
+            }
+
+
+class MetricsRegistry:
+    """
+    In-process metrics exposed as JSON on /metrics.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name: str) -> Counter:
+        return self._get_or_create(name, Counter)
+
+    def ratio(self, name: str) -> Ratio:
+        return self._get_or_create(name, Ratio)
+
+    def histogram(self, name: str, buckets) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(buckets))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+
+metrics = MetricsRegistry()
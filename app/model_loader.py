@@ -1,26 +1,82 @@
 import json
-import joblib
-import pandas as pd
+import numpy as np
 import os
+import threading
+
+from app.logger import logger
+from src.models.isolation_forest import load_isolation_forest
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+
+# Artifacts of a version when it has no manifest_<version>.json
+DEFAULT_ARTIFACTS = {
+    "isolation_forest": "isolation_forest_{version}.pkl",
+    "scaler": "standard_scaler_{version}.pkl",
+    "features": "model_features_{version}.json",
+    "thresholds": "thresholds_{version}.json",
+}
+
+
+def manifest_path(version: str, models_dir: str = MODELS_DIR) -> str:
+    return os.path.join(models_dir, f"manifest_{version}.json")
+
+
+def load_manifest(version: str, models_dir: str = MODELS_DIR) -> dict:
+    """
+    Manifest of a model version: artifact file names (relative to
+    `models_dir`) and an optional parity reference file.
+    """
+    path = manifest_path(version, models_dir)
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+    else:
+        manifest = {
+            "version": version,
+            "artifacts": {k: v.format(version=version) for k, v in DEFAULT_ARTIFACTS.items()},
+        }
 
-MODEL_PATH = os.path.join(BASE_DIR, "models", "isolation_forest_v1.pkl")
-SCALER_PATH = os.path.join(BASE_DIR, "models", "standard_scaler_v1.pkl")
-FEATURES_PATH = os.path.join(BASE_DIR, "models", "model_features_v1.json")
-THRESHOLDS_PATH = os.path.join(BASE_DIR, "models", "thresholds_v1.json")
+    missing = set(DEFAULT_ARTIFACTS) - set(manifest["artifacts"])
+    if missing:
+        raise ValueError(f"Manifest {version} is missing artifacts: {missing}")
+    return manifest
 
 
 class ModelService:
-    def __init__(self):
-        # Load model artifacts
-        self.model = joblib.load(MODEL_PATH)
-        self.scaler = joblib.load(SCALER_PATH)
+    def __init__(self, version: str = "v1", models_dir: str = MODELS_DIR):
+        manifest = load_manifest(version, models_dir)
+        artifacts = {
+            name: os.path.join(models_dir, filename)
+            for name, filename in manifest["artifacts"].items()
+        }
 
-        with open(FEATURES_PATH) as f:
+        self.version = manifest["version"]
+        self.manifest = manifest
+        self.models_dir = models_dir
+
+        # Load model artifacts: scaler-fused forest that scores raw features
+        # (see fused_artifacts.py), memory-mapped read-only so forked
+        # workers share its pages. Without it, the sklearn pickle (and so
+        # sklearn itself) is loaded and fused on the fly.
+        model_path = artifacts["isolation_forest"]
+        stem = os.path.splitext(model_path)[0]
+        if os.path.exists(f"{stem}_fused.joblib"):
+            self.model = load_isolation_forest(f"{stem}_fused.joblib", mmap_mode="r")
+        else:
+            import joblib
+
+            if os.path.exists(f"{stem}_flat.joblib"):
+                flat = load_isolation_forest(f"{stem}_flat.joblib", mmap_mode="r")
+            else:
+                flat = load_isolation_forest(model_path, flat=True)
+            scaler = joblib.load(artifacts["scaler"])
+            self.model = flat.fuse_scaler(scaler.mean_, scaler.scale_)
+
+        with open(artifacts["features"]) as f:
             self.features = json.load(f)["features"]
 
-        with open(THRESHOLDS_PATH) as f:
+        with open(artifacts["thresholds"]) as f:
             thresholds = json.load(f)
 
         # Isolation Forest threshold config
@@ -31,16 +87,91 @@ class ModelService:
         self.threshold = thresholds[model_key]["threshold_value"]
         self.threshold_percentile = thresholds[model_key]["percentile"]
 
-    def predict(self, feature_dict: dict) -> float:
+        # Cascade models (OCSVM + autoencoder) load on first use
+        self.thresholds = thresholds
+        self._artifacts = artifacts
+        self._ensemble = None
+        self._ensemble_lock = threading.Lock()
+
+    @property
+    def ensemble_loaded(self) -> bool:
+        return self._ensemble is not None
+
+    def ensemble(self) -> dict:
+        """
+        Second-stage models for cascade scoring, loaded once on first use
+        (this is what imports sklearn): the OCSVM (approximate one when
+        exported, else exact) on scaled features and the autoencoder with
+        the scaler folded in, each with its threshold.
+        """
+        with self._ensemble_lock:
+            if self._ensemble is not None:
+                return self._ensemble
+
+            import joblib
+
+            from src.models.numpy_autoencoder import NumpyAutoencoder
+
+            missing = {"one_class_svm", "autoencoder"} - set(self._artifacts)
+            if missing:
+                raise ValueError(f"Model {self.version} has no cascade artifacts: {missing}")
+
+            scaler = joblib.load(self._artifacts["scaler"])
+
+            svm_stem = os.path.splitext(self._artifacts["one_class_svm"])[0]
+            if os.path.exists(f"{svm_stem}_approx.pkl"):
+                one_class_svm = joblib.load(f"{svm_stem}_approx.pkl")
+            else:
+                # Exact SVM is ~20x slower per escalated row
+                logger.warning(
+                    f"Model {self.version}: {os.path.basename(svm_stem)}_approx.pkl not found; "
+                    f"cascade uses the exact One-Class SVM "
+                    f"(export it with python -m src.models.one_class_svm)"
+                )
+                one_class_svm = joblib.load(self._artifacts["one_class_svm"])
+
+            ae_stem = os.path.splitext(self._artifacts["autoencoder"])[0]
+            if os.path.exists(f"{ae_stem}_fused.npz"):
+                autoencoder = NumpyAutoencoder.load(f"{ae_stem}_fused.npz")
+            else:
+                autoencoder = NumpyAutoencoder.load(self._artifacts["autoencoder"]).fuse_scaler(
+                    scaler.mean_, scaler.scale_
+                )
+
+            self._ensemble = {
+                "scaler_mean": scaler.mean_,
+                "scaler_scale": scaler.scale_,
+                "one_class_svm": one_class_svm,
+                "one_class_svm_threshold": self.thresholds["one_class_svm"]["threshold_value"],
+                "autoencoder": autoencoder,
+                "autoencoder_threshold": self.thresholds["autoencoder"]["threshold_value"],
+            }
+            return self._ensemble
+
+    def vectorize(self, feature_dict: dict) -> np.ndarray:
         # Validate feature contract
         missing = set(self.features) - set(feature_dict.keys())
         if missing:
             raise ValueError(f"Missing features: {missing}")
 
         # Order features correctly
-        X = pd.DataFrame([feature_dict])[self.features]
-        X_scaled = self.scaler.transform(X)
+        return np.array([feature_dict[f] for f in self.features], dtype=np.float64)
+
+    def predict(self, feature_dict: dict) -> float:
+        # Validated, ordered vector; no DataFrame round trip
+        return float(self.predict_batch(self.vectorize(feature_dict)[None, :])[0])
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """
+        Score a (n, len(self.features)) matrix whose columns already
+        follow the feature contract. One model call per batch.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(
+                f"Expected feature matrix with {len(self.features)} columns, "
+                f"got shape {X.shape}"
+            )
 
-        # Isolation Forest anomaly score
-        score = -self.model.decision_function(X_scaled)[0]
-        return float(score)
+        # Isolation Forest anomaly score (scaler folded into the splits)
+        return -self.model.decision_function(X)
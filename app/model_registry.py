@@ -0,0 +1,192 @@
+import glob
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from app.logger import logger
+from app.metrics import metrics
+from app.model_loader import MODELS_DIR, ModelService, load_manifest
+
+
+PARITY_ATOL = 1e-6
+WARMUP_ROWS = 64
+
+
+def _version_key(version: str):
+    # v2 < v10; non-numeric suffixes sort after numeric ones
+    number = re.sub(r"\D", "", version)
+    return (int(number) if number else float("inf"), version)
+
+
+class ModelRegistry:
+    """
+    Versioned models under `models/` (one manifest_<version>.json each).
+
+    The active ModelService is a single reference: requests take it once
+    and keep scoring with it, so swapping in a new version never drops an
+    in-flight request. New versions load, warm up and pass a parity check
+    in a background thread before the swap; on any failure the current
+    version stays active.
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR, version: str = None):
+        self.models_dir = models_dir
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self.last_reload = None
+
+        self._reloads = metrics.counter("model_reloads_total")
+        self._reload_failures = metrics.counter("model_reload_failures_total")
+
+        version = version or self.latest_version()
+        self.active = self._prepare(version)
+
+    def versions(self) -> list:
+        pattern = os.path.join(self.models_dir, "manifest_*.json")
+        found = [
+            os.path.basename(p)[len("manifest_"):-len(".json")] for p in glob.glob(pattern)
+        ]
+        return sorted(found, key=_version_key)
+
+    def latest_version(self) -> str:
+        versions = self.versions()
+        return versions[-1] if versions else "v1"
+
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        return self.active.predict_batch(X)
+
+    def _prepare(self, version: str) -> ModelService:
+        service = ModelService(version, self.models_dir)
+
+        # Warm-up: first calls allocate buffers and page in the artifacts
+        service.predict_batch(np.zeros((WARMUP_ROWS, len(service.features))))
+
+        self.check_parity(service)
+        return service
+
+    def check_parity(self, service: ModelService):
+        """
+        Score the version's reference rows (manifest "parity": .npz with
+        X and scores) and fail if any score moved by more than PARITY_ATOL.
+        """
+        parity = service.manifest.get("parity")
+        if parity is None:
+            return
+
+        with np.load(os.path.join(self.models_dir, parity)) as reference:
+            X, expected = reference["X"], reference["scores"]
+
+        scores = service.predict_batch(X)
+        if not np.all(np.isfinite(scores)):
+            raise ValueError(f"Model {service.version} produced non-finite scores")
+
+        worst = float(np.max(np.abs(scores - expected))) if len(X) else 0.0
+        if worst > PARITY_ATOL:
+            raise ValueError(
+                f"Model {service.version} failed parity check (max abs diff {worst:.3g})"
+            )
+
+    def _reload(self, version: str):
+        started = time.perf_counter()
+        previous = self.active.version
+        try:
+            candidate = self._prepare(version)
+        except Exception as e:
+            self._reload_failures.inc()
+            self.last_reload = {"version": version, "status": "rolled_back", "error": str(e)}
+            logger.exception(f"Model reload to {version} failed; keeping {previous}")
+            return
+
+        # Atomic swap: in-flight requests finish on the service they hold
+        self.active = candidate
+        self._reloads.inc()
+        self.last_reload = {
+            "version": version,
+            "status": "active",
+            "previous": previous,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"Model reload | {previous} → {version} | {self.last_reload['seconds']}s")
+
+    def reload(self, version: str = None, wait: bool = False) -> bool:
+        """
+        Load `version` (default: latest manifest) in a background thread
+        and swap it in if it passes. Returns False if a reload is already
+        running.
+        """
+        version = version or self.latest_version()
+        manifest = load_manifest(version, self.models_dir)
+        for filename in manifest["artifacts"].values():
+            if not os.path.exists(os.path.join(self.models_dir, filename)):
+                raise FileNotFoundError(f"Model {version}: {filename} not found")
+
+        with self._reload_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+
+            self.last_reload = {"version": version, "status": "loading"}
+            self._reload_thread = threading.Thread(
+                target=self._reload, args=(version,), name="model-reload", daemon=True
+            )
+            self._reload_thread.start()
+
+        if wait:
+            self._reload_thread.join()
+        return True
+
+    def status(self) -> dict:
+        return {
+            "active": self.active.version,
+            "versions": self.versions(),
+            "last_reload": self.last_reload,
+        }
+
+
+def record_parity(version: str, X: np.ndarray, models_dir: str = MODELS_DIR) -> str:
+    """
+    Save reference rows and their scores from the unfused sklearn
+    pipeline (scaler → IsolationForest) as the version's parity file.
+    """
+    import joblib
+
+    manifest = load_manifest(version, models_dir)
+    artifacts = manifest["artifacts"]
+
+    scaler = joblib.load(os.path.join(models_dir, artifacts["scaler"]))
+    model = joblib.load(os.path.join(models_dir, artifacts["isolation_forest"]))
+
+    X = np.asarray(X, dtype=np.float64)
+    scores = -model.decision_function((X - scaler.mean_) / scaler.scale_)
+
+    filename = f"parity_{version}.npz"
+    np.savez(os.path.join(models_dir, filename), X=X, scores=scores)
+    return filename
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from src.utils.config import PROCESSED_DATA_DIR
+    from src.utils.storage import load_columns
+
+    parser = argparse.ArgumentParser(description="Record parity reference rows for a model version")
+    parser.add_argument("version")
+    parser.add_argument("--rows", type=int, default=256)
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.version)
+    with open(os.path.join(MODELS_DIR, manifest["artifacts"]["features"])) as f:
+        features = json.load(f)["features"]
+
+    df = load_columns(PROCESSED_DATA_DIR / "transactions_features.csv", features)
+    X = df.sample(n=min(args.rows, len(df)), random_state=0).to_numpy()
+
+    manifest["parity"] = record_parity(args.version, X)
+    with open(os.path.join(MODELS_DIR, f"manifest_{args.version}.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"[SUCCESS] Parity reference → {manifest['parity']} ({len(X)} rows)")
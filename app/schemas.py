@@ -1,13 +1,15 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import Dict
+from typing import Dict, Optional
 
 class TransactionRequest(BaseModel):
     customer_id: str
     amount: float
     timestamp: datetime
     hour: int
-    distance_from_home: float
+    # Either merchant_id (geo features derived server-side) or distance_from_home
+    merchant_id: Optional[str] = None
+    distance_from_home: Optional[float] = None
 
 class PredictionResponse(BaseModel):
     fraud_score: float
@@ -1,12 +1,5 @@
 # src/data_generation/city_loader.py
 
-import random
-from src.utils.geo_utils import sample_suburb
-from src.utils.config import (
-    SUBURB_RADIUS_KM_MIN,
-    SUBURB_RADIUS_KM_MAX,
-)
-
 # Real Indian city centers (lat, lon)
 INDIAN_CITIES = {
     "Bengaluru": (12.9716, 77.5946),
@@ -19,23 +12,3 @@ INDIAN_CITIES = {
     "Indore": (22.7196, 75.8577),
     "Coimbatore": (11.0168, 76.9558),
 }
-
-def sample_home_location():
-
-    """Assign a customer to a city + suburb."""
-    
-    city = random.choice(list(INDIAN_CITIES.keys()))
-    city_lat, city_lon = INDIAN_CITIES[city]
-
-    home_lat, home_lon = sample_suburb(
-        city_lat,
-        city_lon,
-        SUBURB_RADIUS_KM_MIN,
-        SUBURB_RADIUS_KM_MAX,
-    )
-
-    return {
-        "city": city,
-        "home_lat": home_lat,
-        "home_lon": home_lon,
-    }
@@ -0,0 +1,319 @@
+# src/data_generation/entity_tables.py
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.data_generation.city_loader import INDIAN_CITIES
+from src.data_generation.customer_generator import (
+    ACTIVE_HOUR_WEIGHTS,
+    MERCHANT_CATEGORIES,
+    generate_card_number,
+)
+from src.data_generation.merchant_generator import CATEGORY_CITY_CONSTRAINTS
+from src.utils.config import (
+    NUM_CUSTOMERS,
+    NUM_MERCHANTS,
+    RANDOM_SEED,
+    SUBURB_RADIUS_KM_MAX,
+    SUBURB_RADIUS_KM_MIN,
+)
+from src.utils.geo_utils import sample_suburbs
+from src.utils.random_streams import (
+    CUSTOMER_TABLE_STREAM,
+    MERCHANT_TABLE_STREAM,
+    stream_rng,
+)
+
+CITIES = list(INDIAN_CITIES.keys())
+CITY_LAT = np.array([INDIAN_CITIES[c][0] for c in CITIES])
+CITY_LON = np.array([INDIAN_CITIES[c][1] for c in CITIES])
+
+# Rows drawn from one random stream; fixed so results never depend on n_jobs
+ENTITY_BLOCK_SIZE = 65_536
+
+
+class EntityTable:
+    """
+    Struct-of-arrays entity table: one NumPy array per attribute, integer
+    codes for cities / categories (vocabularies in `meta`) and CSR layouts
+    for variable-length attributes (`<name>` values + `<name>_offsets`).
+
+    Saved as one .npy file per column so it can be memory-mapped and
+    shared by the simulator and every serving worker. Generated tables set
+    `meta["positional_ids"]`: the id at row `i` is `<PREFIX>_<i>`.
+    """
+
+    def __init__(self, columns: dict, meta: dict = None):
+        self.columns = columns
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, slice):
+            return self._slice(key)
+        raise TypeError(f"Unsupported key: {key!r}")
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def _slice(self, key: slice) -> "EntityTable":
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError("Only contiguous slices are supported")
+
+        columns = {}
+        for name, values in self.columns.items():
+            if name.endswith("_offsets"):
+                continue
+            if f"{name}_offsets" in self.columns:
+                offsets = self.columns[f"{name}_offsets"]
+                columns[name] = values[offsets[start] : offsets[stop]]
+                columns[f"{name}_offsets"] = offsets[start : stop + 1] - offsets[start]
+            else:
+                columns[name] = values[start:stop]
+
+        meta = dict(self.meta)
+        if start:
+            # Ids no longer match their row numbers
+            meta.pop("positional_ids", None)
+        return EntityTable(columns, meta)
+
+    def csr_row(self, name: str, i: int) -> np.ndarray:
+        offsets = self.columns[f"{name}_offsets"]
+        return self.columns[name][offsets[i] : offsets[i + 1]]
+
+    def decode(self, name: str, rows=None) -> np.ndarray:
+        """
+        Strings behind an integer-coded column, e.g. decode("city_code").
+        """
+        vocab = np.asarray(self.meta[name], dtype=object)
+        codes = self.columns[name] if rows is None else self.columns[name][rows]
+        return vocab[codes]
+
+    def save(self, path):
+        path = Path(path)
+        os.makedirs(path, exist_ok=True)
+
+        for name, values in self.columns.items():
+            np.save(path / f"{name}.npy", np.ascontiguousarray(values))
+
+        with open(path / "meta.json", "w") as f:
+            json.dump({"columns": list(self.columns), **self.meta}, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap_mode: str = "r") -> "EntityTable":
+        """
+        Open a saved table; with mmap_mode="r" columns are paged in lazily
+        and the OS shares them across processes.
+        """
+        path = Path(path)
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+
+        names = meta.pop("columns")
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in names}
+        return cls(columns, meta)
+
+
+def _fixed_width(strings) -> np.ndarray:
+    return np.array(strings, dtype="S")
+
+
+def _customer_block(args):
+    start, stop, seed = args
+    rng = stream_rng(CUSTOMER_TABLE_STREAM, start // ENTITY_BLOCK_SIZE, seed=seed)
+    n = stop - start
+
+    city_code = rng.integers(0, len(CITIES), size=n).astype(np.int8)
+    home_lat, home_lon = sample_suburbs(
+        CITY_LAT[city_code],
+        CITY_LON[city_code],
+        SUBURB_RADIUS_KM_MIN,
+        SUBURB_RADIUS_KM_MAX,
+        rng=rng,
+    )
+
+    avg_amount = rng.lognormal(mean=6.5, sigma=0.6, size=n)  # ~₹500–₹5000
+    amount_std = avg_amount * rng.uniform(0.2, 0.5, size=n)
+    daily_txn_rate = (rng.poisson(lam=2, size=n) + 1).astype(np.int16)  # 1–5 txns/day
+
+    # Active hours: 10 weighted draws per customer, de-duplicated into CSR
+    draws = np.sort(
+        rng.choice(24, size=(n, 10), p=ACTIVE_HOUR_WEIGHTS / ACTIVE_HOUR_WEIGHTS.sum()),
+        axis=1,
+    )
+    keep = np.ones_like(draws, dtype=bool)
+    keep[:, 1:] = draws[:, 1:] != draws[:, :-1]
+
+    # Dirichlet with a per-customer alpha, via normalized gamma draws
+    alpha = rng.uniform(0.5, 2.0, size=(n, len(MERCHANT_CATEGORIES)))
+    merchant_pref = rng.gamma(alpha)
+    merchant_pref /= merchant_pref.sum(axis=1, keepdims=True)
+
+    customer_id = [f"CUST_{i:05d}" for i in range(start, stop)]
+
+    return {
+        "id": np.arange(start, stop, dtype=np.int64),
+        "customer_id": _fixed_width(customer_id),
+        "card_number": _fixed_width([generate_card_number(c) for c in customer_id]),
+        "city_code": city_code,
+        "home_lat": home_lat,
+        "home_lon": home_lon,
+        "avg_amount": avg_amount,
+        "amount_std": amount_std,
+        "daily_txn_rate": daily_txn_rate,
+        "active_hours": draws[keep].astype(np.int8),
+        "active_hours_counts": keep.sum(axis=1),
+        "merchant_pref": merchant_pref.astype(np.float32),
+    }
+
+
+def _merchant_block(args):
+    start, stop, seed = args
+    rng = stream_rng(MERCHANT_TABLE_STREAM, start // ENTITY_BLOCK_SIZE, seed=seed)
+    n = stop - start
+
+    category_code = rng.integers(0, len(MERCHANT_CATEGORIES), size=n).astype(np.int8)
+
+    # Allowed cities per category as CSR over city codes
+    allowed = [
+        [CITIES.index(c) for c in CATEGORY_CITY_CONSTRAINTS[category]]
+        for category in MERCHANT_CATEGORIES
+    ]
+    allowed_offsets = np.cumsum([0] + [len(a) for a in allowed])
+    allowed_cities = np.concatenate(allowed)
+
+    n_allowed = np.diff(allowed_offsets)[category_code]
+    pick = allowed_offsets[category_code] + rng.integers(0, n_allowed)
+    city_code = allowed_cities[pick].astype(np.int8)
+
+    merchant_lat, merchant_long = sample_suburbs(
+        CITY_LAT[city_code], CITY_LON[city_code], 0.5, 3, rng=rng
+    )
+
+    return {
+        "id": np.arange(start, stop, dtype=np.int64),
+        "merchant_id": _fixed_width([f"MERCHANT_{i:05d}" for i in range(start, stop)]),
+        "category_code": category_code,
+        "city_code": city_code,
+        "merchant_lat": merchant_lat,
+        "merchant_long": merchant_long,
+    }
+
+
+def _generate_blocks(block_fn, n_rows: int, seed: int, n_jobs: int = None) -> dict:
+    if n_rows <= 0:
+        raise ValueError("Tables need at least one row")
+
+    tasks = [
+        (start, min(start + ENTITY_BLOCK_SIZE, n_rows), seed)
+        for start in range(0, n_rows, ENTITY_BLOCK_SIZE)
+    ]
+
+    if n_jobs is not None and n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            blocks = list(pool.map(block_fn, tasks))
+    else:
+        blocks = [block_fn(task) for task in tasks]
+
+    columns = {}
+    for name in blocks[0]:
+        parts = [b[name] for b in blocks]
+        if parts[0].dtype.kind == "S":
+            width = max(p.dtype.itemsize for p in parts)
+            parts = [p.astype(f"S{width}") for p in parts]
+        columns[name] = np.concatenate(parts)
+    return columns
+
+
+def _counts_to_offsets(counts) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+
+def generate_customer_table(
+    n_customers: int = NUM_CUSTOMERS, seed: int = RANDOM_SEED, n_jobs: int = None
+) -> EntityTable:
+    """
+    Vectorized customer generation straight into a columnar table.
+    Rows are drawn in fixed blocks, each from its own keyed stream.
+    """
+    columns = _generate_blocks(_customer_block, n_customers, seed, n_jobs)
+    columns["active_hours_offsets"] = _counts_to_offsets(columns.pop("active_hours_counts"))
+
+    return EntityTable(
+        columns,
+        {
+            "city_code": CITIES,
+            "merchant_categories": MERCHANT_CATEGORIES,
+            "positional_ids": True,
+        },
+    )
+
+
+def generate_merchant_table(
+    n_merchants: int = NUM_MERCHANTS, seed: int = RANDOM_SEED, n_jobs: int = None
+) -> EntityTable:
+    """
+    Vectorized merchant generation straight into a columnar table.
+    """
+    columns = _generate_blocks(_merchant_block, n_merchants, seed, n_jobs)
+
+    return EntityTable(
+        columns,
+        {
+            "city_code": CITIES,
+            "category_code": MERCHANT_CATEGORIES,
+            "positional_ids": True,
+        },
+    )
+
+
+def customer_table_from_records(customers: list) -> EntityTable:
+    """
+    Columnar table from customer profile dicts (e.g. hand-built fixtures).
+    """
+    active_hours = [np.asarray(c["active_hours"], dtype=np.int8) for c in customers]
+
+    columns = {
+        "id": np.arange(len(customers), dtype=np.int64),
+        "customer_id": _fixed_width([c["customer_id"] for c in customers]),
+        "card_number": _fixed_width([c["card_number"] for c in customers]),
+        "city_code": np.array([CITIES.index(c["home_city"]) for c in customers], dtype=np.int8),
+        "home_lat": np.array([c["home_lat"] for c in customers], dtype=np.float64),
+        "home_lon": np.array([c["home_lon"] for c in customers], dtype=np.float64),
+        "avg_amount": np.array([c["avg_amount"] for c in customers], dtype=np.float64),
+        "amount_std": np.array([c["amount_std"] for c in customers], dtype=np.float64),
+        "daily_txn_rate": np.array([c["daily_txn_rate"] for c in customers], dtype=np.int16),
+        "active_hours": np.concatenate(active_hours) if active_hours else np.empty(0, np.int8),
+        "active_hours_offsets": _counts_to_offsets([len(a) for a in active_hours]),
+        "merchant_pref": np.array(
+            [c["merchant_pref"] for c in customers], dtype=np.float32
+        ).reshape(len(customers), len(MERCHANT_CATEGORIES)),
+    }
+    return EntityTable(columns, {"city_code": CITIES, "merchant_categories": MERCHANT_CATEGORIES})
+
+
+def merchant_table_from_records(merchants: list) -> EntityTable:
+    """
+    Columnar table from merchant profile dicts (e.g. hand-built fixtures).
+    """
+    columns = {
+        "id": np.arange(len(merchants), dtype=np.int64),
+        "merchant_id": _fixed_width([m["merchant_id"] for m in merchants]),
+        "category_code": np.array(
+            [MERCHANT_CATEGORIES.index(m["merchant_category"]) for m in merchants],
+            dtype=np.int8,
+        ),
+        "city_code": np.array([CITIES.index(m["city"]) for m in merchants], dtype=np.int8),
+        "merchant_lat": np.array([m["merchant_lat"] for m in merchants], dtype=np.float64),
+        "merchant_long": np.array([m["merchant_long"] for m in merchants], dtype=np.float64),
+    }
+    return EntityTable(columns, {"city_code": CITIES, "category_code": MERCHANT_CATEGORIES})
@@ -2,9 +2,13 @@
 
 import numpy as np
 import pandas as pd
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-from src.utils.geo_utils import haversine_distance
+from src.feature_engineering.merchant_features import (
+    HIGH_VALUE_QUANTILE,
+    merchant_aggregates,
+)
+from src.utils.geo_utils import consecutive_haversine
 from src.utils.config import (
     CARD_CLONING_DISTANCE_KM,
     CARD_CLONING_TIME_MINUTES,
@@ -14,46 +18,42 @@ from src.utils.config import (
 def inject_card_cloning(df: pd.DataFrame) -> pd.DataFrame:
     """
     Inject card cloning fraud based on geo + time + amount violations.
+
+    Each transaction is compared with the customer's previous one
+    (groupby-shift semantics on the sorted frame) and the rule is applied
+    as a single mask.
     """
     df = df.sort_values(by=["customer_id", "timestamp"]).reset_index(drop=True)
 
-    last_txn = {}
-    fraud_indices = []
-
-    for idx, row in df.iterrows():
-        cust_id = row["customer_id"]
+    customer = df["customer_id"].to_numpy()
+    ts_ns = pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8
+    amount = df["amount"].to_numpy(dtype=np.float64)
 
-        if cust_id not in last_txn:
-            last_txn[cust_id] = row
-            continue
+    same_customer = np.zeros(len(df), dtype=bool)
+    same_customer[1:] = customer[1:] == customer[:-1]
 
-        prev = last_txn[cust_id]
-
-        # Time difference (minutes)
-        time_diff = (row["timestamp"] - prev["timestamp"]).total_seconds() / 60
-
-        # Distance between consecutive txns
-        distance = haversine_distance(
-            prev["merchant_lat"],
-            prev["merchant_long"],
-            row["merchant_lat"],
-            row["merchant_long"],
-        )
+    # Time difference (minutes)
+    time_diff = np.zeros(len(df), dtype=np.float64)
+    time_diff[1:] = np.diff(ts_ns) / 1e9 / 60
 
-        # Amount deviation (z-score proxy)
-        if row["amount"] > prev["amount"] * 2.5:
-            amount_flag = True
-        else:
-            amount_flag = False
+    # Distance between consecutive txns
+    distance = consecutive_haversine(
+        df["merchant_lat"].to_numpy(),
+        df["merchant_long"].to_numpy(),
+        groups=customer,
+    )
 
-        if (
-            distance > CARD_CLONING_DISTANCE_KM
-            and time_diff < CARD_CLONING_TIME_MINUTES
-            and amount_flag
-        ):
-            fraud_indices.append(idx)
+    # Amount deviation (z-score proxy)
+    amount_flag = np.zeros(len(df), dtype=bool)
+    amount_flag[1:] = amount[1:] > amount[:-1] * 2.5
 
-        last_txn[cust_id] = row
+    fraud_mask = (
+        same_customer
+        & (distance > CARD_CLONING_DISTANCE_KM)
+        & (time_diff < CARD_CLONING_TIME_MINUTES)
+        & amount_flag
+    )
+    fraud_indices = np.flatnonzero(fraud_mask)
 
     df.loc[fraud_indices, "is_fraud"] = 1
     df.loc[fraud_indices, "fraud_type"] = "card_cloning"
@@ -61,66 +61,143 @@ def inject_card_cloning(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def inject_account_takeover(df: pd.DataFrame, window_size: int = 6) -> pd.DataFrame:
+def _takeover_window_starts(
+    category_codes: np.ndarray,
+    is_night: np.ndarray,
+    valid: np.ndarray,
+    window_size: int,
+    n_categories: int,
+) -> np.ndarray:
     """
-    Inject account takeover using behavioral drift.
+    Rows that start a flagged "after" window. `valid` marks rows with a
+    full window of the same customer on both sides.
+
+    Window counts come from prefix sums (O(1) per position), one category
+    at a time so memory stays O(n).
     """
-    df = df.sort_values(by=["customer_id", "timestamp"]).reset_index(drop=True)
+    starts = np.flatnonzero(valid)
+    w = window_size
+
+    kl_div = np.zeros(len(starts), dtype=np.float64)
+    for k in range(n_categories):
+        prefix = np.concatenate(([0], np.cumsum(category_codes == k)))
+        count_before = prefix[starts] - prefix[starts - w]
+        count_after = prefix[starts + w] - prefix[starts]
+
+        # Merchant category entropy (categories seen in both windows)
+        p_before = count_before / w
+        p_after = count_after / w
+        common = (count_before > 0) & (count_after > 0)
+        kl_div[common] += p_before[common] * np.log(
+            (p_before[common] + 1e-6) / (p_after[common] + 1e-6)
+        )
 
-    for cust_id, cust_df in df.groupby("customer_id"):
-        if len(cust_df) < window_size * 2:
-            continue
+    # Night transaction spike
+    prefix = np.concatenate(([0], np.cumsum(is_night)))
+    night_ratio_before = (prefix[starts] - prefix[starts - w]) / w
+    night_ratio_after = (prefix[starts + w] - prefix[starts]) / w
 
-        for i in range(window_size, len(cust_df) - window_size):
-            before = cust_df.iloc[i - window_size : i]
-            after = cust_df.iloc[i : i + window_size]
+    flagged = (kl_div > 0.8) & (night_ratio_after > night_ratio_before + 0.3)
+    return starts[flagged]
 
-            # Merchant category entropy
-            entropy_before = before["merchant_category"].value_counts(normalize=True)
-            entropy_after = after["merchant_category"].value_counts(normalize=True)
 
-            common = entropy_before.index.intersection(entropy_after.index)
-            kl_div = np.sum(
-                entropy_before[common]
-                * np.log(
-                    (entropy_before[common] + 1e-6)
-                    / (entropy_after[common] + 1e-6)
-                )
-            )
+def _takeover_window_starts_slice(args):
+    lo, hi, category_codes, is_night, valid, window_size, n_categories = args
+    return lo + _takeover_window_starts(
+        category_codes, is_night, valid, window_size, n_categories
+    )
+
+
+def inject_account_takeover(
+    df: pd.DataFrame, window_size: int = 6, n_jobs: int = None
+) -> pd.DataFrame:
+    """
+    Inject account takeover using behavioral drift.
+
+    Compares each pair of adjacent `window_size` windows of a customer's
+    transactions; with n_jobs > 1 customers are split across processes.
+    """
+    df = df.sort_values(by=["customer_id", "timestamp"]).reset_index(drop=True)
+    n_rows = len(df)
+    w = window_size
+
+    category_codes, categories = pd.factorize(df["merchant_category"])
+    category_codes = category_codes.astype(np.int32)
+    is_night = df["hour"].to_numpy() < 6
+
+    # Position of each row inside its customer and rows left after it
+    customer = df["customer_id"].to_numpy()
+    is_start = np.ones(n_rows, dtype=bool)
+    is_start[1:] = customer[1:] != customer[:-1]
+    group_starts = np.flatnonzero(is_start)
+    group_sizes = np.diff(np.append(group_starts, n_rows))
+    group_of_row = np.cumsum(is_start) - 1
+    rank = np.arange(n_rows) - group_starts[group_of_row]
+    valid = (rank >= w) & (rank < group_sizes[group_of_row] - w)
+
+    if n_jobs is not None and n_jobs > 1 and n_rows:
+        # Contiguous slices cut at customer boundaries
+        targets = np.linspace(0, n_rows, n_jobs + 1)[1:-1]
+        cuts = group_starts[np.searchsorted(group_starts, targets, side="right") - 1]
+        edges = np.unique(np.r_[0, cuts, n_rows])
+
+        tasks = [
+            (lo, hi, category_codes[lo:hi], is_night[lo:hi], valid[lo:hi], w, len(categories))
+            for lo, hi in zip(edges[:-1], edges[1:])
+        ]
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            starts = np.concatenate(list(pool.map(_takeover_window_starts_slice, tasks)))
+    else:
+        starts = _takeover_window_starts(
+            category_codes, is_night, valid, w, len(categories)
+        )
 
-            # Night transaction spike
-            night_ratio_before = np.mean(before["hour"] < 6)
-            night_ratio_after = np.mean(after["hour"] < 6)
+    # Mark every "after" window [start, start + w) with a difference array
+    marks = np.zeros(n_rows + 1, dtype=np.int32)
+    np.add.at(marks, starts, 1)
+    np.add.at(marks, starts + w, -1)
+    fraud_indices = np.flatnonzero(np.cumsum(marks[:-1]) > 0)
 
-            if kl_div > 0.8 and night_ratio_after > night_ratio_before + 0.3:
-                df.loc[after.index, "is_fraud"] = 1
-                df.loc[after.index, "fraud_type"] = "account_takeover"
+    df.loc[fraud_indices, "is_fraud"] = 1
+    df.loc[fraud_indices, "fraud_type"] = "account_takeover"
 
     return df
 
 
-def inject_merchant_collusion(df: pd.DataFrame, target_cases: int = 120) -> pd.DataFrame:
+def inject_merchant_collusion(
+    df: pd.DataFrame, target_cases: int = 120, rng=None
+) -> pd.DataFrame:
     """
     Inject merchant collusion fraud by selecting a few high-volume merchants
     and flagging consistent high-value transactions.
+
+    Merchants are drawn from `rng` (a NumPy Generator) when given, else
+    from the global np.random state.
     """
     df = df.copy()
+    rng = rng if rng is not None else np.random
 
-    merchant_volume = df["merchant_id"].value_counts()
-    candidate_merchants = merchant_volume[merchant_volume > 80].index.tolist()
+    # One grouped pass: volume, amount quantiles and rows per merchant
+    aggregates, merchant_rows, row_offsets = merchant_aggregates(
+        df, quantiles=(HIGH_VALUE_QUANTILE,)
+    )
+    candidate_merchants = aggregates.index[aggregates["volume"] > 80].tolist()
 
-    colluding_merchants = np.random.choice(
+    colluding_merchants = rng.choice(
         candidate_merchants,
         size=min(7, len(candidate_merchants)),
         replace=False,
     )
 
+    amount = df["amount"].to_numpy()
+    high_threshold = aggregates["amount_q85"].to_numpy()
     fraud_indices = []
 
     for merchant_id in colluding_merchants:
-        mdf = df[df["merchant_id"] == merchant_id]
+        k = aggregates.index.get_loc(merchant_id)
+        rows = merchant_rows[row_offsets[k] : row_offsets[k + 1]]
 
-        high_value = mdf[mdf["amount"] > mdf["amount"].quantile(0.85)]
+        high_value = df.iloc[rows[amount[rows] > high_threshold[k]]]
         sampled = high_value.sample(
             n=min(len(high_value), target_cases // len(colluding_merchants)),
             random_state=42,
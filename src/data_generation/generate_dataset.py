@@ -1,19 +1,70 @@
 # src/data_generation/generate_dataset.py
 
+import argparse
 import os
 
-from src.data_generation.customer_generator import generate_customers
-from src.data_generation.merchant_generator import generate_merchants
-from src.data_generation.transaction_simulator import simulate_transactions
+from src.data_generation.entity_tables import (
+    generate_customer_table,
+    generate_merchant_table,
+)
+from src.data_generation.transaction_simulator import (
+    simulate_transactions_sharded,
+    write_transactions_sharded,
+)
 from src.data_generation.fraud_rules import (
     inject_card_cloning,
     inject_account_takeover,
     inject_merchant_collusion,
 )
-from src.utils.config import RAW_DATA_DIR
-
-
-def main():
+from src.utils.config import (
+    CUSTOMER_TABLE_DIR,
+    MERCHANT_TABLE_DIR,
+    NUM_CUSTOMERS,
+    NUM_MERCHANTS,
+    NUM_TRANSACTIONS,
+    RANDOM_SEED,
+    RAW_DATA_DIR,
+    RAW_TRANSACTIONS_PATH,
+    TXN_CHUNK_SIZE,
+)
+from src.utils.random_streams import FRAUD_STREAM, stream_rng
+from src.utils.storage import write_dataset
+
+
+def stream_normal_transactions(
+    n_transactions: int,
+    chunk_size: int = TXN_CHUNK_SIZE,
+    n_jobs: int = None,
+    seed: int = RANDOM_SEED,
+):
+    """
+    Load-test datasets: write normal transactions straight to disk, one
+    part file per shard (no fraud injection, which needs the full frame).
+    """
+    customers = generate_customer_table(NUM_CUSTOMERS, seed=seed, n_jobs=n_jobs)
+    merchants = generate_merchant_table(NUM_MERCHANTS, seed=seed, n_jobs=n_jobs)
+    customers.save(CUSTOMER_TABLE_DIR)
+    merchants.save(MERCHANT_TABLE_DIR)
+
+    output_dir = RAW_DATA_DIR / "transactions_stream"
+    rows = write_transactions_sharded(
+        customers,
+        merchants,
+        output_dir,
+        n_transactions,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        seed=seed,
+    )
+    print(f"Streamed {rows} transactions → {output_dir}")
+
+
+def main(
+    n_transactions: int = NUM_TRANSACTIONS,
+    n_jobs: int = None,
+    seed: int = RANDOM_SEED,
+    fmt: str = "csv",
+):
     
     print(" FRAUD DATASET GENERATION ")
 
@@ -21,21 +72,25 @@ def main():
     os.makedirs(RAW_DATA_DIR, exist_ok=True)
 
     print("[1/6] Generating customers...")
-    customers = generate_customers()
-    print(f"    → {len(customers)} customers created")
+    customers = generate_customer_table(NUM_CUSTOMERS, seed=seed, n_jobs=n_jobs)
+    customers.save(CUSTOMER_TABLE_DIR)
+    print(f"    → {len(customers)} customers created ({CUSTOMER_TABLE_DIR})")
 
     print("[2/6] Generating merchants...")
-    merchants = generate_merchants()
-    print(f"    → {len(merchants)} merchants created")
+    merchants = generate_merchant_table(NUM_MERCHANTS, seed=seed, n_jobs=n_jobs)
+    merchants.save(MERCHANT_TABLE_DIR)
+    print(f"    → {len(merchants)} merchants created ({MERCHANT_TABLE_DIR})")
 
     print("[3/6] Simulating normal transactions...")
-    df = simulate_transactions(customers, merchants)
+    df = simulate_transactions_sharded(
+        customers, merchants, n_transactions, n_jobs=n_jobs, seed=seed
+    )
     print(f"    → {len(df)} transactions simulated")
 
     print("[4/6] Injecting fraud patterns...")
     df = inject_card_cloning(df)
-    df = inject_account_takeover(df)
-    df = inject_merchant_collusion(df)
+    df = inject_account_takeover(df, n_jobs=n_jobs)
+    df = inject_merchant_collusion(df, rng=stream_rng(FRAUD_STREAM, seed=seed))
 
     print("[5/6] Final validation checks...")
     fraud_rate = df["is_fraud"].mean()
@@ -53,8 +108,12 @@ def main():
 
     print("[6/6] Saving dataset...")
 
-    output_path = RAW_DATA_DIR / "transactions.csv"
-    df.to_csv(output_path, index=False)
+    if fmt == "parquet":
+        output_path = RAW_TRANSACTIONS_PATH.with_suffix(".parquet")
+        write_dataset(df, output_path)
+    else:
+        output_path = RAW_TRANSACTIONS_PATH
+        df.to_csv(output_path, index=False)
 
     print(f"\n✅ Dataset successfully saved to:")
     print(f"   {output_path}")
@@ -64,4 +123,27 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate the synthetic fraud dataset")
+    parser.add_argument("--n-transactions", type=int, default=NUM_TRANSACTIONS)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream normal transactions to disk in chunks (load-test data)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=TXN_CHUNK_SIZE)
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Worker processes (output is the same for any value)",
+    )
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    args = parser.parse_args()
+
+    if args.stream:
+        stream_normal_transactions(
+            args.n_transactions, args.chunk_size, args.n_jobs, args.seed
+        )
+    else:
+        main(args.n_transactions, args.n_jobs, args.seed, args.format)
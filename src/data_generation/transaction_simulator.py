@@ -1,118 +1,411 @@
 # src/data_generation/transaction_simulator.py
 
-import random
-from datetime import datetime, timedelta
-from collections import defaultdict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
 import numpy as np
 import pandas as pd
 
 from src.utils.config import (
+    GENERATION_SHARDS,
     NUM_TRANSACTIONS,
     SIMULATION_DAYS,
     START_DATE,
     RANDOM_SEED,
+    TXN_CHUNK_SIZE,
 )
+from src.data_generation.entity_tables import EntityTable
 from src.utils.geo_utils import haversine_distance
+from src.utils.random_streams import TRANSACTION_STREAM, stream_rng
+from src.utils.spatial_index import GeoIndex
 
-random.seed(RANDOM_SEED)
-np.random.seed(RANDOM_SEED)
+# 92% local merchants, rest non-local (travel / online)
+LOCAL_MERCHANT_PROB = 0.92
+# Local = one of the nearest merchants within this distance of home
+LOCAL_MERCHANT_K = 64
+LOCAL_MERCHANT_RADIUS_KM = 15.0
+MIN_AMOUNT = 10.0
 
+TRANSACTION_COLUMNS = [
+    "transaction_id",
+    "customer_id",
+    "card_number",
+    "timestamp",
+    "amount",
+    "merchant_id",
+    "merchant_category",
+    "merchant_lat",
+    "merchant_long",
+    "distance_from_home",
+    "hour",
+    "day_of_week",
+    "month",
+    "is_fraud",
+    "fraud_type",
+]
 
-def simulate_transactions(customers, merchants):
+
+def _customer_arrays(customers):
+    if isinstance(customers, EntityTable):
+        return {
+            "customer_id": customers["customer_id"],
+            "card_number": customers["card_number"],
+            "home_lat": customers["home_lat"],
+            "home_lon": customers["home_lon"],
+            "avg_amount": customers["avg_amount"],
+            "amount_std": customers["amount_std"],
+            "daily_txn_rate": customers["daily_txn_rate"].astype(np.float64),
+        }
+
+    return {
+        "customer_id": np.array([c["customer_id"] for c in customers], dtype=object),
+        "card_number": np.array([c["card_number"] for c in customers], dtype=object),
+        "home_lat": np.array([c["home_lat"] for c in customers], dtype=np.float64),
+        "home_lon": np.array([c["home_lon"] for c in customers], dtype=np.float64),
+        "avg_amount": np.array([c["avg_amount"] for c in customers], dtype=np.float64),
+        "amount_std": np.array([c["amount_std"] for c in customers], dtype=np.float64),
+        "daily_txn_rate": np.array(
+            [c["daily_txn_rate"] for c in customers], dtype=np.float64
+        ),
+    }
+
+
+def _merchant_arrays(merchants):
+    if isinstance(merchants, EntityTable):
+        return {
+            "merchant_id": merchants["merchant_id"],
+            "merchant_category": merchants.decode("category_code"),
+            "merchant_lat": merchants["merchant_lat"],
+            "merchant_long": merchants["merchant_long"],
+        }
+
+    return {
+        "merchant_id": np.array([m["merchant_id"] for m in merchants], dtype=object),
+        "merchant_category": np.array(
+            [m["merchant_category"] for m in merchants], dtype=object
+        ),
+        "merchant_lat": np.array(
+            [m["merchant_lat"] for m in merchants], dtype=np.float64
+        ),
+        "merchant_long": np.array(
+            [m["merchant_long"] for m in merchants], dtype=np.float64
+        ),
+    }
+
+
+def _nearby_merchants(c: dict, m: dict) -> tuple:
     """
-    Simulate NORMAL (non-fraudulent) transactions with realistic
-    distance-aware merchant selection.
+    Local merchants of every customer: up to LOCAL_MERCHANT_K nearest
+    merchants within LOCAL_MERCHANT_RADIUS_KM of home (at least the
+    nearest one). Returns (nearby, counts) where customer i's merchants
+    are nearby[i, :counts[i]].
     """
-    transactions = []
-
-    start_dt = datetime.fromisoformat(START_DATE)
-    end_dt = start_dt + timedelta(days=SIMULATION_DAYS)
-
-    # -------------------------------
-    # Index merchants by city (KEY FIX)
-    # -------------------------------
-    merchant_by_city = defaultdict(list)
-    for m in merchants:
-        merchant_by_city[m["city"]].append(m)
-
-    # Track last transaction time per customer
-    last_txn_time = {c["customer_id"]: None for c in customers}
-
-    for txn_id in range(NUM_TRANSACTIONS):
-        customer = random.choice(customers)
-        cust_id = customer["customer_id"]
-
-        # -------------------------------
-        # Timestamp generation (Poisson)
-        # -------------------------------
-        if last_txn_time[cust_id] is None:
-            timestamp = start_dt + timedelta(
-                minutes=random.randint(0, SIMULATION_DAYS * 24 * 60)
-            )
-        else:
-            gap_minutes = np.random.exponential(
-                scale=1440 / customer["daily_txn_rate"]
-            )
-            timestamp = last_txn_time[cust_id] + timedelta(minutes=gap_minutes)
-
-            if timestamp > end_dt:
-                timestamp = start_dt + timedelta(
-                    minutes=random.randint(0, SIMULATION_DAYS * 24 * 60)
-                )
-
-        last_txn_time[cust_id] = timestamp
-
-        # ------------------------------------------------
-        # DISTANCE-AWARE merchant selection (BUG FIX)
-        # ------------------------------------------------
-        # 90% local merchants, 10% non-local (travel / online)
-        if random.random() < 0.92 and merchant_by_city[customer["home_city"]]:
-            merchant = random.choice(
-                merchant_by_city[customer["home_city"]]
-            )
-        else:
-            merchant = random.choice(merchants)
-
-        # -------------------------------
-        # Amount generation
-        # -------------------------------
-        amount = max(
-            10.0,
-            np.random.normal(
-                customer["avg_amount"],
-                customer["amount_std"],
-            ),
+    index = GeoIndex(m["merchant_lat"], m["merchant_long"])
+    distances, nearby = index.query_knn(c["home_lat"], c["home_lon"], LOCAL_MERCHANT_K)
+
+    counts = np.maximum((distances <= LOCAL_MERCHANT_RADIUS_KM).sum(axis=1), 1)
+    return nearby, counts
+
+
+def _as_str(values: np.ndarray) -> np.ndarray:
+    # Fixed-width bytes from entity tables → str
+    return values.astype(str).astype(object) if values.dtype.kind == "S" else values
+
+
+def _segment_times(base, gaps, segment_start):
+    # Base time of each segment plus the gaps accumulated inside it
+    cum_gaps = np.cumsum(gaps)
+    row_start = np.flatnonzero(segment_start)[np.cumsum(segment_start) - 1]
+    return base[row_start] + cum_gaps - cum_gaps[row_start]
+
+
+def _simulate_times(cust_sorted, last_minutes, rate_sorted, rng, horizon_minutes):
+    """
+    Minutes since START_DATE for rows sorted by customer (generation order
+    kept inside each customer).
+
+    Same process as the per-row loop: a customer's first transaction lands
+    at a random minute, every later one an exponential gap after the
+    previous one, and a time past the horizon restarts at a random minute.
+    """
+    n = len(cust_sorted)
+    gaps = rng.exponential(scale=1440 / rate_sorted)
+
+    first_of_customer = np.ones(n, dtype=bool)
+    first_of_customer[1:] = cust_sorted[1:] != cust_sorted[:-1]
+
+    # Rows that start a segment carry their own base time in `base`
+    segment_start = first_of_customer.copy()
+    base = np.zeros(n, dtype=np.float64)
+
+    prev = last_minutes[cust_sorted[first_of_customer]]
+    unseen = np.isnan(prev)
+    first_rows = np.flatnonzero(first_of_customer)
+
+    base[first_rows] = prev + gaps[first_rows]
+    base[first_rows[unseen]] = rng.integers(
+        0, horizon_minutes + 1, size=unseen.sum()
+    )
+    gaps[first_rows] = 0.0
+
+    # Each round restarts the first overflowing row of every segment;
+    # rounds are bounded by the number of wraps per customer in one chunk
+    while True:
+        minutes = _segment_times(base, gaps, segment_start)
+        over = minutes > horizon_minutes
+        if not over.any():
+            return minutes
+
+        seg = np.cumsum(segment_start) - 1
+        over_rows = np.flatnonzero(over)
+        first_over = over_rows[
+            np.concatenate(([True], seg[over_rows[1:]] != seg[over_rows[:-1]]))
+        ]
+
+        segment_start[first_over] = True
+        base[first_over] = rng.integers(0, horizon_minutes + 1, size=len(first_over))
+        gaps[first_over] = 0.0
+
+
+def iter_transaction_chunks(
+    customers,
+    merchants,
+    n_transactions: int = NUM_TRANSACTIONS,
+    chunk_size: int = TXN_CHUNK_SIZE,
+    rng=None,
+    first_txn_id: int = 0,
+):
+    """
+    Yield NORMAL (non-fraudulent) transactions as DataFrames of at most
+    `chunk_size` rows, generated column-wise with NumPy.
+
+    `customers` / `merchants` are generator records or EntityTables.
+
+    Only per-customer last-transaction times are carried between chunks,
+    so memory is bounded by the chunk size, not by `n_transactions`.
+    """
+    rng = rng if rng is not None else np.random.default_rng(RANDOM_SEED)
+
+    c = _customer_arrays(customers)
+    m = _merchant_arrays(merchants)
+    nearby, nearby_count = _nearby_merchants(c, m)
+
+    start = pd.Timestamp(datetime.fromisoformat(START_DATE))
+    horizon_minutes = SIMULATION_DAYS * 24 * 60
+    last_minutes = np.full(len(customers), np.nan)
+
+    n_merchants = len(m["merchant_id"])
+
+    for chunk_start in range(0, n_transactions, chunk_size):
+        size = min(chunk_size, n_transactions - chunk_start)
+
+        cust = rng.integers(0, len(customers), size=size)
+
+        # ---- Timestamps (per-customer exponential gaps) ----
+        order = np.argsort(cust, kind="stable")
+        minutes_sorted = _simulate_times(
+            cust[order], last_minutes, c["daily_txn_rate"][cust[order]], rng, horizon_minutes
         )
+        minutes = np.empty(size, dtype=np.float64)
+        minutes[order] = minutes_sorted
+
+        last_rows = order[np.append(cust[order][1:] != cust[order][:-1], True)]
+        last_minutes[cust[last_rows]] = minutes[last_rows]
+
+        timestamp = start + pd.to_timedelta(np.round(minutes * 60e6), unit="us")
+
+        # ---- Merchant selection by distance from home ----
+        local = rng.random(size) < LOCAL_MERCHANT_PROB
+        local_pick = rng.integers(0, nearby_count[cust])
 
-        # -------------------------------
-        # Distance calculation
-        # -------------------------------
+        merchant = rng.integers(0, n_merchants, size=size)
+        merchant[local] = nearby[cust[local], local_pick[local]]
+
+        # ---- Amounts ----
+        amount = np.maximum(
+            MIN_AMOUNT, rng.normal(c["avg_amount"][cust], c["amount_std"][cust])
+        ).round(2)
+
+        # ---- Distance ----
+        merchant_lat = m["merchant_lat"][merchant]
+        merchant_long = m["merchant_long"][merchant]
         distance_from_home = haversine_distance(
-            customer["home_lat"],
-            customer["home_lon"],
-            merchant["merchant_lat"],
-            merchant["merchant_long"],
-        )
+            c["home_lat"][cust], c["home_lon"][cust], merchant_lat, merchant_long
+        ).round(2)
 
-        transactions.append(
+        txn_ids = np.arange(first_txn_id + chunk_start, first_txn_id + chunk_start + size)
+
+        yield pd.DataFrame(
             {
-                "transaction_id": f"TXN_{txn_id:08d}",
-                "customer_id": cust_id,
-                "card_number": customer["card_number"],
+                "transaction_id": np.char.add(
+                    "TXN_", np.char.zfill(txn_ids.astype(str), 8)
+                ).astype(object),
+                "customer_id": _as_str(c["customer_id"][cust]),
+                "card_number": _as_str(c["card_number"][cust]),
                 "timestamp": timestamp,
-                "amount": round(amount, 2),
-                "merchant_id": merchant["merchant_id"],
-                "merchant_category": merchant["merchant_category"],
-                "merchant_lat": merchant["merchant_lat"],
-                "merchant_long": merchant["merchant_long"],
-                "distance_from_home": round(distance_from_home, 2),
+                "amount": amount,
+                "merchant_id": _as_str(m["merchant_id"][merchant]),
+                "merchant_category": m["merchant_category"][merchant],
+                "merchant_lat": merchant_lat,
+                "merchant_long": merchant_long,
+                "distance_from_home": distance_from_home,
                 "hour": timestamp.hour,
-                "day_of_week": timestamp.weekday(),
+                "day_of_week": timestamp.dayofweek,
                 "month": timestamp.month,
                 "is_fraud": 0,
                 "fraud_type": "none",
-            }
+            },
+            columns=TRANSACTION_COLUMNS,
+        )
+
+
+def simulate_transactions(customers, merchants, n_transactions: int = NUM_TRANSACTIONS, rng=None):
+    """
+    Simulate NORMAL (non-fraudulent) transactions with realistic
+    distance-aware merchant selection.
+    """
+    return pd.concat(
+        iter_transaction_chunks(customers, merchants, n_transactions, rng=rng),
+        ignore_index=True,
+    )
+
+
+def write_transactions(
+    customers,
+    merchants,
+    out_path,
+    n_transactions: int = NUM_TRANSACTIONS,
+    chunk_size: int = TXN_CHUNK_SIZE,
+    rng=None,
+) -> int:
+    """
+    Stream simulated transactions to a CSV file one chunk at a time.
+    Returns the number of rows written.
+    """
+    rows = 0
+    for chunk in iter_transaction_chunks(
+        customers, merchants, n_transactions, chunk_size, rng=rng
+    ):
+        chunk.to_csv(out_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+        rows += len(chunk)
+
+    return rows
+
+
+# ------------------------------------------------------------------
+# Sharded generation
+# ------------------------------------------------------------------
+def plan_shards(
+    n_customers: int,
+    n_transactions: int,
+    n_shards: int = GENERATION_SHARDS,
+    seed: int = RANDOM_SEED,
+) -> list:
+    """
+    Split customers into `n_shards` contiguous blocks and transactions
+    across them (multinomial on block size, like picking customers
+    uniformly). Returns (customer_start, customer_stop, n_txns, first_txn_id)
+    per shard; depends only on the sizes and the seed.
+    """
+    edges = np.linspace(0, n_customers, n_shards + 1).astype(int)
+    sizes = np.diff(edges)
+
+    counts = stream_rng(TRANSACTION_STREAM, seed=seed).multinomial(
+        n_transactions, sizes / sizes.sum()
+    )
+    first_ids = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    return [
+        (int(lo), int(hi), int(n), int(first))
+        for lo, hi, n, first in zip(edges[:-1], edges[1:], counts, first_ids)
+        if hi > lo
+    ]
+
+
+def _shard_chunks(customers, merchants, n_txns, first_txn_id, shard_index, chunk_size, seed):
+    return iter_transaction_chunks(
+        customers,
+        merchants,
+        n_txns,
+        chunk_size,
+        rng=stream_rng(TRANSACTION_STREAM, shard_index, seed=seed),
+        first_txn_id=first_txn_id,
+    )
+
+
+def _simulate_shard(args):
+    chunks = list(_shard_chunks(*args))
+    return pd.concat(chunks, ignore_index=True) if chunks else None
+
+
+def _write_shard(args):
+    *shard_args, out_path = args
+    rows = 0
+    for chunk in _shard_chunks(*shard_args):
+        chunk.to_csv(out_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+        rows += len(chunk)
+    return rows
+
+
+def _shard_tasks(customers, merchants, n_transactions, n_shards, chunk_size, seed):
+    # Workers only receive their own customers
+    return [
+        (customers[lo:hi], merchants, n_txns, first_txn_id, k, chunk_size, seed)
+        for k, (lo, hi, n_txns, first_txn_id) in enumerate(
+            plan_shards(len(customers), n_transactions, n_shards, seed)
+        )
+    ]
+
+
+def simulate_transactions_sharded(
+    customers,
+    merchants,
+    n_transactions: int = NUM_TRANSACTIONS,
+    n_shards: int = GENERATION_SHARDS,
+    n_jobs: int = None,
+    chunk_size: int = TXN_CHUNK_SIZE,
+    seed: int = RANDOM_SEED,
+) -> pd.DataFrame:
+    """
+    simulate_transactions over customer shards, each with its own keyed
+    random stream, optionally across a process pool. The result depends
+    on the seed and `n_shards` only, never on `n_jobs`.
+    """
+    tasks = _shard_tasks(customers, merchants, n_transactions, n_shards, chunk_size, seed)
+
+    if n_jobs is not None and n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            frames = list(pool.map(_simulate_shard, tasks))
+    else:
+        frames = [_simulate_shard(args) for args in tasks]
+
+    return pd.concat([f for f in frames if f is not None], ignore_index=True)
+
+
+def write_transactions_sharded(
+    customers,
+    merchants,
+    out_dir,
+    n_transactions: int = NUM_TRANSACTIONS,
+    n_shards: int = GENERATION_SHARDS,
+    n_jobs: int = None,
+    chunk_size: int = TXN_CHUNK_SIZE,
+    seed: int = RANDOM_SEED,
+) -> int:
+    """
+    Stream every shard to its own part-XXXXX.csv under `out_dir`.
+    Returns the number of rows written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [
+        args + (os.path.join(out_dir, f"part-{args[4]:05d}.csv"),)
+        for args in _shard_tasks(
+            customers, merchants, n_transactions, n_shards, chunk_size, seed
         )
+    ]
 
-    return pd.DataFrame(transactions)
+    if n_jobs is not None and n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            return sum(pool.map(_write_shard, tasks))
+    return sum(_write_shard(args) for args in tasks)
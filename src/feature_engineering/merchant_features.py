@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+
+AMOUNT_QUANTILES = (0.5, 0.85, 0.95, 0.99)
+HIGH_VALUE_QUANTILE = 0.85
+
+
+def _lerp(a, b, t):
+    # Same interpolation as np.quantile(method="linear"), so grouped results
+    # are bit-identical to Series.quantile
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def grouped_quantiles(
+    sorted_values: np.ndarray, offsets: np.ndarray, quantiles
+) -> np.ndarray:
+    """
+    Linear-interpolation quantiles of every group in one pass.
+
+    `sorted_values[offsets[g]:offsets[g + 1]]` holds group g's values in
+    ascending order. Returns an (n_groups, len(quantiles)) array (NaN for
+    empty groups).
+    """
+    starts = offsets[:-1]
+    sizes = np.diff(offsets)
+    out = np.full((len(sizes), len(quantiles)), np.nan)
+    has_rows = sizes > 0
+
+    for j, q in enumerate(quantiles):
+        virtual = (sizes[has_rows] - 1) * q
+        previous = np.floor(virtual)
+        gamma = virtual - previous
+
+        lo = starts[has_rows] + previous.astype(np.int64)
+        hi = np.minimum(lo + 1, offsets[1:][has_rows] - 1)
+        out[has_rows, j] = _lerp(sorted_values[lo], sorted_values[hi], gamma)
+
+    return out
+
+
+def merchant_aggregates(
+    df: pd.DataFrame,
+    quantiles=AMOUNT_QUANTILES,
+    high_value_quantile: float = HIGH_VALUE_QUANTILE,
+) -> tuple:
+    """
+    Per-merchant volume, amount quantiles and high-value counts from a
+    single sort of the transactions.
+
+    Returns (aggregates, merchant_rows, row_offsets):
+      - aggregates is indexed by merchant_id in `value_counts` order;
+      - merchant_rows[row_offsets[k]:row_offsets[k + 1]] are the
+        positional rows of aggregates.index[k], in frame order.
+    """
+    quantiles = tuple(quantiles)
+    if high_value_quantile not in quantiles:
+        quantiles += (high_value_quantile,)
+
+    volume = df["merchant_id"].value_counts()
+    codes = pd.Index(volume.index).get_indexer(df["merchant_id"])
+    amount = df["amount"].to_numpy(dtype=np.float64)
+
+    # Rows grouped by merchant, kept in frame order inside each merchant
+    merchant_rows = np.argsort(codes, kind="stable")
+    row_offsets = np.searchsorted(codes[merchant_rows], np.arange(len(volume) + 1))
+
+    # Amounts sorted inside each merchant
+    by_amount = np.lexsort((amount, codes))
+    q_values = grouped_quantiles(amount[by_amount], row_offsets, quantiles)
+
+    aggregates = pd.DataFrame(
+        {f"amount_q{round(q * 100):02d}": q_values[:, j] for j, q in enumerate(quantiles)},
+        index=volume.index,
+    )
+    aggregates.insert(0, "volume", volume.to_numpy())
+    aggregates.insert(
+        1,
+        "amount_mean",
+        np.bincount(codes, weights=amount, minlength=len(volume)) / volume.to_numpy(),
+    )
+
+    # High-value transactions: strictly above the merchant's quantile
+    high_threshold = q_values[:, quantiles.index(high_value_quantile)]
+    aggregates["high_value_count"] = np.bincount(
+        codes[amount > high_threshold[codes]], minlength=len(volume)
+    )
+
+    return aggregates, merchant_rows, row_offsets
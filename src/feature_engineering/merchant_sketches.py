@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Serving path: no pandas import (warm_start takes any frame-like object)
+from src.utils.config import MERCHANT_SKETCH_QUANTILES, ONLINE_STATE_MAX_MERCHANTS
+
+
+class P2Quantile:
+    """
+    P² streaming quantile estimate (Jain & Chlamtac): five markers, O(1)
+    memory and O(1) work per observation. Exact for the first five.
+    """
+
+    __slots__ = ("p", "heights", "positions", "desired", "increments", "count")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+        self.count = 0
+
+    def update(self, x: float):
+        self.count += 1
+        q = self.heights
+
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # ---- Cell containing x ----
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # ---- Adjust the three middle markers ----
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1.0 if d > 0 else -1.0
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabolic step overshoots: fall back to linear
+                    j = i + int(d)
+                    candidate = q[i] + d * (q[j] - q[i]) / (n[j] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self) -> float:
+        if self.count == 0:
+            return float("nan")
+        if self.count <= 5:
+            return float(np.quantile(self.heights, self.p))
+        return self.heights[2]
+
+
+class _MerchantSketch:
+    __slots__ = ("count", "amount_sum", "quantiles")
+
+    def __init__(self, quantiles):
+        self.count = 0
+        self.amount_sum = 0.0
+        self.quantiles = [P2Quantile(q) for q in quantiles]
+
+
+class MerchantSketchStore:
+    """
+    Online per-merchant amount statistics for serving.
+
+    Each merchant keeps a count, a running mean and one P² sketch per
+    quantile, so risk features are available at request time without
+    rescanning history. The least recently seen merchant is evicted once
+    more than `max_merchants` are tracked.
+    """
+
+    def __init__(
+        self,
+        max_merchants: int = ONLINE_STATE_MAX_MERCHANTS,
+        quantiles=MERCHANT_SKETCH_QUANTILES,
+    ):
+        self.max_merchants = max_merchants
+        self.quantiles = tuple(quantiles)
+        self._merchants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._merchants)
+
+    def __contains__(self, merchant_id):
+        return merchant_id in self._merchants
+
+    def clear(self):
+        with self._lock:
+            self._merchants.clear()
+
+    def _features(self, sketch: _MerchantSketch, amount: float) -> dict:
+        features = {
+            "merchant_txn_count": float(sketch.count),
+            "merchant_amount_mean": (
+                sketch.amount_sum / sketch.count if sketch.count else float("nan")
+            ),
+        }
+        for q, estimate in zip(self.quantiles, sketch.quantiles):
+            features[f"merchant_amount_q{round(q * 100):02d}"] = estimate.value()
+
+        # How far the amount sits above the merchant's upper quantile
+        upper = features[f"merchant_amount_q{round(self.quantiles[-1] * 100):02d}"]
+        features["merchant_amount_ratio"] = (
+            amount / upper if sketch.count and upper > 0 else float("nan")
+        )
+        return features
+
+    def update(self, merchant_id: str, amount: float) -> dict:
+        """
+        Return the merchant's risk features as of *before* this
+        transaction, then fold the amount into its sketches.
+        """
+        with self._lock:
+            sketch = self._merchants.get(merchant_id)
+            if sketch is None:
+                sketch = _MerchantSketch(self.quantiles)
+                self._merchants[merchant_id] = sketch
+                if len(self._merchants) > self.max_merchants:
+                    self._merchants.popitem(last=False)
+            else:
+                self._merchants.move_to_end(merchant_id)
+
+            features = self._features(sketch, amount)
+
+            sketch.count += 1
+            sketch.amount_sum += amount
+            for estimate in sketch.quantiles:
+                estimate.update(amount)
+
+            return features
+
+    def snapshot(self, merchant_id: str) -> dict:
+        """
+        Current features of a merchant without recording a transaction.
+        """
+        with self._lock:
+            sketch = self._merchants.get(merchant_id)
+            if sketch is None:
+                return None
+            return self._features(sketch, float("nan"))
+
+    def warm_start(self, df):
+        """
+        Replay historical (merchant_id, amount) pairs in timestamp order.
+        """
+        if "timestamp" in df:
+            df = df.sort_values("timestamp", kind="stable")
+        for merchant_id, amount in zip(df["merchant_id"], df["amount"]):
+            self.update(merchant_id, float(amount))
@@ -0,0 +1,286 @@
+import math
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Serving path: no pandas / rolling_window import
+from src.utils.config import MAX_TRAVEL_SPEED_KMH
+from src.utils.geo_utils import haversine_distance
+
+
+WINDOW_1H_US = 3600 * 1_000_000
+WINDOW_24H_US = 24 * 3600 * 1_000_000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_us(ts: datetime) -> int:
+    """
+    Convert a timestamp to integer microseconds since the epoch.
+    Naive timestamps are treated as UTC, like pd.to_datetime does.
+    """
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+class _CustomerWindow:
+    """
+    Rolling history of one customer: ring buffers of the transactions
+    inside the 1h / 24h windows plus the last seen location.
+    """
+
+    __slots__ = (
+        "times_1h",
+        "times_24h",
+        "amounts_24h",
+        "amount_sum_24h",
+        "last_ts",
+        "last_lat",
+        "last_long",
+    )
+
+    def __init__(self):
+        self.times_1h = deque()
+        self.times_24h = deque()
+        self.amounts_24h = deque()
+        self.amount_sum_24h = 0.0
+        self.last_ts = None
+        self.last_lat = None
+        self.last_long = None
+
+
+class CustomerStateStore:
+    """
+    In-process per-customer rolling-window state for online scoring.
+
+    Each update is O(1) amortized: entries leave the 1h / 24h buffers once
+    they fall out of the window, and the least recently seen customer is
+    evicted once more than `max_customers` are tracked.
+
+    Features match `add_behavioral_features` as long as each customer's
+    transactions arrive in timestamp order.
+    """
+
+    def __init__(self, max_customers: int = 100_000):
+        self.max_customers = max_customers
+        self._customers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._customers)
+
+    def __contains__(self, customer_id):
+        return customer_id in self._customers
+
+    def clear(self):
+        with self._lock:
+            self._customers.clear()
+
+    def update(
+        self,
+        customer_id: str,
+        timestamp: datetime,
+        amount: float,
+        merchant_lat: float = None,
+        merchant_long: float = None,
+    ) -> dict:
+        """
+        Record a transaction and return its behavioral features.
+
+        Without merchant coordinates the travel speed is 0 and the
+        customer's last known location is kept.
+        """
+        ts = to_epoch_us(timestamp)
+
+        with self._lock:
+            state = self._customers.get(customer_id)
+            if state is None:
+                state = _CustomerWindow()
+                self._customers[customer_id] = state
+                if len(self._customers) > self.max_customers:
+                    self._customers.popitem(last=False)
+            else:
+                self._customers.move_to_end(customer_id)
+
+            return self._advance(state, ts, amount, merchant_lat, merchant_long)
+
+    @staticmethod
+    def _advance(state, ts, amount, merchant_lat, merchant_long) -> dict:
+        has_location = merchant_lat is not None and merchant_long is not None
+
+        # ---- Time since last transaction ----
+        if state.last_ts is None:
+            time_since_last = 0.0
+        else:
+            # Late arrivals are clamped instead of producing negative gaps
+            time_since_last = max(ts - state.last_ts, 0) / 1_000_000
+
+        # ---- Distance from the last known location ----
+        if has_location and state.last_lat is not None:
+            travel_distance = haversine_distance(
+                state.last_lat,
+                state.last_long,
+                merchant_lat,
+                merchant_long,
+            )
+        else:
+            travel_distance = 0.0
+
+        # ---- Evict entries outside the windows ----
+        times_1h = state.times_1h
+        while times_1h and times_1h[0] <= ts - WINDOW_1H_US:
+            times_1h.popleft()
+
+        times_24h = state.times_24h
+        amounts_24h = state.amounts_24h
+        while times_24h and times_24h[0] <= ts - WINDOW_24H_US:
+            times_24h.popleft()
+            state.amount_sum_24h -= amounts_24h.popleft()
+
+        if not amounts_24h:
+            # Reset accumulated rounding drift whenever the window empties
+            state.amount_sum_24h = 0.0
+
+        times_1h.append(ts)
+        times_24h.append(ts)
+        amounts_24h.append(amount)
+        state.amount_sum_24h += amount
+
+        # ---- Impossible travel feature ----
+        time_diff_hours = time_since_last / 3600
+        if time_diff_hours > 0:
+            travel_speed = min(travel_distance / time_diff_hours, MAX_TRAVEL_SPEED_KMH)
+        else:
+            travel_speed = 0.0
+
+        if state.last_ts is None or ts > state.last_ts:
+            state.last_ts = ts
+        if has_location:
+            state.last_lat = merchant_lat
+            state.last_long = merchant_long
+
+        return {
+            "time_since_last_txn_sec": time_since_last,
+            "txn_count_1h": float(len(times_1h)),
+            "txn_count_24h": float(len(times_24h)),
+            "avg_amount_24h": state.amount_sum_24h / len(amounts_24h),
+            "travel_speed_kmh": travel_speed,
+        }
+
+
+# Features computed here; any other model feature is a raw request field
+DERIVED_FEATURES = (
+    "time_since_last_txn_sec",
+    "txn_count_1h",
+    "txn_count_24h",
+    "avg_amount_24h",
+    "travel_speed_kmh",
+    "amount_dev_log",
+    "hour_sin",
+    "hour_cos",
+)
+
+
+def derive_online_features(txn: dict, store: CustomerStateStore) -> dict:
+    """
+    Online counterpart of `build_features` for a single transaction.
+    Reads and updates the customer's rolling state instead of re-running
+    the batch groupby/rolling pipeline; returns the `DERIVED_FEATURES`.
+    """
+    amount = txn["amount"]
+    derived = store.update(
+        txn["customer_id"],
+        txn["timestamp"],
+        amount,
+        txn.get("merchant_lat"),
+        txn.get("merchant_long"),
+    )
+
+    # Log-transform amount deviation
+    amount_deviation = amount - derived["avg_amount_24h"]
+    derived["amount_dev_log"] = math.copysign(
+        math.log1p(abs(amount_deviation)), amount_deviation
+    ) if amount_deviation != 0 else 0.0
+
+    # ---- Cyclical time ----
+    angle = 2 * math.pi * txn["hour"] / 24
+    derived["hour_sin"] = math.sin(angle)
+    derived["hour_cos"] = math.cos(angle)
+
+    return derived
+
+
+class FeatureVectorBuilder:
+    """
+    Pandas-free fast path for one transaction.
+
+    Updates the customer's rolling state and writes the model features
+    straight into a float64 vector in `features` order (the
+    model_features_v1.json contract), with scalar math only.
+    """
+
+    def __init__(self, features: list, store: CustomerStateStore):
+        self.features = list(features)
+        self.store = store
+
+        self._derived = [(j, f) for j, f in enumerate(self.features) if f in DERIVED_FEATURES]
+        self._passthrough = [
+            (j, f) for j, f in enumerate(self.features) if f not in DERIVED_FEATURES
+        ]
+
+    def build(self, txn: dict, out: np.ndarray = None) -> np.ndarray:
+        """
+        Feature vector of `txn`, written into `out` (e.g. a row of a
+        preallocated batch matrix) when given.
+        """
+        # Validate before touching the customer's state
+        missing = {f for _, f in self._passthrough if txn.get(f) is None}
+        if missing:
+            raise ValueError(f"Missing features: {missing}")
+
+        if out is None:
+            out = np.empty(len(self.features), dtype=np.float64)
+
+        derived = derive_online_features(txn, self.store)
+
+        for j, name in self._derived:
+            out[j] = derived[name]
+        for j, name in self._passthrough:
+            out[j] = txn[name]
+
+        return out
+
+
+def build_online_feature_matrix(
+    txns: list,
+    store: CustomerStateStore,
+    features: list,
+) -> np.ndarray:
+    """
+    Batch counterpart of `FeatureVectorBuilder`.
+
+    Transactions update the state store in timestamp order and the result
+    is a (n, len(features)) matrix whose rows follow the input order.
+    """
+    n = len(txns)
+    columns = {name: np.empty(n, dtype=np.float64) for name in DERIVED_FEATURES}
+
+    # Stable sort keeps same-timestamp transactions in arrival order
+    order = sorted(range(n), key=lambda i: to_epoch_us(txns[i]["timestamp"]))
+    for i in order:
+        txn = txns[i]
+        for name, value in derive_online_features(txn, store).items():
+            columns[name][i] = value
+
+    X = np.empty((n, len(features)), dtype=np.float64)
+    for j, name in enumerate(features):
+        if name in columns:
+            X[:, j] = columns[name]
+        else:
+            # Raw request fields passed straight through (e.g. distance_from_home)
+            X[:, j] = np.fromiter((t[name] for t in txns), dtype=np.float64, count=n)
+
+    return X
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering.rolling_window import (
+    WINDOW_FEATURES,
+    compute_window_features,
+)
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays backed by shared memory blocks.
+
+    Workers attach by name (no pickling of the data itself); the owner
+    unlinks the blocks on close.
+    """
+
+    def __init__(self, specs: dict, create: bool = True):
+        # specs: name -> (shm_name or None, shape, dtype str)
+        self._blocks = {}
+        self.arrays = {}
+        self.specs = {}
+        self._owner = create
+
+        for name, (shm_name, shape, dtype) in specs.items():
+            nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            if create:
+                block = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=shm_name)
+
+            self._blocks[name] = block
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            self.specs[name] = (block.name, shape, dtype)
+
+    def close(self):
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _partition_worker(bounds: tuple, specs: dict):
+    shared = SharedArrays(specs, create=False)
+    try:
+        a = shared.arrays
+        start, stop = bounds
+        rows = a["partition_rows"][start:stop]
+        if len(rows) == 0:
+            return 0
+
+        # Rows stay in (customer, timestamp) order, so each partition is a
+        # valid sorted input for the sweep; results go straight back into
+        # the shared output columns at their global positions
+        features = compute_window_features(
+            a["group_codes"][rows],
+            a["ts_ns"][rows],
+            a["amount"][rows],
+            a["lat"][rows],
+            a["lon"][rows],
+        )
+        for name, values in features.items():
+            a[name][rows] = values
+
+        return len(rows)
+    finally:
+        shared.close()
+
+
+def customer_partitions(customer_ids, n_partitions: int) -> np.ndarray:
+    """
+    Stable hash partition of customer ids (same id → same partition in
+    every run and on every machine).
+    """
+    hashes = pd.util.hash_array(np.asarray(customer_ids, dtype=object))
+    return (hashes % np.uint64(n_partitions)).astype(np.int32)
+
+
+def compute_window_features_parallel(
+    group_codes: np.ndarray,
+    ts_ns: np.ndarray,
+    amount: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    customer_ids,
+    n_workers: int = None,
+    partitions_per_worker: int = 4,
+) -> dict:
+    """
+    Multi-process compute_window_features over the same sorted inputs.
+
+    `customer_ids[code]` is the id behind each group code. Customers are
+    hash-partitioned, each partition is swept by a worker process that
+    reads inputs from and writes features to shared memory, and the
+    result is identical to the serial sweep.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    n_rows = len(ts_ns)
+
+    n_partitions = n_workers * partitions_per_worker
+    partition = customer_partitions(customer_ids, n_partitions)[group_codes]
+
+    # Row ids grouped by partition; the stable sort keeps each partition's
+    # rows in (customer, timestamp) order
+    partition_rows = np.argsort(partition, kind="stable")
+    offsets = np.searchsorted(partition[partition_rows], np.arange(n_partitions + 1))
+    bounds = list(zip(offsets[:-1], offsets[1:]))
+
+    specs = {
+        "group_codes": (None, (n_rows,), "int64"),
+        "ts_ns": (None, (n_rows,), "int64"),
+        "amount": (None, (n_rows,), "float64"),
+        "lat": (None, (n_rows,), "float64"),
+        "lon": (None, (n_rows,), "float64"),
+        "partition_rows": (None, (n_rows,), "int64"),
+        **{name: (None, (n_rows,), "float64") for name in WINDOW_FEATURES},
+    }
+
+    with SharedArrays(specs) as shared:
+        a = shared.arrays
+        a["group_codes"][:] = group_codes
+        a["ts_ns"][:] = ts_ns
+        a["amount"][:] = amount
+        a["lat"][:] = lat
+        a["lon"][:] = lon
+        a["partition_rows"][:] = partition_rows
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rows_done = sum(
+                pool.map(
+                    _partition_worker,
+                    bounds,
+                    [shared.specs] * n_partitions,
+                )
+            )
+
+        if rows_done != n_rows:
+            raise RuntimeError(f"Partitions covered {rows_done} of {n_rows} rows")
+
+        return {name: a[name].copy() for name in WINDOW_FEATURES}
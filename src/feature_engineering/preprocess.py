@@ -1,11 +1,15 @@
+import tempfile
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
 from src.feature_engineering.behavioral_features import add_behavioral_features
+from src.utils.config import PROCESSED_DATA_DIR, RAW_TRANSACTIONS_PATH
+from src.utils.storage import read_dataset, write_dataset
 
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+def build_features(df: pd.DataFrame, n_jobs: int = None) -> pd.DataFrame:
     df = df.copy()
     df["timestamp"] = pd.to_datetime(df["timestamp"])
 
@@ -22,7 +26,7 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = default_val
 
     # Feature engineering (shared)
-    df = add_behavioral_features(df)
+    df = add_behavioral_features(df, n_jobs=n_jobs)
 
     # Log-transform amount deviation
     df["amount_dev_log"] = np.sign(df["amount_deviation"]) * np.log1p(
@@ -45,25 +49,127 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
-# ---------------- BATCH PIPELINE (UNCHANGED) ----------------
-
-BASE_DIR = Path(__file__).resolve()
-while BASE_DIR.name != "fraud-anamoly-detection":
-    BASE_DIR = BASE_DIR.parent
-
-RAW_PATH = BASE_DIR / "data" / "raw" / "transactions_raw.csv"
-OUT_PATH = BASE_DIR / "data" / "processed" / "transactions_features.csv"
+# ---------------- BATCH PIPELINE ----------------
+
+# Repo root comes from config (walking up to a fixed directory name never
+# terminates when the checkout is named differently)
+# Same file generate_dataset writes
+RAW_PATH = RAW_TRANSACTIONS_PATH
+OUT_PATH = PROCESSED_DATA_DIR / "transactions_features.csv"
+
+
+def _customer_partition_bounds(raw_path, chunksize: int) -> np.ndarray:
+    """
+    Pass 1: split the sorted customer ids into contiguous ranges holding
+    roughly `chunksize` rows each. Only customer_id is read.
+    """
+    counts = None
+    for chunk in pd.read_csv(raw_path, usecols=["customer_id"], dtype=str, chunksize=chunksize):
+        chunk_counts = chunk["customer_id"].value_counts()
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+    counts = counts.sort_index()
+    rows_before = np.concatenate(([0], np.cumsum(counts.values)[:-1]))
+
+    # First customer of every range; one customer is never split
+    starts = np.flatnonzero(np.diff(rows_before // chunksize, prepend=-1))
+    return counts.index.values[starts]
+
+
+def run_feature_engineering_chunked(
+    raw_path=RAW_PATH,
+    out_path=OUT_PATH,
+    chunksize: int = 1_000_000,
+    tmp_dir=None,
+    n_jobs: int = None,
+):
+    """
+    Out-of-core version of run_feature_engineering.
+
+    Customers are range-partitioned (all rows of a customer land in the
+    same partition, partitions follow customer_id order), raw rows are
+    spilled to per-partition files chunk by chunk, and each partition is
+    featurized and appended to the output in order. Peak memory is about
+    one partition (~`chunksize` rows) and the output is identical to the
+    in-memory path.
+    """
+    bounds = _customer_partition_bounds(raw_path, chunksize)
+    print(f"[INFO] {len(bounds)} customer partitions")
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as spill_dir:
+        spill_paths = [Path(spill_dir) / f"part_{i:05d}.csv" for i in range(len(bounds))]
+
+        # Pass 2: spill raw rows (as text, untouched) to their partition
+        for chunk in pd.read_csv(raw_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+            partition = np.searchsorted(bounds, chunk["customer_id"].values, side="right") - 1
+            for part_id, part in chunk.groupby(partition, sort=False):
+                path = spill_paths[part_id]
+                part.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+        # Pass 3: featurize partitions in customer order and append
+        first = True
+        for path in spill_paths:
+            if not path.exists():
+                continue
+
+            df = build_features(pd.read_csv(path), n_jobs=n_jobs)
+            df.to_csv(out_path, mode="w" if first else "a", header=first, index=False)
+            first = False
+
+
+def run_feature_engineering(
+    chunksize: int = None, n_jobs: int = None, fmt: str = "csv"
+):
+    if fmt == "parquet":
+        # Parquet is read whole (column projection, no row chunks)
+        if chunksize:
+            raise ValueError("chunksize is only supported for CSV input")
+
+        raw_path = RAW_PATH.with_suffix(".parquet")
+        out_path = OUT_PATH.with_suffix(".parquet")
+        print(f"[INFO] Loading: {raw_path}")
+
+        df = build_features(read_dataset(raw_path), n_jobs=n_jobs)
+        write_dataset(df, out_path)
+        print(f"[SUCCESS] Saved → {out_path}")
+        return
 
-
-def run_feature_engineering():
     print(f"[INFO] Loading: {RAW_PATH}")
 
+    if chunksize:
+        run_feature_engineering_chunked(RAW_PATH, OUT_PATH, chunksize, n_jobs=n_jobs)
+        print(f"[SUCCESS] Saved → {OUT_PATH}")
+        return
+
     df = pd.read_csv(RAW_PATH)
-    df = build_features(df)
+    df = build_features(df, n_jobs=n_jobs)
 
     df.to_csv(OUT_PATH, index=False)
     print(f"[SUCCESS] Saved → {OUT_PATH}")
 
 
 if __name__ == "__main__":
-    run_feature_engineering()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Feature engineering batch pipeline")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the raw CSV in chunks of this many rows (bounded memory; CSV only)",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Worker processes for behavioral features (customer partitions)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Storage format of the raw input and feature output",
+    )
+    args = parser.parse_args()
+
+    run_feature_engineering(chunksize=args.chunksize, n_jobs=args.n_jobs, fmt=args.format)
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+
+from src.data_generation.entity_tables import EntityTable
+from src.utils.config import CUSTOMER_TABLE_DIR, MERCHANT_TABLE_DIR
+from src.utils.geo_utils import haversine_distance
+
+
+class _RowIndex:
+    """
+    id → row lookup over a (possibly memory-mapped) bytes id column.
+
+    Generated tables store `<PREFIX>_<row>` at position `row` (flagged
+    `positional_ids` in their meta), so the row is parsed from the id and
+    verified with a single read: O(1) and no per-process copy. Other
+    tables fall back to a dict.
+    """
+
+    def __init__(self, ids: np.ndarray, positional: bool = False):
+        self.ids = ids
+        self._rows = None
+        if not positional:
+            self._rows = {value.decode(): row for row, value in enumerate(ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _positional_row(self, key: str):
+        number = key.rpartition("_")[2]
+        if not number.isdigit():
+            return None
+        row = int(number)
+        if row < len(self.ids) and self.ids[row] == key.encode():
+            return row
+        return None
+
+    def get(self, key: str):
+        if self._rows is not None:
+            return self._rows.get(key)
+        return self._positional_row(key)
+
+
+def _row_index(table: EntityTable, id_column: str):
+    if table is None:
+        return None
+    return _RowIndex(table[id_column], positional=table.meta.get("positional_ids", False))
+
+
+class ReferenceIndex:
+    """
+    Read-only merchant / customer reference data for serving.
+
+    Lets the API take a `merchant_id` and derive the merchant's location
+    and category, and `distance_from_home` from the customer's home, the
+    same way the data generators do. Tables are opened memory-mapped so
+    every worker shares the same pages.
+    """
+
+    def __init__(self, customers: EntityTable = None, merchants: EntityTable = None):
+        self.customers = customers
+        self.merchants = merchants
+        self._customer_rows = _row_index(customers, "customer_id")
+        self._merchant_rows = _row_index(merchants, "merchant_id")
+
+    @classmethod
+    def load(cls, customer_dir=CUSTOMER_TABLE_DIR, merchant_dir=MERCHANT_TABLE_DIR):
+        """
+        Open the saved entity tables; a missing table leaves that lookup
+        disabled.
+        """
+        def _load(path):
+            if os.path.exists(os.path.join(path, "meta.json")):
+                return EntityTable.load(path, mmap_mode="r")
+            return None
+
+        return cls(_load(customer_dir), _load(merchant_dir))
+
+    @property
+    def n_customers(self) -> int:
+        return len(self._customer_rows) if self._customer_rows else 0
+
+    @property
+    def n_merchants(self) -> int:
+        return len(self._merchant_rows) if self._merchant_rows else 0
+
+    def merchant(self, merchant_id: str) -> dict:
+        """
+        Location and category of a merchant, or None if unknown.
+        """
+        row = self._merchant_rows.get(merchant_id) if self._merchant_rows else None
+        if row is None:
+            return None
+
+        m = self.merchants
+        return {
+            "merchant_lat": float(m["merchant_lat"][row]),
+            "merchant_long": float(m["merchant_long"][row]),
+            "merchant_category": m.meta["category_code"][m["category_code"][row]],
+        }
+
+    def customer_home(self, customer_id: str) -> tuple:
+        """
+        (home_lat, home_lon) of a customer, or None if unknown.
+        """
+        row = self._customer_rows.get(customer_id) if self._customer_rows else None
+        if row is None:
+            return None
+        return float(self.customers["home_lat"][row]), float(self.customers["home_lon"][row])
+
+    def enrich(self, txn: dict) -> dict:
+        """
+        Fill merchant location / category and `distance_from_home` for a
+        request. A `distance_from_home` sent by the client is kept.
+        """
+        txn = dict(txn)
+
+        merchant_id = txn.get("merchant_id")
+        if merchant_id is not None:
+            merchant = self.merchant(merchant_id)
+            if merchant is None:
+                raise ValueError(f"Unknown merchant_id: {merchant_id}")
+            txn.update(merchant)
+
+        if txn.get("distance_from_home") is None:
+            home = self.customer_home(txn["customer_id"])
+            if merchant_id is None or home is None:
+                raise ValueError(
+                    "distance_from_home is required unless merchant_id and a "
+                    "known customer_id are given"
+                )
+            # Same rounding as the transaction simulator
+            txn["distance_from_home"] = round(
+                float(haversine_distance(home[0], home[1], txn["merchant_lat"], txn["merchant_long"])),
+                2,
+            )
+
+        return txn
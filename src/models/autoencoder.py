@@ -1,9 +1,15 @@
 import numpy as np
-from tensorflow.keras.models import load_model
+
+from src.models.numpy_autoencoder import NumpyAutoencoder
 
 
 def load_autoencoder(model_path: str):
     # Load trained autoencoder model.
+    # `.npz` exports (see numpy_autoencoder.py) run without TensorFlow.
+    if str(model_path).endswith(".npz"):
+        return NumpyAutoencoder.load(model_path)
+
+    from tensorflow.keras.models import load_model
     return load_model(model_path)
 
 
@@ -13,6 +19,9 @@ def compute_reconstruction_error(
 ) -> np.ndarray:
     """ Compute reconstruction error (MSE per sample).
         Higher error = more anomalous."""
+    if isinstance(model, NumpyAutoencoder):
+        return model.reconstruction_error(X_scaled)
+
     X_recon = model.predict(X_scaled, verbose=0)
     errors = np.mean(np.square(X_scaled - X_recon), axis=1)
     return errors
@@ -36,3 +45,44 @@ def run_autoencoder(
     errors = compute_reconstruction_error(model, X_scaled)
     flags = flag_anomalies(errors, threshold)
     return errors, flags
+
+
+def calibrate_threshold(errors: np.ndarray, percentile: float = 99) -> float:
+    # Error above which the top (100 - percentile)% of samples are flagged
+    # (same rule as the anomaly-rate sweep in notebooks/06_autoencoder.ipynb)
+    return float(np.percentile(errors, percentile))
+
+
+if __name__ == "__main__":
+    import json
+
+    import joblib
+
+    from src.utils.config import BASE_DIR, PROCESSED_DATA_DIR
+    from src.utils.storage import load_columns
+
+    models_dir = BASE_DIR / "models"
+    thresholds_path = models_dir / "thresholds_v1.json"
+
+    with open(models_dir / "model_features_v1.json") as f:
+        features = json.load(f)["features"]
+    with open(thresholds_path) as f:
+        thresholds = json.load(f)
+
+    scaler = joblib.load(models_dir / "standard_scaler_v1.pkl")
+    model = load_autoencoder(models_dir / "autoencoder_v1.npz")
+
+    X = load_columns(PROCESSED_DATA_DIR / "transactions_features.csv", features)
+    errors = compute_reconstruction_error(model, scaler.transform(X.to_numpy()))
+
+    percentile = thresholds["autoencoder"]["percentile"]
+    threshold = calibrate_threshold(errors, percentile)
+    print(
+        f"[INFO] Autoencoder p{percentile} error: {threshold:.6g} "
+        f"(was {thresholds['autoencoder']['threshold_value']:.6g})"
+    )
+
+    thresholds["autoencoder"]["threshold_value"] = threshold
+    with open(thresholds_path, "w") as f:
+        json.dump(thresholds, f, indent=2)
+    print(f"[SUCCESS] Saved → {thresholds_path}")
@@ -0,0 +1,255 @@
+import joblib
+import numpy as np
+
+
+def _average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """
+    Average path length of an unsuccessful BST search over n samples,
+    c(n) in the Isolation Forest paper (same as sklearn's helper).
+    """
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+
+    mask_1 = n_samples <= 1
+    mask_2 = n_samples == 2
+    not_mask = ~(mask_1 | mask_2)
+
+    result[mask_2] = 1.0
+    result[not_mask] = (
+        2.0 * (np.log(n_samples[not_mask] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples[not_mask] - 1.0) / n_samples[not_mask]
+    )
+    return result
+
+
+class FlatIsolationForest:
+    """
+    Isolation Forest flattened into contiguous node arrays.
+
+    All trees live in one set of arrays (feature, threshold, interleaved
+    (left, right) children, leaf path length) and a batch is pushed
+    through every tree at once, one tree level per step. Scores match the
+    sklearn model they were exported from.
+    """
+
+    ARRAYS = ("feature", "threshold", "children", "path_length", "roots")
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        path_length: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        max_samples: int,
+        offset: float,
+        n_features: int,
+        block_size: int = 256,
+        input_dtype: str = "float32",
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        # Interleaved (left, right) pairs: one gather per level instead of
+        # two; saved in this layout so a memory-mapped load needs no copy
+        self.children = children
+        self.path_length = path_length
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.max_samples = int(max_samples)
+        self.offset_ = float(offset)
+        self.n_features_in_ = int(n_features)
+        self.block_size = block_size
+        self.input_dtype = input_dtype
+
+        self._denominator = len(roots) * float(
+            _average_path_length([self.max_samples])[0]
+        )
+
+    @property
+    def left(self) -> np.ndarray:
+        return self.children[0::2]
+
+    @property
+    def right(self) -> np.ndarray:
+        return self.children[1::2]
+
+    @staticmethod
+    def interleave(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return np.stack([left, right], axis=1).ravel()
+
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatIsolationForest":
+        """
+        Flatten a fitted sklearn IsolationForest.
+        """
+        features, thresholds, lefts, rights, path_lengths, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for tree_idx, (estimator, tree_features) in enumerate(
+            zip(model.estimators_, model.estimators_features_)
+        ):
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Leaves point at themselves so extra traversal steps are no-ops
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            # Tree-local feature index → column of the full input matrix
+            feature = np.asarray(tree_features)[np.where(is_leaf, 0, tree.feature)]
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            # Depth contribution of each leaf, as in IsolationForest._compute_score_samples
+            path_length = np.where(
+                is_leaf,
+                model._decision_path_lengths[tree_idx]
+                + model._average_path_length_per_tree[tree_idx]
+                - 1.0,
+                0.0,
+            )
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            path_lengths.append(path_length)
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=cls.interleave(
+                np.concatenate(lefts).astype(np.intp),
+                np.concatenate(rights).astype(np.intp),
+            ),
+            path_length=np.concatenate(path_lengths).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            max_samples=model._max_samples,
+            offset=model.offset_,
+            n_features=model.n_features_in_,
+        )
+
+    def _depths(self, X: np.ndarray) -> np.ndarray:
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = (np.arange(n_samples, dtype=np.intp) * n_features)[:, None]
+
+        # (n_samples, n_trees) current node of every sample in every tree
+        nodes = np.broadcast_to(self.roots, (n_samples, len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_right = X_flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+
+        return self.path_length[nodes].sum(axis=1)
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """
+        Same as IsolationForest.score_samples. The lower, the more abnormal.
+        """
+        # sklearn evaluates trees on float32 inputs; scaler-fused forests
+        # compare raw float64 values
+        X = np.ascontiguousarray(X, dtype=self.input_dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected {self.n_features_in_} features, got shape {X.shape}"
+            )
+
+        depths = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.block_size):
+            block = slice(start, start + self.block_size)
+            depths[block] = self._depths(X[block])
+
+        return -(2 ** (-depths / self._denominator))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Same as IsolationForest.decision_function. Negative = outlier.
+        """
+        return self.score_samples(X) - self.offset_
+
+    def fuse_scaler(self, mean: np.ndarray, scale: np.ndarray) -> "FlatIsolationForest":
+        """
+        Forest that scores raw features: every split `(x - mean) / scale > t`
+        becomes `x > mean + scale * t` (scale > 0), so no scaler step runs.
+        """
+        scale = np.asarray(scale, dtype=np.float64)
+        if np.any(scale <= 0):
+            raise ValueError("Scaler scales must be positive")
+
+        mean = np.asarray(mean, dtype=np.float64)
+        threshold = self.threshold
+
+        if np.dtype(self.input_dtype) == np.float32:
+            # float32(z) > t  ⇔  z is past the rounding midpoint between the
+            # float32 values around t; splitting there keeps raw float64
+            # comparisons on the same branch as the scaled float32 ones
+            below = threshold.astype(np.float32)
+            below = np.where(below > threshold, np.nextafter(below, np.float32(-np.inf)), below)
+            above = np.nextafter(below, np.float32(np.inf))
+            threshold = (below.astype(np.float64) + above.astype(np.float64)) / 2
+
+        # Leaves keep their +inf thresholds
+        threshold = mean[self.feature] + scale[self.feature] * threshold
+
+        return FlatIsolationForest(
+            feature=self.feature,
+            threshold=threshold,
+            children=self.children,
+            path_length=self.path_length,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            max_samples=self.max_samples,
+            offset=self.offset_,
+            n_features=self.n_features_in_,
+            block_size=self.block_size,
+            input_dtype="float64",
+        )
+
+    def save(self, path):
+        joblib.dump(
+            {
+                **{name: getattr(self, name) for name in self.ARRAYS},
+                "max_depth": self.max_depth,
+                "max_samples": self.max_samples,
+                "offset": self.offset_,
+                "n_features": self.n_features_in_,
+                "input_dtype": self.input_dtype,
+            },
+            path,
+        )
+
+    @classmethod
+    def load(cls, path, mmap_mode=None) -> "FlatIsolationForest":
+        arrays = joblib.load(path, mmap_mode=mmap_mode)
+        if "children" not in arrays:
+            # Artifacts saved before children were stored interleaved
+            arrays["children"] = cls.interleave(arrays.pop("left"), arrays.pop("right"))
+        return cls(**arrays)
+
+
+def export_flat_forest(model_path, out_path) -> FlatIsolationForest:
+    """
+    Export step: sklearn pickle → flattened array artifact.
+    """
+    flat = FlatIsolationForest.from_sklearn(joblib.load(model_path))
+    flat.save(out_path)
+    return flat
+
+
+if __name__ == "__main__":
+    from src.utils.config import BASE_DIR
+
+    model_path = BASE_DIR / "models" / "isolation_forest_v1.pkl"
+    out_path = BASE_DIR / "models" / "isolation_forest_v1_flat.joblib"
+
+    print(f"[INFO] Flattening: {model_path}")
+    export_flat_forest(model_path, out_path)
+    print(f"[SUCCESS] Saved → {out_path}")
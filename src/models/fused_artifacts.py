@@ -0,0 +1,102 @@
+import joblib
+import numpy as np
+
+from src.models.flat_isolation_forest import FlatIsolationForest
+from src.models.isolation_forest import load_isolation_forest
+from src.models.numpy_autoencoder import NumpyAutoencoder
+
+
+# Scaler-fused artifacts score raw feature matrices: no transform step
+FUSED_FOREST_NAME = "isolation_forest_v1_fused.joblib"
+FUSED_AUTOENCODER_NAME = "autoencoder_v1_fused.npz"
+
+
+def export_fused_artifacts(scaler_path, forest_path, autoencoder_path, out_dir) -> tuple:
+    """
+    Export step: StandardScaler folded into the flattened Isolation Forest
+    and the NumPy autoencoder. Returns (forest, autoencoder).
+    """
+    scaler = joblib.load(scaler_path)
+
+    forest = load_isolation_forest(forest_path, flat=True)
+    if not isinstance(forest, FlatIsolationForest):
+        raise TypeError("Expected a flattenable Isolation Forest")
+
+    fused_forest = forest.fuse_scaler(scaler.mean_, scaler.scale_)
+    fused_autoencoder = NumpyAutoencoder.load(autoencoder_path).fuse_scaler(
+        scaler.mean_, scaler.scale_
+    )
+
+    fused_forest.save(out_dir / FUSED_FOREST_NAME)
+    fused_autoencoder.save(out_dir / FUSED_AUTOENCODER_NAME)
+    return fused_forest, fused_autoencoder
+
+
+def parity_report(
+    scaler,
+    forest,
+    fused_forest,
+    autoencoder,
+    fused_autoencoder,
+    X: np.ndarray,
+    thresholds: dict,
+) -> dict:
+    """
+    Compare fused scores on raw X with the scaler → model pipeline.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    X_scaled = (X - scaler.mean_) / scaler.scale_
+
+    iso = forest.decision_function(X_scaled)
+    iso_fused = fused_forest.decision_function(X)
+    ae = autoencoder.reconstruction_error(X_scaled)
+    ae_fused = fused_autoencoder.reconstruction_error(X)
+
+    iso_threshold = thresholds["isolation_forest"]["threshold_value"]
+    ae_threshold = thresholds["autoencoder"]["threshold_value"]
+
+    return {
+        "n_samples": len(X),
+        "iso_max_abs_diff": float(np.max(np.abs(iso - iso_fused))),
+        "iso_flag_agreement": float(((iso < iso_threshold) == (iso_fused < iso_threshold)).mean()),
+        "ae_max_rel_diff": float(np.max(np.abs(ae - ae_fused) / np.maximum(ae, 1e-12))),
+        "ae_flag_agreement": float(((ae > ae_threshold) == (ae_fused > ae_threshold)).mean()),
+    }
+
+
+if __name__ == "__main__":
+    import json
+
+    from src.utils.config import BASE_DIR, PROCESSED_DATA_DIR
+    from src.utils.storage import load_columns
+
+    models_dir = BASE_DIR / "models"
+    scaler_path = models_dir / "standard_scaler_v1.pkl"
+    forest_path = models_dir / "isolation_forest_v1.pkl"
+    autoencoder_path = models_dir / "autoencoder_v1.npz"
+
+    print(f"[INFO] Fusing {scaler_path.name} into {forest_path.name} and {autoencoder_path.name}")
+    fused_forest, fused_autoencoder = export_fused_artifacts(
+        scaler_path, forest_path, autoencoder_path, models_dir
+    )
+    print(f"[SUCCESS] Saved → {models_dir / FUSED_FOREST_NAME}")
+    print(f"[SUCCESS] Saved → {models_dir / FUSED_AUTOENCODER_NAME}")
+
+    # Verify against the unfused pipeline on the processed dataset
+    with open(models_dir / "model_features_v1.json") as f:
+        features = json.load(f)["features"]
+    with open(models_dir / "thresholds_v1.json") as f:
+        thresholds = json.load(f)
+
+    X = load_columns(PROCESSED_DATA_DIR / "transactions_features.csv", features).to_numpy()
+    report = parity_report(
+        joblib.load(scaler_path),
+        load_isolation_forest(forest_path, flat=True),
+        fused_forest,
+        NumpyAutoencoder.load(autoencoder_path),
+        fused_autoencoder,
+        X,
+        thresholds,
+    )
+    for key, value in report.items():
+        print(f"    {key}: {value}")
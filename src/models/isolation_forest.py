@@ -1,13 +1,23 @@
 import joblib
 import numpy as np
 
+from src.models.flat_isolation_forest import FlatIsolationForest
 
-def load_isolation_forest(model_path: str):
-    return joblib.load(model_path)
+
+def load_isolation_forest(model_path: str, flat: bool = False, mmap_mode: str = None):
+    # Flattened / scaler-fused artifacts (see flat_isolation_forest.py and
+    # fused_artifacts.py) load as FlatIsolationForest; with mmap_mode="r"
+    # their node arrays are memory-mapped and shared between workers
+    if str(model_path).endswith(("_flat.joblib", "_fused.joblib")):
+        return FlatIsolationForest.load(model_path, mmap_mode=mmap_mode)
+
+    model = joblib.load(model_path)
+    return FlatIsolationForest.from_sklearn(model) if flat else model
 
 def score_transactions(model, X_scaled: np.ndarray) -> np.ndarray:
     return model.decision_function(X_scaled)  
 # Compute anomaly scores for transactions. Lower score = more anomalous.
+# Works with both the sklearn model and FlatIsolationForest.
 
 def flag_anomalies(scores: np.ndarray, threshold: float) -> np.ndarray:
     return scores < threshold
@@ -0,0 +1,203 @@
+import json
+import threading
+import zipfile
+
+import numpy as np
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": _tanh,
+    "linear": _linear,
+}
+
+
+class NumpyAutoencoder:
+    """
+    TensorFlow-free forward pass for a stack of Dense layers.
+
+    Matmuls run in float32 (like Keras) into per-layer buffers that are
+    allocated once and reused until a larger batch shows up.
+    """
+
+    def __init__(self, kernels, biases, activations, error_scale=None):
+        unsupported = set(activations) - set(ACTIVATIONS)
+        if unsupported:
+            raise ValueError(f"Unsupported activations: {unsupported}")
+
+        self.kernels = [np.ascontiguousarray(k, dtype=np.float32) for k in kernels]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.n_features_in_ = self.kernels[0].shape[0]
+
+        # Per-feature weights of the reconstruction error (scaler-fused models)
+        self.error_scale = (
+            None if error_scale is None else np.asarray(error_scale, dtype=np.float64)
+        )
+
+        self._buffers = []
+        self._capacity = 0
+        self._lock = threading.Lock()
+
+    def _ensure_capacity(self, n_samples: int):
+        if n_samples <= self._capacity:
+            return
+
+        self._input = np.empty((n_samples, self.n_features_in_), dtype=np.float32)
+        self._buffers = [
+            np.empty((n_samples, k.shape[1]), dtype=np.float32) for k in self.kernels
+        ]
+        self._capacity = n_samples
+
+    def _forward(self, X: np.ndarray) -> np.ndarray:
+        # Caller holds self._lock; result is a view into the last buffer
+        n_samples = X.shape[0]
+        self._ensure_capacity(n_samples)
+
+        h = self._input[:n_samples]
+        h[...] = X
+
+        for kernel, bias, activation, buffer in zip(
+            self.kernels, self.biases, self.activations, self._buffers
+        ):
+            out = buffer[:n_samples]
+            np.matmul(h, kernel, out=out)
+            out += bias
+            h = ACTIVATIONS[activation](out)
+
+        return h
+
+    def predict(self, X: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Reconstruction of X. Mirrors keras `model.predict` (extra kwargs
+        such as `verbose` are accepted and ignored).
+        """
+        X = np.asarray(X)
+        with self._lock:
+            return self._forward(X).copy()
+
+    def reconstruction_error(self, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        MSE per sample without materialising a reconstruction copy.
+        """
+        X_scaled = np.asarray(X_scaled)
+        with self._lock:
+            X_recon = self._forward(X_scaled)
+            if self.error_scale is None:
+                return np.mean(np.square(X_scaled - X_recon), axis=1)
+
+            diff = X_scaled - X_recon
+            diff *= self.error_scale
+            return np.mean(np.square(diff, out=diff), axis=1)
+
+    def fuse_scaler(self, mean: np.ndarray, scale: np.ndarray) -> "NumpyAutoencoder":
+        """
+        Model that takes raw features.
+
+        The scaler folds into the first Dense layer (W / scale, b - (mean /
+        scale) @ W) and, through a linear output layer, into the
+        reconstruction, which comes out in raw units. The error then
+        weights each feature by 1 / scale, giving the same MSE as the
+        scaled pipeline.
+        """
+        if self.activations[-1] != "linear":
+            raise ValueError("Scaler fusion needs a linear output layer")
+
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        kernels = [k.astype(np.float64) for k in self.kernels]
+        biases = [b.astype(np.float64) for b in self.biases]
+
+        biases[0] = biases[0] - (mean / scale) @ kernels[0]
+        kernels[0] = kernels[0] / scale[:, None]
+
+        kernels[-1] = kernels[-1] * scale[None, :]
+        biases[-1] = biases[-1] * scale + mean
+
+        return NumpyAutoencoder(kernels, biases, self.activations, error_scale=1.0 / scale)
+
+    def save(self, path):
+        arrays = {}
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+
+        if self.error_scale is not None:
+            arrays["error_scale"] = self.error_scale
+
+        np.savez(path, activations=np.array(self.activations), **arrays)
+
+    @classmethod
+    def load(cls, path) -> "NumpyAutoencoder":
+        with np.load(path) as data:
+            activations = [str(a) for a in data["activations"]]
+            kernels = [data[f"kernel_{i}"] for i in range(len(activations))]
+            biases = [data[f"bias_{i}"] for i in range(len(activations))]
+            error_scale = data["error_scale"] if "error_scale" in data else None
+
+        return cls(kernels, biases, activations, error_scale=error_scale)
+
+
+def export_autoencoder(keras_path, out_path) -> NumpyAutoencoder:
+    """
+    Dump the Dense layers of a `.keras` archive to `.npz`.
+
+    The archive is read directly (config.json + model.weights.h5), so the
+    export does not need TensorFlow either; only h5py.
+    """
+    import h5py
+
+    with zipfile.ZipFile(keras_path) as archive:
+        config = json.loads(archive.read("config.json"))
+
+        with archive.open("model.weights.h5") as f, h5py.File(f, "r") as weights:
+            kernels, biases, activations = [], [], []
+
+            for layer in config["config"]["layers"]:
+                if layer["class_name"] == "InputLayer":
+                    continue
+                if layer["class_name"] != "Dense":
+                    raise ValueError(
+                        f"Only Dense layers can be exported, got {layer['class_name']}"
+                    )
+
+                layer_vars = weights["layers"][layer["config"]["name"]]["vars"]
+                kernels.append(layer_vars["0"][()])
+                biases.append(layer_vars["1"][()])
+                activations.append(layer["config"]["activation"])
+
+    model = NumpyAutoencoder(kernels, biases, activations)
+    model.save(out_path)
+    return model
+
+
+if __name__ == "__main__":
+    from src.utils.config import BASE_DIR
+
+    keras_path = BASE_DIR / "models" / "autoencoder_v1.keras"
+    out_path = BASE_DIR / "models" / "autoencoder_v1.npz"
+
+    print(f"[INFO] Exporting: {keras_path}")
+    export_autoencoder(keras_path, out_path)
+    print(f"[SUCCESS] Saved → {out_path}")
@@ -9,6 +9,7 @@ def load_one_class_svm(model_path: str):
 def score_transactions(model, X_scaled: np.ndarray) -> np.ndarray:
     # Compute anomaly scores.
     # Lower (more negative) = more anomalous.
+    # Also accepts ApproximateOneClassSVM (one_class_svm_approx.py) for the hot path.
     return model.decision_function(X_scaled)
 
 
@@ -27,3 +28,69 @@ def run_one_class_svm(
     scores = score_transactions(model, X_scaled)
     flags = flag_anomalies(scores, threshold)
     return scores, flags
+
+
+def export_approximate_svm(
+    exact_model,
+    X_scaled: np.ndarray,
+    threshold: float,
+    out_path,
+    method: str = "nystroem",
+):
+    """
+    Export step: fit an ApproximateOneClassSVM to the exact model's
+    scores and save it. Returns (approx_model, parity report on the rows
+    held out from the fit).
+    """
+    from src.models.one_class_svm_approx import (
+        ApproximateOneClassSVM,
+        parity_report,
+        split_fit_holdout,
+    )
+
+    approx = ApproximateOneClassSVM(method=method).fit(exact_model, X_scaled)
+    _, holdout_rows = split_fit_holdout(len(X_scaled), approx.n_fit_samples, approx.random_state)
+    report = parity_report(exact_model, approx, X_scaled[holdout_rows], threshold)
+
+    if out_path is not None:
+        joblib.dump(approx, out_path)
+    return approx, report
+
+
+if __name__ == "__main__":
+    import json
+
+    import pandas as pd
+
+    from src.utils.config import BASE_DIR, PROCESSED_DATA_DIR
+    from src.utils.storage import load_columns
+
+    models_dir = BASE_DIR / "models"
+    scaler = joblib.load(models_dir / "standard_scaler_v1.pkl")
+    svm_model = load_one_class_svm(models_dir / "one_class_svm_v1.pkl")
+
+    with open(models_dir / "model_features_v1.json") as f:
+        features = json.load(f)["features"]
+
+    with open(models_dir / "thresholds_v1.json") as f:
+        threshold = json.load(f)["one_class_svm"]["threshold_value"]
+
+    df = load_columns(PROCESSED_DATA_DIR / "transactions_features.csv", features)
+    X_scaled = scaler.transform(df[features].to_numpy())
+
+    # Nyström is served; random Fourier features only for comparison
+    results = []
+    for method, out_path in (
+        ("nystroem", models_dir / "one_class_svm_v1_approx.pkl"),
+        ("rff", None),
+    ):
+        _, report = export_approximate_svm(svm_model, X_scaled, threshold, out_path, method)
+        results.append(report)
+        if out_path is not None:
+            print(f"[SUCCESS] Saved → {out_path}")
+
+    report = pd.DataFrame(results)
+    print(report.to_string(index=False))
+
+    report.to_csv(BASE_DIR / "reports" / "ocsvm_approx_parity.csv", index=False)
+    print("Saved: reports/ocsvm_approx_parity.csv")
@@ -0,0 +1,153 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.linear_model import Ridge
+
+
+def split_fit_holdout(n_rows: int, n_fit_samples: int, random_state: int) -> tuple:
+    """
+    Row numbers the approximation is fitted on and the held-out rest
+    (used for its parity report). Returns (fit_rows, holdout_rows).
+    """
+    rng = np.random.default_rng(random_state)
+    fit_rows = rng.choice(n_rows, size=min(n_fit_samples, n_rows), replace=False)
+
+    held_out = np.ones(n_rows, dtype=bool)
+    held_out[fit_rows] = False
+    return fit_rows, np.flatnonzero(held_out)
+
+
+class ApproximateOneClassSVM:
+    """
+    Fast stand-in for an RBF OneClassSVM.
+
+    Inputs are mapped through a Nyström or random Fourier feature
+    approximation of the SVM's own kernel, and a ridge model fitted on the
+    exact decision_function maps that space back to scores. All linear
+    pieces are folded together, so scoring is one kernel/projection
+    matmul against `n_components` rows plus a dot product, independent of
+    the number of support vectors.
+    """
+
+    def __init__(
+        self,
+        method: str = "nystroem",
+        n_components: int = 500,
+        n_fit_samples: int = 30_000,
+        alpha: float = 1e-3,
+        random_state: int = 42,
+    ):
+        if method not in ("nystroem", "rff"):
+            raise ValueError(f"Unknown method: {method}")
+
+        self.method = method
+        self.n_components = n_components
+        self.n_fit_samples = n_fit_samples
+        self.alpha = alpha
+        self.random_state = random_state
+
+    def fit(self, exact_model, X_scaled: np.ndarray) -> "ApproximateOneClassSVM":
+        """
+        Fit on `n_fit_samples` rows of X_scaled (see split_fit_holdout);
+        the remaining rows are unseen by the approximation.
+        """
+        X_scaled = np.asarray(X_scaled, dtype=np.float64)
+
+        fit_rows, _ = split_fit_holdout(len(X_scaled), self.n_fit_samples, self.random_state)
+        X_fit = X_scaled[fit_rows]
+        y_fit = exact_model.decision_function(X_fit)
+
+        gamma = exact_model._gamma
+        if self.method == "nystroem":
+            mapper = Nystroem(
+                gamma=gamma,
+                n_components=self.n_components,
+                random_state=self.random_state,
+            ).fit(X_fit)
+        else:
+            mapper = RBFSampler(
+                gamma=gamma,
+                n_components=self.n_components,
+                random_state=self.random_state,
+            ).fit(X_fit)
+
+        ridge = Ridge(alpha=self.alpha).fit(mapper.transform(X_fit), y_fit)
+
+        # Fold the feature map's linear parts and the ridge weights together
+        if self.method == "nystroem":
+            self.gamma_ = gamma
+            self.landmarks_ = mapper.components_
+            self.landmark_sq_norms_ = np.einsum("ij,ij->i", self.landmarks_, self.landmarks_)
+            self.coef_ = mapper.normalization_.T @ ridge.coef_
+        else:
+            self.projection_ = mapper.random_weights_
+            self.offset_ = mapper.random_offset_
+            self.coef_ = np.sqrt(2.0 / self.n_components) * ridge.coef_
+
+        self.intercept_ = float(ridge.intercept_)
+        self.n_features_in_ = X_scaled.shape[1]
+        return self
+
+    def decision_function(self, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        Approximate OneClassSVM.decision_function. Lower = more anomalous.
+        """
+        X_scaled = np.asarray(X_scaled, dtype=np.float64)
+
+        if self.method == "nystroem":
+            # RBF kernel against the landmarks: exp(-gamma * ||x - c||^2)
+            K = X_scaled @ self.landmarks_.T
+            K *= -2.0
+            K += np.einsum("ij,ij->i", X_scaled, X_scaled)[:, None]
+            K += self.landmark_sq_norms_
+            np.maximum(K, 0.0, out=K)
+            K *= -self.gamma_
+            np.exp(K, out=K)
+        else:
+            K = X_scaled @ self.projection_
+            K += self.offset_
+            np.cos(K, out=K)
+
+        return K @ self.coef_ + self.intercept_
+
+
+def parity_report(
+    exact_model,
+    approx_model,
+    X_scaled: np.ndarray,
+    threshold: float,
+) -> dict:
+    """
+    Compare approximate and exact scores on the same inputs.
+    """
+    start = time.perf_counter()
+    exact_scores = exact_model.decision_function(X_scaled)
+    exact_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx_scores = approx_model.decision_function(X_scaled)
+    approx_seconds = time.perf_counter() - start
+
+    exact_flags = exact_scores < threshold
+    approx_flags = approx_scores < threshold
+
+    scores = pd.DataFrame({"exact": exact_scores, "approx": approx_scores})
+
+    return {
+        "method": approx_model.method,
+        "n_components": approx_model.n_components,
+        "n_samples": len(X_scaled),
+        "pearson": scores["exact"].corr(scores["approx"]),
+        "spearman": scores["exact"].corr(scores["approx"], method="spearman"),
+        "flag_agreement": float((exact_flags == approx_flags).mean()),
+        "exact_anomaly_rate": float(exact_flags.mean()),
+        "approx_anomaly_rate": float(approx_flags.mean()),
+        "exact_flags_recalled": float(
+            (exact_flags & approx_flags).sum() / max(exact_flags.sum(), 1)
+        ),
+        "exact_seconds": exact_seconds,
+        "approx_seconds": approx_seconds,
+    }
+
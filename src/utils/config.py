@@ -9,15 +9,28 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 METADATA_DIR = DATA_DIR / "metadata"
 
+# Generated transactions (.parquet next to it with --format parquet)
+RAW_TRANSACTIONS_PATH = RAW_DATA_DIR / "transactions.csv"
+
+# Memory-mapped entity tables (simulator + serving)
+CUSTOMER_TABLE_DIR = METADATA_DIR / "customers"
+MERCHANT_TABLE_DIR = METADATA_DIR / "merchants"
+
 # DATASET CONFIGURATION
 NUM_CUSTOMERS = 5000
 NUM_MERCHANTS = 2000
 NUM_TRANSACTIONS = 100_000
 FRAUD_RATE = 0.02
+TXN_CHUNK_SIZE = 1_000_000 # rows per simulator chunk
+GENERATION_SHARDS = 16 # fixed, so output does not depend on worker count
 
 SIMULATION_DAYS = 90
 START_DATE = "2025-01-01"
 
+# COLUMNAR STORAGE (Parquet datasets)
+STORAGE_CUSTOMER_BUCKETS = 8
+STORAGE_DATE_FREQ = "M" # one date partition per month
+
 # GEOGRAPHY CONFIGURATION
 SUBURB_RADIUS_KM_MIN = 5
 SUBURB_RADIUS_KM_MAX = 10
@@ -25,5 +38,31 @@ SUBURB_RADIUS_KM_MAX = 10
 CARD_CLONING_DISTANCE_KM = 160
 CARD_CLONING_TIME_MINUTES = 60
 
+# ONLINE FEATURE STATE (serving)
+ONLINE_STATE_MAX_CUSTOMERS = 100_000
+MAX_TRAVEL_SPEED_KMH = 20000 # travel speed cap (batch and online features)
+
+# ONLINE MERCHANT SKETCHES (serving)
+ONLINE_STATE_MAX_MERCHANTS = 50_000
+MERCHANT_SKETCH_QUANTILES = (0.5, 0.85, 0.99)
+
+# REQUEST MICRO-BATCHING (serving)
+MICROBATCH_MAX_SIZE = 64
+MICROBATCH_MAX_WAIT_US = 2000
+
+# CASCADE SCORING (serving)
+CASCADE_BAND = 0.05 # IF scores within this of the threshold escalate (~3% of traffic)
+
+# ADMISSION CONTROL (serving)
+ADMISSION_MAX_IN_FLIGHT = 512 # transactions in flight before shedding with 503
+ADMISSION_RETRY_AFTER_S = 1
+ADMISSION_EWMA_ALPHA = 0.2 # weight of the newest stage latency in its estimate
+
+# RULE-ONLY FALLBACK SCORE (serving, when the model cannot meet a deadline)
+RULE_TRAVEL_SPEED_KMH = 900 # faster than a flight between two merchants
+RULE_AMOUNT_DEV_LOG = 6.0 # amount_dev_log; ~400 above the 24h average
+RULE_TXN_COUNT_1H = 4
+RULE_MIN_HITS = 2 # rules that must fire for is_fraud
+
 
 RANDOM_SEED = 42 # For reproducibility
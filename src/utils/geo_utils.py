@@ -1,37 +1,81 @@
 
 # distance and sampling utilities for geographic calculations
-import math
-import random
+# All functions accept scalars or NumPy arrays (broadcasting applies).
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
-    Calculate distance between two lat/long points in KM.
+    Calculate distance between lat/long points in KM.
     """
-    R = 6371  # Earth radius in km
-
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = np.radians(np.subtract(lat2, lat1))
+    dlambda = np.radians(np.subtract(lon2, lon1))
 
     a = (
-        math.sin(dphi / 2) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+        np.sin(dphi / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
     )
 
-    return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def pairwise_haversine(lat1, lon1, lat2, lon2):
+    """
+    (n, m) distance matrix in KM between n points and m points.
+    """
+    return haversine_distance(
+        np.asarray(lat1)[:, None],
+        np.asarray(lon1)[:, None],
+        np.asarray(lat2)[None, :],
+        np.asarray(lon2)[None, :],
+    )
 
 
-def sample_suburb(lat, lon, radius_km_min, radius_km_max):
+def consecutive_haversine(lat, lon, groups=None):
     """
-    Sample a random point within a ring (suburban area).
+    Distance in KM from each point to the previous one.
+
+    The first point, and with `groups` the first point of every run of
+    equal group keys (e.g. customer_id on sorted data), get 0.
     """
-    radius = random.uniform(radius_km_min, radius_km_max)
-    angle = random.uniform(0, 2 * math.pi)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+
+    distance = np.zeros(len(lat), dtype=np.float64)
+    if len(lat) < 2:
+        return distance
+
+    distance[1:] = haversine_distance(lat[:-1], lon[:-1], lat[1:], lon[1:])
+
+    if groups is not None:
+        groups = np.asarray(groups)
+        distance[1:][groups[1:] != groups[:-1]] = 0.0
+
+    return distance
+
+
+def sample_suburbs(lat, lon, radius_km_min, radius_km_max, size=None, rng=None):
+    """
+    Sample random points within a ring (suburban area): one point per
+    ring center (or `size` points around a single center). Uses a fresh
+    NumPy Generator unless `rng` is given.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    shape = size if size is not None else np.broadcast(lat, lon).shape
+
+    radius = rng.uniform(radius_km_min, radius_km_max, size=shape)
+    angle = rng.uniform(0, 2 * np.pi, size=shape)
 
     delta_lat = radius / 111
-    delta_lon = radius / (111 * math.cos(math.radians(lat)))
+    delta_lon = radius / (111 * np.cos(np.radians(lat)))
 
     return (
-        lat + delta_lat * math.cos(angle),
-        lon + delta_lon * math.sin(angle),
+        lat + delta_lat * np.cos(angle),
+        lon + delta_lon * np.sin(angle),
     )
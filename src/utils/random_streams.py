@@ -0,0 +1,24 @@
+# src/utils/random_streams.py
+# Independent, reproducible NumPy random streams keyed by entity or shard.
+import numpy as np
+
+from src.utils.config import RANDOM_SEED
+
+# 1 and 2 were the per-entity customer / merchant streams (retired)
+TRANSACTION_STREAM = 3
+FRAUD_STREAM = 4
+CUSTOMER_TABLE_STREAM = 5
+MERCHANT_TABLE_STREAM = 6
+
+
+def stream_rng(stream: int, *key: int, seed: int = RANDOM_SEED) -> np.random.Generator:
+    """
+    Generator for (stream, *key), e.g. stream_rng(TRANSACTION_STREAM, 42).
+
+    Streams depend only on the seed and the key, never on the order in
+    which they are created, so work can be split across processes
+    without changing results.
+    """
+    return np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(stream, *key))
+    )
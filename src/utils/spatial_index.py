@@ -0,0 +1,66 @@
+# Ball-tree index over lat/long points for batched nearest-neighbour and
+# radius queries (haversine distances, in KM).
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from src.utils.geo_utils import EARTH_RADIUS_KM
+
+
+def _radians(lat, lon) -> np.ndarray:
+    return np.radians(
+        np.column_stack(
+            (np.asarray(lat, dtype=np.float64).ravel(), np.asarray(lon, dtype=np.float64).ravel())
+        )
+    )
+
+
+class GeoIndex:
+    """
+    Spatial index over a fixed set of points (e.g. the merchant table).
+
+    Queries take arrays of query coordinates and return row numbers into
+    the indexed points, so one call answers a whole batch in
+    O(batch * log n) instead of a full haversine scan per point.
+    """
+
+    def __init__(self, lat, lon, leaf_size: int = 40):
+        self.n_points = len(np.asarray(lat))
+        if self.n_points == 0:
+            raise ValueError("GeoIndex needs at least one point")
+        self._tree = BallTree(_radians(lat, lon), leaf_size=leaf_size, metric="haversine")
+
+    def __len__(self):
+        return self.n_points
+
+    def query_knn(self, lat, lon, k: int) -> tuple:
+        """
+        The `k` nearest points of every query point, closest first.
+        Returns (distances_km, rows), both of shape (n_queries, k).
+        """
+        k = min(k, self.n_points)
+        distances, rows = self._tree.query(_radians(lat, lon), k=k)
+        return distances * EARTH_RADIUS_KM, rows
+
+    def query_radius(self, lat, lon, radius_km: float, sort: bool = False) -> tuple:
+        """
+        All points within `radius_km` of every query point, as CSR:
+        the neighbours of query i are `rows[offsets[i]:offsets[i + 1]]`
+        (closest first with sort=True). Returns (rows, distances_km, offsets).
+        """
+        rows, distances = self._tree.query_radius(
+            _radians(lat, lon),
+            r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True,
+            sort_results=sort,
+        )
+
+        counts = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        if offsets[-1] == 0:
+            return np.empty(0, np.int64), np.empty(0, np.float64), offsets
+
+        return (
+            np.concatenate(rows).astype(np.int64),
+            np.concatenate(distances) * EARTH_RADIUS_KM,
+            offsets,
+        )
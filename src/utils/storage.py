@@ -0,0 +1,145 @@
+# src/utils/storage.py
+# Columnar (Parquet) storage for transaction and feature datasets.
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.utils.config import STORAGE_CUSTOMER_BUCKETS, STORAGE_DATE_FREQ
+
+PARTITION_COLUMNS = ["customer_bucket", "txn_date"]
+
+# Position of each row in the written frame; reads sort on it so rows
+# come back in the original order instead of partition order
+ROW_ORDER_COLUMN = "row_order"
+
+# Low-cardinality string columns → dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = [
+    "customer_id",
+    "card_number",
+    "merchant_id",
+    "merchant_category",
+    "fraud_type",
+]
+INT8_COLUMNS = ["hour", "day_of_week", "month", "is_fraud"]
+
+# Money and coordinates keep full precision; every other float is a
+# model feature and is stored as float32
+FLOAT64_COLUMNS = ["amount", "merchant_lat", "merchant_long"]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet storage needs pyarrow (pip install pyarrow)"
+        ) from e
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Categorical IDs, int8 calendar/label columns and float32 features.
+    """
+    df = df.copy()
+
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in INT8_COLUMNS:
+            df[col] = df[col].astype(np.int8)
+        elif col not in FLOAT64_COLUMNS and pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype(np.float32)
+
+    return df
+
+
+def customer_buckets(customer_ids, n_buckets: int = STORAGE_CUSTOMER_BUCKETS) -> np.ndarray:
+    """
+    Stable hash bucket of each customer id (same id → same bucket).
+    """
+    hashes = pd.util.hash_array(np.asarray(customer_ids, dtype=object))
+    return (hashes % np.uint64(n_buckets)).astype(np.int16)
+
+
+def write_dataset(
+    df: pd.DataFrame,
+    path,
+    n_buckets: int = STORAGE_CUSTOMER_BUCKETS,
+    date_freq: str = STORAGE_DATE_FREQ,
+):
+    """
+    Write `df` as a Parquet dataset partitioned by customer hash bucket
+    and, when a timestamp column exists, by date (period `date_freq`).
+    Replaces any dataset already at `path`.
+    """
+    _require_pyarrow()
+    path = Path(path)
+
+    df = compact_dtypes(df)
+    df[ROW_ORDER_COLUMN] = np.arange(len(df), dtype=np.int64)
+    partition_cols = []
+
+    if "customer_id" in df.columns:
+        df["customer_bucket"] = customer_buckets(df["customer_id"], n_buckets)
+        partition_cols.append("customer_bucket")
+
+    if "timestamp" in df.columns:
+        df["txn_date"] = pd.to_datetime(df["timestamp"]).dt.to_period(date_freq).astype(str)
+        partition_cols.append("txn_date")
+
+    if path.exists():
+        shutil.rmtree(path)
+
+    df.to_parquet(
+        path,
+        engine="pyarrow",
+        index=False,
+        partition_cols=partition_cols or None,
+    )
+
+
+def read_dataset(path, columns: list = None, filters=None) -> pd.DataFrame:
+    """
+    Read a dataset written by write_dataset.
+
+    `columns` projects the read to just those columns (only their column
+    chunks are decoded); `filters` prunes partitions, e.g.
+    [("customer_bucket", "=", 3)]. Rows come back in the order they were
+    written.
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    ordered = ROW_ORDER_COLUMN in ds.dataset(path, partitioning="hive").schema.names
+    read_columns = columns
+    if columns is not None and ordered:
+        read_columns = list(columns) + [ROW_ORDER_COLUMN]
+
+    df = pd.read_parquet(path, engine="pyarrow", columns=read_columns, filters=filters)
+
+    if ordered:
+        df = df.sort_values(ROW_ORDER_COLUMN, kind="stable").reset_index(drop=True)
+        df = df.drop(columns=ROW_ORDER_COLUMN)
+    if columns is None:
+        df = df.drop(columns=PARTITION_COLUMNS, errors="ignore")
+    return df
+
+
+def load_columns(path, columns: list, parquet: bool = False) -> pd.DataFrame:
+    """
+    Load only `columns` from a CSV dataset.
+
+    With parquet=True the Parquet copy next to it (same name, .parquet) is
+    read instead. Its features are float32, so results can differ slightly
+    from the CSV. The copy must be at least as new as the CSV.
+    """
+    path = Path(path)
+    if not parquet:
+        return pd.read_csv(path, usecols=columns)[columns]
+
+    parquet_path = path.with_suffix(".parquet")
+    if path.exists() and parquet_path.stat().st_mtime < path.stat().st_mtime:
+        raise ValueError(f"{parquet_path} is older than {path}; rewrite it or read the CSV")
+    return read_dataset(parquet_path, columns=columns)
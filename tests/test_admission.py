@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.admission import AdmissionController, Overloaded
+from app.rules import score_rules
+
+
+def test_admit_sheds_past_limit_and_releases():
+    admission = AdmissionController(max_in_flight=4, retry_after_s=2)
+
+    with admission.admit(3):
+        with pytest.raises(Overloaded) as shed:
+            with admission.admit(2):
+                pass
+        assert shed.value.retry_after_s == 2
+
+        with admission.admit(1):
+            assert admission.in_flight == 4
+    assert admission.in_flight == 0
+
+    # Idle service admits a batch larger than the limit
+    with admission.admit(10):
+        assert admission.in_flight == 10
+
+
+def test_plan_degrades_as_deadline_shrinks():
+    admission = AdmissionController(batch_size=8)
+    admission.observe("model", 4.0)
+    admission.observe("cascade", 6.0)
+    admission.observe("rules", 0.1)
+
+    assert admission.plan(None, cascade=True) == "none"
+    assert admission.plan(10.0, cascade=True) == "none"
+    assert admission.plan(5.0, cascade=True) == "skip_cascade"
+    assert admission.plan(5.0) == "none"
+    assert admission.plan(1.0) == "rules"
+    assert admission.plan(0.0) == "review"
+
+    # A queue of 16 ahead adds two batches' worth of model latency
+    with admission.admit(17):
+        assert admission.estimate_ms("model") == pytest.approx(12.0)
+        assert admission.plan(10.0) == "rules"
+
+
+def test_rules_fire_on_fast_far_transactions():
+    features = ["amount_dev_log", "txn_count_1h", "distance_from_home", "travel_speed_kmh"]
+
+    normal = score_rules(np.array([1.0, 1.0, 12.0, 30.0]), features)
+    cloned = score_rules(np.array([7.0, 1.0, 600.0, 4000.0]), features)
+
+    assert normal == {"rules_fired": [], "score": 0.0, "is_fraud": False}
+    assert cloned["rules_fired"] == ["impossible_travel", "amount_spike", "far_from_home"]
+    assert cloned["is_fraud"]
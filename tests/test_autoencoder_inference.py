@@ -1,16 +1,15 @@
 import json
-import pandas as pd
 import joblib
 
-from src.models.autoencoder import run_autoencoder
-from tensorflow.keras.models import load_model
+from src.utils.storage import load_columns
+from src.models.autoencoder import load_autoencoder, run_autoencoder
 
 
 def test_autoencoder_inference():
     
     # Load artifacts
     scaler = joblib.load("models/standard_scaler_v1.pkl")
-    ae_model = load_model("models/autoencoder_v1.keras")
+    ae_model = load_autoencoder("models/autoencoder_v1.npz")
 
     with open("models/model_features_v1.json") as f:
         FEATURES = json.load(f)["features"]
@@ -19,7 +18,8 @@ def test_autoencoder_inference():
         AE_THRESHOLD = json.load(f)["autoencoder"]["threshold_value"]
 
     # Load data
-    df = pd.read_csv("data/processed/transactions_features.csv")
+    # Only the model columns
+    df = load_columns("data/processed/transactions_features.csv", FEATURES)
 
     X = df[FEATURES]
     X_scaled = scaler.transform(X)
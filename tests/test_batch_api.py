@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app, merchant_store, state_store
+from src.feature_engineering.online_features import (
+    CustomerStateStore,
+    build_online_feature_matrix,
+)
+
+
+client = TestClient(app)
+
+
+def _txn(customer_id, minute, amount=900.0, distance=12.0):
+    return {
+        "customer_id": customer_id,
+        "amount": amount,
+        "timestamp": f"2025-01-01T10:{minute:02d}:00",
+        "hour": 10,
+        "distance_from_home": distance,
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    state_store.clear()
+    merchant_store.clear()
+    yield
+    state_store.clear()
+    merchant_store.clear()
+
+
+def test_json_array_and_ndjson_score_the_same():
+    txns = [_txn("BATCH_A", 0), _txn("BATCH_B", 5, amount=5000.0, distance=900.0)]
+
+    as_json = client.post("/predict_batch", json=txns)
+    state_store.clear()
+    as_ndjson = client.post(
+        "/predict_batch",
+        content="\n".join(json.dumps(t) for t in txns) + "\n",
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert as_json.status_code == as_ndjson.status_code == 200
+    assert as_json.json() == as_ndjson.json()
+    assert len(as_json.json()["results"]) == 2
+
+
+def test_cascade_mode_and_unknown_mode():
+    response = client.post("/predict_batch?mode=cascade", json=[_txn("BATCH_A", 0)])
+    assert response.status_code == 200
+    assert response.json()["results"][0]["stages"][0] == "isolation_forest"
+
+    response = client.post("/predict_batch?mode=nope", json=[_txn("BATCH_A", 0)])
+    assert response.status_code == 400
+
+
+def test_invalid_row_rejects_batch_before_scoring():
+    bad = _txn("BATCH_B", 1)
+    del bad["hour"]
+
+    response = client.post("/predict_batch", json=[_txn("BATCH_A", 0), bad])
+
+    assert response.status_code == 400
+    assert "hour" in response.json()["detail"]
+    # Nothing was scored, so no customer state was recorded
+    assert "BATCH_A" not in state_store
+
+    response = client.post("/predict_batch", json={"not": "a list"})
+    assert response.status_code == 400
+
+
+def test_batch_updates_state_in_timestamp_order():
+    features = ["txn_count_1h", "time_since_last_txn_sec"]
+    txns = [
+        {**_txn("C", minute), "timestamp": datetime(2025, 1, 1, 10, minute)}
+        for minute in (30, 0, 10)
+    ]
+
+    X = build_online_feature_matrix(txns, CustomerStateStore(), features)
+
+    # Rows keep input order; counts follow the timestamps
+    np.testing.assert_array_equal(X[:, 0], [3, 1, 2])
+    np.testing.assert_array_equal(X[:, 1], [1200, 0, 600])
+
+
+def test_merchant_risk_is_reported_per_transaction():
+    txns = [
+        {**_txn("BATCH_A", minute, amount=amount), "merchant_id": "MERCHANT_00001"}
+        for minute, amount in ((0, 100.0), (1, 300.0), (2, 200.0))
+    ]
+    txns.append(_txn("BATCH_B", 3))
+
+    results = client.post("/predict_batch", json=txns).json()["results"]
+
+    # Features as of before each transaction; first sighting has no history
+    assert results[0]["merchant_risk"]["merchant_txn_count"] == 0
+    assert results[0]["merchant_risk"]["merchant_amount_mean"] is None
+    assert results[2]["merchant_risk"]["merchant_amount_mean"] == 200.0
+    assert results[3]["merchant_risk"] is None
+    assert merchant_store.snapshot("MERCHANT_00001")["merchant_txn_count"] == 3
+
+    single = client.post("/predict", json=txns[0]).json()
+    assert single["merchant_risk"]["merchant_txn_count"] == 3
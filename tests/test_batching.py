@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.batching import MicroBatcher
+
+
+class RecordingScorer:
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def __call__(self, X):
+        self.batch_sizes.append(len(X))
+        if self.fail:
+            raise RuntimeError("model down")
+        return X[:, 0] * 2
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+def test_flushes_when_batch_is_full():
+    scorer = RecordingScorer()
+
+    async def scenario():
+        # Wait window far longer than the test: only a full batch flushes
+        batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_us=10_000_000)
+        scores = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(np.array([float(i)])) for i in range(4))), 1.0
+        )
+        await batcher.stop()
+        return scores
+
+    assert _run(scenario) == [0.0, 2.0, 4.0, 6.0]
+    assert scorer.batch_sizes == [4]
+
+
+def test_flushes_partial_batch_after_wait_limit():
+    scorer = RecordingScorer()
+
+    async def scenario():
+        batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_us=20_000)
+        start = time.perf_counter()
+        scores = await asyncio.gather(*(batcher.submit(np.array([1.0])) for _ in range(3)))
+        elapsed = time.perf_counter() - start
+        await batcher.stop()
+        return scores, elapsed
+
+    scores, elapsed = _run(scenario)
+    assert scores == [2.0, 2.0, 2.0]
+    assert scorer.batch_sizes == [3]
+    assert elapsed >= 0.02
+
+
+def test_scoring_error_reaches_every_caller():
+    scorer = RecordingScorer(fail=True)
+
+    async def scenario():
+        batcher = MicroBatcher(scorer, max_batch_size=3, max_wait_us=10_000_000)
+        results = await asyncio.gather(
+            *(batcher.submit(np.array([1.0])) for _ in range(3)), return_exceptions=True
+        )
+        await batcher.stop()
+        return results
+
+    results = _run(scenario)
+    assert scorer.batch_sizes == [3]
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_caller_does_not_break_batch():
+    scorer = RecordingScorer()
+
+    async def scenario():
+        batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_us=20_000)
+        tasks = [asyncio.create_task(batcher.submit(np.array([float(i)]))) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Batcher keeps serving after the cancelled call
+        later = await batcher.submit(np.array([5.0]))
+        await batcher.stop()
+        return results, later
+
+    results, later = _run(scenario)
+    assert results[0] == 0.0 and results[2] == 4.0
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert later == 10.0
+    assert scorer.batch_sizes == [3, 1]
+
+
+def test_on_scored_reports_scoring_time_without_queue_wait():
+    scorer = RecordingScorer()
+    latencies = []
+
+    async def scenario():
+        # Rows wait ~50ms for the batch to fill; scoring itself is fast
+        batcher = MicroBatcher(
+            scorer, max_batch_size=64, max_wait_us=50_000, on_scored=latencies.append
+        )
+        await asyncio.gather(*(batcher.submit(np.array([1.0])) for _ in range(2)))
+        await batcher.stop()
+
+    _run(scenario)
+    assert scorer.batch_sizes == [2]
+    assert len(latencies) == 1 and latencies[0] < 50
+
+
+def test_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        MicroBatcher(RecordingScorer(), max_batch_size=0)
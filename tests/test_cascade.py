@@ -0,0 +1,97 @@
+import shutil
+
+import numpy as np
+
+from app.cascade import score_cascade
+from app.metrics import metrics
+from app.model_loader import ModelService
+
+
+def test_only_borderline_rows_escalate():
+    service = ModelService("v1")
+    with np.load("models/parity_v1.npz") as reference:
+        X, scores = reference["X"], reference["scores"]
+
+    band = 0.05
+    expected = np.abs(scores - service.threshold) <= band
+    assert expected.any() and not expected.all()
+
+    before = metrics.ratio("cascade_escalation_rate").snapshot()
+    results = score_cascade(service, X, band)
+    after = metrics.ratio("cascade_escalation_rate").snapshot()
+
+    escalated = np.array([r["escalated"] for r in results])
+    np.testing.assert_array_equal(escalated, expected)
+    assert after["total"] - before["total"] == len(X)
+    assert after["hits"] - before["hits"] == expected.sum()
+
+    for r, score in zip(results, scores):
+        np.testing.assert_allclose(r["scores"]["isolation_forest"], score, atol=1e-6)
+        if r["escalated"]:
+            assert r["stages"] == ["isolation_forest", "one_class_svm", "autoencoder"]
+            assert r["votes"] == sum(r["flags"].values())
+        else:
+            assert r["stages"] == ["isolation_forest"]
+            assert r["votes"] == int(r["flags"]["isolation_forest"])
+
+
+def test_zero_band_skips_second_stage():
+    service = ModelService("v1")
+    X = np.zeros((4, len(service.features)))
+    X[:, service.features.index("distance_from_home")] = 5.0
+
+    results = score_cascade(service, X, band=0.0)
+
+    assert all(r["stages"] == ["isolation_forest"] for r in results)
+    assert service._ensemble is None
+
+
+def test_missing_approximate_svm_is_logged(tmp_path, caplog):
+    for name in (
+        "isolation_forest_v1_fused.joblib",
+        "isolation_forest_v1.pkl",
+        "standard_scaler_v1.pkl",
+        "model_features_v1.json",
+        "thresholds_v1.json",
+        "one_class_svm_v1.pkl",
+        "autoencoder_v1.npz",
+        "manifest_v1.json",
+    ):
+        shutil.copy(f"models/{name}", tmp_path / name)
+
+    service = ModelService("v1", str(tmp_path))
+    with caplog.at_level("WARNING", logger="fraud_api"):
+        ensemble = service.ensemble()
+
+    assert type(ensemble["one_class_svm"]).__name__ == "OneClassSVM"
+    assert "one_class_svm_v1_approx.pkl not found" in caplog.text
+
+
+def _escalated_result(iso_score, svm_flag, ae_flag):
+    flags = {"isolation_forest": False, "one_class_svm": svm_flag, "autoencoder": ae_flag}
+    return {
+        "stages": list(flags),
+        "scores": {"isolation_forest": iso_score, "one_class_svm": 0.0, "autoencoder": 0.0},
+        "flags": flags,
+        "votes": sum(flags.values()),
+        "escalated": True,
+    }
+
+
+def test_cascade_response_follows_the_vote():
+    from app.main import build_cascade_response
+
+    # IF score below threshold, but OCSVM and AE outvote it
+    flagged = build_cascade_response(_escalated_result(0.48, True, True), threshold=0.5)
+    assert flagged["is_fraud"] and flagged["fraud_probability"] == 0.6667
+    assert flagged["decision_source"] == "majority_vote"
+    assert "2 of 3 models flagged" in flagged["explanation"]
+
+    cleared = build_cascade_response(_escalated_result(0.48, True, False), threshold=0.5)
+    assert not cleared["is_fraud"]
+    assert "did not confirm" in cleared["explanation"]
+
+    screened = build_cascade_response(
+        {**_escalated_result(0.1, False, False), "escalated": False}, threshold=0.5
+    )
+    assert screened["decision_source"] == "isolation_forest"
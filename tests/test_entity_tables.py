@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.data_generation.entity_tables import (
+    ENTITY_BLOCK_SIZE,
+    EntityTable,
+    generate_customer_table,
+    generate_merchant_table,
+)
+from src.data_generation.transaction_simulator import simulate_transactions
+
+
+def test_tables_do_not_depend_on_n_jobs():
+    n = ENTITY_BLOCK_SIZE + 100
+    serial = generate_customer_table(n, seed=3)
+    parallel = generate_customer_table(n, seed=3, n_jobs=2)
+
+    assert len(serial) == n
+    for name in serial.columns:
+        np.testing.assert_array_equal(serial[name], parallel[name])
+
+
+def test_save_load_roundtrip_with_mmap(tmp_path):
+    customers = generate_customer_table(500, seed=1)
+    customers.save(tmp_path)
+
+    loaded = EntityTable.load(tmp_path)
+    assert isinstance(loaded["home_lat"], np.memmap)
+    assert loaded.meta == customers.meta
+    for name in customers.columns:
+        np.testing.assert_array_equal(loaded[name], customers[name])
+
+
+def test_csr_slice_keeps_rows():
+    customers = generate_customer_table(300, seed=2)
+    part = customers[100:110]
+
+    assert len(part) == 10
+    assert part["active_hours_offsets"][0] == 0
+    # Ids of a slice starting past row 0 no longer equal their row
+    assert customers.meta["positional_ids"] and customers[:10].meta["positional_ids"]
+    assert "positional_ids" not in part.meta
+    for i in range(10):
+        np.testing.assert_array_equal(
+            part.csr_row("active_hours", i), customers.csr_row("active_hours", 100 + i)
+        )
+
+
+def test_merchant_codes_decode():
+    merchants = generate_merchant_table(200, seed=4)
+
+    assert set(merchants.decode("category_code")) <= set(merchants.meta["category_code"])
+    assert merchants.decode("city_code", [0]).shape == (1,)
+
+
+def test_simulator_accepts_tables():
+    customers = generate_customer_table(200, seed=5)
+    merchants = generate_merchant_table(100, seed=5)
+
+    df = simulate_transactions(customers, merchants, 2_000, rng=np.random.default_rng(0))
+
+    assert len(df) == 2_000
+    assert df["customer_id"].str.startswith("CUST_").all()
+    assert df["merchant_id"].isin(merchants["merchant_id"].astype(str)).all()
@@ -0,0 +1,47 @@
+import joblib
+import numpy as np
+
+from src.models.flat_isolation_forest import FlatIsolationForest
+from src.models.isolation_forest import run_isolation_forest
+
+
+def test_flat_isolation_forest_matches_sklearn(tmp_path):
+
+    # Load artifacts
+    iso_model = joblib.load("models/isolation_forest_v1.pkl")
+    flat = FlatIsolationForest.from_sklearn(iso_model)
+
+    # Scaled-space inputs, with a tail of extreme rows
+    rng = np.random.default_rng(42)
+    X_scaled = rng.normal(size=(5000, iso_model.n_features_in_))
+    X_scaled[:50] *= 25
+
+    np.testing.assert_allclose(
+        -flat.decision_function(X_scaled),
+        -iso_model.decision_function(X_scaled),
+        rtol=0,
+        atol=1e-9,
+    )
+
+    # Exported artifact round-trips through the inference pipeline
+    flat.save(tmp_path / "isolation_forest_flat.joblib")
+    reloaded = FlatIsolationForest.load(tmp_path / "isolation_forest_flat.joblib")
+
+    scores, flags = run_isolation_forest(reloaded, X_scaled, 0.0)
+    expected_scores, expected_flags = run_isolation_forest(iso_model, X_scaled, 0.0)
+
+    np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-9)
+    assert (flags == expected_flags).all()
+
+
+def test_artifacts_with_separate_children_still_load(tmp_path):
+    flat = FlatIsolationForest.from_sklearn(joblib.load("models/isolation_forest_v1.pkl"))
+    flat.save(tmp_path / "flat.joblib")
+
+    # Layout written before children were stored interleaved
+    arrays = joblib.load(tmp_path / "flat.joblib")
+    children = arrays.pop("children")
+    joblib.dump({**arrays, "left": children[0::2], "right": children[1::2]}, tmp_path / "old.joblib")
+
+    old = FlatIsolationForest.load(tmp_path / "old.joblib")
+    np.testing.assert_array_equal(old.children, flat.children)
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from src.data_generation.fraud_rules import (
+    inject_account_takeover,
+    inject_card_cloning,
+)
+
+
+def _txn(customer_id, minute, amount, lat, lon=77.0):
+    return {
+        "customer_id": customer_id,
+        "timestamp": pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=minute),
+        "amount": amount,
+        "merchant_lat": lat,
+        "merchant_long": lon,
+        "is_fraud": 0,
+        "fraud_type": "none",
+    }
+
+
+def test_card_cloning_flags_fast_far_amount_jump():
+    df = pd.DataFrame(
+        [
+            _txn("B", 0, 100.0, 12.97),
+            _txn("A", 0, 100.0, 12.97),
+            _txn("A", 30, 300.0, 28.61),  # far, fast, 3x → cloned
+            _txn("A", 45, 200.0, 12.97),  # far and fast, but amount drops
+            _txn("A", 200, 900.0, 28.61),  # far and 4.5x, but too slow
+            _txn("B", 10, 400.0, 12.98),  # fast and 4x, but nearby
+            _txn("C", 5, 1000.0, 28.61),  # first txn of C, nothing to compare
+        ]
+    )
+
+    out = inject_card_cloning(df)
+
+    flagged = out[out["fraud_type"] == "card_cloning"]
+    assert list(zip(flagged["customer_id"], flagged["amount"])) == [("A", 300.0)]
+    assert out["is_fraud"].sum() == 1
+    assert out["customer_id"].tolist() == ["A", "A", "A", "A", "B", "B", "C"]
+
+
+def test_account_takeover_flags_drifted_window():
+    # Six daytime grocery txns, then six night-time luxury txns, then more
+    day = [("grocery", 12)] * 6
+    night = [("luxury_goods", 2)] * 6
+    rows = [
+        {
+            "customer_id": "A",
+            "timestamp": pd.Timestamp("2025-01-01") + pd.Timedelta(hours=i),
+            "merchant_category": category,
+            "hour": hour,
+            "is_fraud": 0,
+            "fraud_type": "none",
+        }
+        for i, (category, hour) in enumerate(day + night + day)
+    ]
+    df = pd.DataFrame(rows)
+
+    serial = inject_account_takeover(df)
+    parallel = inject_account_takeover(df, n_jobs=2)
+
+    # KL only covers categories seen in both windows, so the first window
+    # to fire is the one straddling the switch by a single transaction
+    assert serial["is_fraud"].tolist() == [0] * 7 + [1] * 6 + [0] * 5
+    pd.testing.assert_frame_equal(serial, parallel)
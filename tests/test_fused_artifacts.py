@@ -0,0 +1,40 @@
+import joblib
+import numpy as np
+
+from src.models.fused_artifacts import export_fused_artifacts, parity_report
+from src.models.isolation_forest import load_isolation_forest
+from src.models.numpy_autoencoder import NumpyAutoencoder
+
+
+def test_fused_artifacts_match_scaled_pipeline(tmp_path):
+    fused_forest, fused_autoencoder = export_fused_artifacts(
+        "models/standard_scaler_v1.pkl",
+        "models/isolation_forest_v1.pkl",
+        "models/autoencoder_v1.npz",
+        tmp_path,
+    )
+    scaler = joblib.load("models/standard_scaler_v1.pkl")
+
+    # Raw-space inputs around the training distribution, with extreme rows
+    rng = np.random.default_rng(0)
+    X = scaler.mean_ + scaler.scale_ * rng.normal(size=(5000, len(scaler.mean_)))
+    X[:50] *= 10
+
+    thresholds = {
+        "isolation_forest": {"threshold_value": 0.0},
+        "autoencoder": {"threshold_value": 0.01},
+    }
+    report = parity_report(
+        scaler,
+        load_isolation_forest("models/isolation_forest_v1.pkl", flat=True),
+        load_isolation_forest(tmp_path / "isolation_forest_v1_fused.joblib"),
+        NumpyAutoencoder.load("models/autoencoder_v1.npz"),
+        NumpyAutoencoder.load(tmp_path / "autoencoder_v1_fused.npz"),
+        X,
+        thresholds,
+    )
+
+    assert report["iso_max_abs_diff"] == 0.0
+    assert report["iso_flag_agreement"] == 1.0
+    assert report["ae_max_rel_diff"] < 1e-3
+    assert report["ae_flag_agreement"] > 0.999
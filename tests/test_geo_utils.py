@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.geo_utils import (
+    EARTH_RADIUS_KM,
+    consecutive_haversine,
+    haversine_distance,
+    pairwise_haversine,
+    sample_suburbs,
+)
+
+
+def _scalar_haversine(lat1, lon1, lat2, lon2):
+    # Reference: textbook formula with the math module, one pair at a time
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+# Ordinary pairs plus the antimeridian, the poles, identical and antipodal points
+POINTS = [
+    (12.9716, 77.5946),
+    (28.6139, 77.2090),
+    (0.0, 179.9),
+    (0.0, -179.9),
+    (-33.8688, -179.99),
+    (89.99, 0.0),
+    (89.99, 180.0),
+    (90.0, 45.0),
+    (-90.0, 0.0),
+    (-89.5, -120.0),
+    (0.0, 0.0),
+]
+LAT = np.array([p[0] for p in POINTS])
+LON = np.array([p[1] for p in POINTS])
+
+
+def test_haversine_matches_scalar_math():
+    expected = [
+        [_scalar_haversine(a[0], a[1], b[0], b[1]) for b in POINTS] for a in POINTS
+    ]
+
+    np.testing.assert_allclose(
+        pairwise_haversine(LAT, LON, LAT, LON), expected, rtol=1e-12, atol=1e-9
+    )
+    np.testing.assert_allclose(
+        haversine_distance(LAT, LON, LAT[::-1], LON[::-1]),
+        [_scalar_haversine(*a, *b) for a, b in zip(POINTS, POINTS[::-1])],
+        rtol=1e-12,
+        atol=1e-9,
+    )
+
+    # Spot values: short hop across the antimeridian, pole to pole
+    assert haversine_distance(0.0, 179.9, 0.0, -179.9) == pytest.approx(22.239, abs=1e-3)
+    assert haversine_distance(90.0, 0.0, -90.0, 0.0) == pytest.approx(math.pi * EARTH_RADIUS_KM)
+    assert np.all(np.diag(pairwise_haversine(LAT, LON, LAT, LON)) == 0.0)
+
+
+def test_consecutive_haversine_matches_scalar_math():
+    groups = np.array([0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 3])
+
+    expected = [0.0] + [
+        _scalar_haversine(*POINTS[i - 1], *POINTS[i]) if groups[i] == groups[i - 1] else 0.0
+        for i in range(1, len(POINTS))
+    ]
+
+    np.testing.assert_allclose(consecutive_haversine(LAT, LON, groups), expected, rtol=1e-12)
+    assert consecutive_haversine(LAT[:1], LON[:1]).tolist() == [0.0]
+
+
+@pytest.mark.parametrize("lat, lon", [(19.076, 72.8777), (-45.0, 179.95), (89.9, 10.0)])
+def test_sample_suburbs_match_drawn_distance_and_bearing(lat, lon):
+    # Same stream: radius draws first, then bearings
+    draws = np.random.default_rng(3)
+    radius = draws.uniform(5, 10, size=100)
+    bearing = draws.uniform(0, 2 * np.pi, size=100)
+
+    s_lat, s_lon = sample_suburbs(lat, lon, 5, 10, size=100, rng=np.random.default_rng(3))
+
+    # Closed form of the flat offset: north = r cos(b), east = r sin(b)
+    north = (s_lat - lat) * 111
+    east = (s_lon - lon) * 111 * math.cos(math.radians(lat))
+    np.testing.assert_allclose(np.hypot(north, east), radius, rtol=1e-9)
+    np.testing.assert_allclose(np.arctan2(east, north) % (2 * np.pi), bearing, rtol=1e-9)
+
+
+def test_sample_suburbs_stay_in_ring():
+    rng = np.random.default_rng(0)
+    centers_lat = np.repeat([12.97, 28.61, -33.87], 1000)
+    centers_lon = np.repeat([77.59, 77.21, 151.21], 1000)
+
+    lat, lon = sample_suburbs(centers_lat, centers_lon, 5, 10, rng=rng)
+    distance = haversine_distance(centers_lat, centers_lon, lat, lon)
+
+    # 111 km per degree is an approximation; allow ~1%
+    assert lat.shape == centers_lat.shape
+    assert distance.min() >= 5 * 0.99 and distance.max() <= 10 * 1.01
@@ -1,7 +1,7 @@
 import json
-import pandas as pd
 import joblib
 
+from src.utils.storage import load_columns
 from src.models.isolation_forest import run_isolation_forest
 
 
@@ -18,7 +18,8 @@ def test_isolation_forest_inference():
         threshold = json.load(f)["isolation_forest"]["threshold_value"]
 
     # Load data
-    df = pd.read_csv("data/processed/transactions_features.csv")
+    # Only the model columns
+    df = load_columns("data/processed/transactions_features.csv", features)
 
     X = df[features]
     X_scaled = scaler.transform(X)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering.merchant_features import merchant_aggregates
+from src.feature_engineering.merchant_sketches import MerchantSketchStore, P2Quantile
+
+
+def test_merchant_aggregates_match_groupby():
+    rng = np.random.default_rng(5)
+    n = 20_000
+    df = pd.DataFrame(
+        {
+            "merchant_id": [f"MERCHANT_{m:05d}" for m in rng.integers(0, 300, size=n)],
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+        }
+    )
+
+    aggregates, merchant_rows, row_offsets = merchant_aggregates(df)
+
+    grouped = df.groupby("merchant_id")["amount"]
+    expected_q85 = grouped.quantile(0.85).reindex(aggregates.index)
+    expected_high = grouped.apply(lambda s: (s > s.quantile(0.85)).sum())
+
+    assert aggregates.index.tolist() == df["merchant_id"].value_counts().index.tolist()
+    np.testing.assert_array_equal(aggregates["volume"], grouped.size()[aggregates.index])
+    np.testing.assert_allclose(aggregates["amount_q85"], expected_q85, rtol=1e-12)
+    np.testing.assert_array_equal(
+        aggregates["high_value_count"], expected_high[aggregates.index]
+    )
+
+    # Row index: frame-ordered rows of each merchant
+    k = 3
+    rows = merchant_rows[row_offsets[k] : row_offsets[k + 1]]
+    expected_rows = np.flatnonzero(df["merchant_id"] == aggregates.index[k])
+    np.testing.assert_array_equal(rows, expected_rows)
+
+
+def test_p2_quantile_tracks_stream():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(6.5, 0.6, size=20_000)
+
+    for p in (0.5, 0.85, 0.99):
+        sketch = P2Quantile(p)
+        for x in values:
+            sketch.update(x)
+        assert abs(sketch.value() / np.quantile(values, p) - 1) < 0.03
+
+
+def test_merchant_store_reports_state_before_update():
+    store = MerchantSketchStore(max_merchants=2, quantiles=(0.5, 0.99))
+
+    first = store.update("M1", 100.0)
+    assert first["merchant_txn_count"] == 0.0
+    assert np.isnan(first["merchant_amount_ratio"])
+
+    for amount in (100.0, 200.0, 300.0):
+        store.update("M1", amount)
+    features = store.update("M1", 1000.0)
+    assert features["merchant_txn_count"] == 4.0
+    assert features["merchant_amount_mean"] == 175.0
+    assert features["merchant_amount_q50"] == 150.0
+
+    store.update("M2", 10.0)
+    store.update("M3", 10.0)
+    assert "M1" not in store and len(store) == 2
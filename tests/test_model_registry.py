@@ -0,0 +1,116 @@
+import asyncio
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from app.batching import MicroBatcher
+from app.model_registry import ModelRegistry
+
+
+ARTIFACTS = [
+    "isolation_forest_v1.pkl",
+    "standard_scaler_v1.pkl",
+    "model_features_v1.json",
+    "thresholds_v1.json",
+    "one_class_svm_v1.pkl",
+    "autoencoder_v1.npz",
+    "parity_v1.npz",
+    "manifest_v1.json",
+]
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for name in ARTIFACTS:
+        shutil.copy(f"models/{name}", tmp_path / name)
+    return tmp_path
+
+
+def _add_version(models_dir, version, threshold=None, parity="parity_v1.npz"):
+    manifest = json.loads((models_dir / "manifest_v1.json").read_text())
+    manifest["version"] = version
+    manifest["parity"] = parity
+
+    if threshold is not None:
+        thresholds = json.loads((models_dir / "thresholds_v1.json").read_text())
+        thresholds["isolation_forest"]["threshold_value"] = threshold
+        (models_dir / f"thresholds_{version}.json").write_text(json.dumps(thresholds))
+        manifest["artifacts"]["thresholds"] = f"thresholds_{version}.json"
+
+    (models_dir / f"manifest_{version}.json").write_text(json.dumps(manifest))
+
+
+def test_reload_swaps_without_touching_held_service(models_dir):
+    registry = ModelRegistry(str(models_dir))
+    in_flight = registry.active
+    assert in_flight.version == "v1"
+
+    _add_version(models_dir, "v2", threshold=0.05)
+    assert registry.versions() == ["v1", "v2"]
+    assert registry.reload(wait=True)
+
+    assert registry.active.version == "v2"
+    assert registry.active.threshold == 0.05
+    assert registry.last_reload["status"] == "active"
+
+    # A request that took the old service before the swap still scores
+    X = np.zeros((3, len(in_flight.features)))
+    np.testing.assert_array_equal(in_flight.predict_batch(X), registry.predict_batch(X))
+
+
+def test_failed_parity_rolls_back(models_dir):
+    registry = ModelRegistry(str(models_dir), version="v1")
+
+    with np.load(models_dir / "parity_v1.npz") as reference:
+        np.savez(
+            models_dir / "parity_v9.npz", X=reference["X"], scores=reference["scores"] + 0.1
+        )
+    _add_version(models_dir, "v9", parity="parity_v9.npz")
+
+    assert registry.reload("v9", wait=True)
+    assert registry.active.version == "v1"
+    assert registry.last_reload["status"] == "rolled_back"
+    assert "parity" in registry.last_reload["error"]
+
+
+def _record_calls(service, calls):
+    score = service.predict_batch
+
+    def predict_batch(X):
+        calls.append((service.version, len(X)))
+        return score(X)
+
+    service.predict_batch = predict_batch
+
+
+def test_queued_requests_keep_their_version_across_swap(models_dir):
+    registry = ModelRegistry(str(models_dir))
+    _add_version(models_dir, "v2", threshold=0.05)
+    calls = []
+
+    async def scenario():
+        batcher = MicroBatcher(registry.predict_batch, max_wait_us=200_000)
+        X = np.zeros((5, len(registry.active.features)))
+
+        old = registry.active
+        _record_calls(old, calls)
+        queued = [asyncio.create_task(batcher.submit(x, old.predict_batch)) for x in X[:3]]
+        await asyncio.sleep(0)
+
+        # Swap while the first rows wait in the micro-batch window
+        assert registry.reload(wait=True)
+        new = registry.active
+        _record_calls(new, calls)
+        queued += [asyncio.create_task(batcher.submit(x, new.predict_batch)) for x in X[3:]]
+
+        scores = await asyncio.gather(*queued)
+        await batcher.stop()
+        return scores
+
+    scores = asyncio.run(scenario())
+
+    assert registry.active.version == "v2"
+    assert calls == [("v1", 3), ("v2", 2)]
+    assert len(scores) == 5
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.models.autoencoder import compute_reconstruction_error, load_autoencoder
+from src.models.numpy_autoencoder import export_autoencoder
+
+
+def test_numpy_export_matches_keras_weights(tmp_path):
+    pytest.importorskip("h5py")
+
+    # Re-export and compare with the committed artifact
+    exported = export_autoencoder(
+        "models/autoencoder_v1.keras", tmp_path / "autoencoder.npz"
+    )
+    committed = load_autoencoder("models/autoencoder_v1.npz")
+
+    assert exported.activations == committed.activations
+    for a, b in zip(exported.kernels + exported.biases, committed.kernels + committed.biases):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_numpy_autoencoder_matches_keras():
+    pytest.importorskip("tensorflow")
+
+    keras_model = load_autoencoder("models/autoencoder_v1.keras")
+    numpy_model = load_autoencoder("models/autoencoder_v1.npz")
+
+    rng = np.random.default_rng(42)
+    X_scaled = rng.normal(size=(2000, 9))
+
+    np.testing.assert_allclose(
+        compute_reconstruction_error(numpy_model, X_scaled),
+        compute_reconstruction_error(keras_model, X_scaled),
+        rtol=1e-4,
+        atol=1e-6,
+    )
@@ -0,0 +1,49 @@
+import json
+import pickle
+
+import joblib
+import numpy as np
+
+from src.models.one_class_svm_approx import (
+    ApproximateOneClassSVM,
+    parity_report,
+    split_fit_holdout,
+)
+from src.utils.storage import load_columns
+
+
+def test_approximation_on_held_out_rows():
+    scaler = joblib.load("models/standard_scaler_v1.pkl")
+    svm_model = joblib.load("models/one_class_svm_v1.pkl")
+    approx = joblib.load("models/one_class_svm_v1_approx.pkl")
+
+    with open("models/model_features_v1.json") as f:
+        features = json.load(f)["features"]
+    with open("models/thresholds_v1.json") as f:
+        threshold = json.load(f)["one_class_svm"]["threshold_value"]
+
+    df = load_columns("data/processed/transactions_features.csv", features)
+    X_scaled = scaler.transform(df[features].to_numpy())
+
+    # Rows the ridge never saw (subsampled to keep the exact SVM quick)
+    _, holdout_rows = split_fit_holdout(len(X_scaled), approx.n_fit_samples, approx.random_state)
+    rows = np.random.default_rng(0).choice(holdout_rows, size=20_000, replace=False)
+
+    report = parity_report(svm_model, approx, X_scaled[rows], threshold)
+    print(report)
+
+    # Exported model: ~1.3% flagged vs ~1.0%, 84% of exact flags recalled
+    assert 0.5 <= report["approx_anomaly_rate"] / report["exact_anomaly_rate"] <= 1.6
+    assert report["exact_flags_recalled"] >= 0.75
+    assert report["spearman"] >= 0.95
+
+
+def test_split_and_pickle_module_path():
+    fit_rows, holdout_rows = split_fit_holdout(100, 30, random_state=1)
+    assert len(fit_rows) == 30 and len(holdout_rows) == 70
+    assert not np.intersect1d(fit_rows, holdout_rows).size
+
+    # Artifact must unpickle without the exporting script's __main__
+    approx = joblib.load("models/one_class_svm_v1_approx.pkl")
+    assert type(approx).__module__ == "src.models.one_class_svm_approx"
+    assert isinstance(pickle.loads(pickle.dumps(approx)), ApproximateOneClassSVM)
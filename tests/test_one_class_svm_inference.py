@@ -1,7 +1,7 @@
 import json
-import pandas as pd
 import joblib
 
+from src.utils.storage import load_columns
 from src.models.one_class_svm import run_one_class_svm
 
 
@@ -19,7 +19,8 @@ def test_one_class_svm_inference():
 
     
     # Load data
-    df = pd.read_csv("data/processed/transactions_features.csv")
+    # Only the model columns
+    df = load_columns("data/processed/transactions_features.csv", FEATURES)
 
     X = df[FEATURES]
     X_scaled = scaler.transform(X)
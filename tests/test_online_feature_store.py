@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_engineering.behavioral_features import add_behavioral_features
+from src.feature_engineering.online_features import (
+    CustomerStateStore,
+    FeatureVectorBuilder,
+    build_online_feature_matrix,
+)
+from src.feature_engineering.preprocess import build_features
+from src.utils.config import PROCESSED_DATA_DIR, RAW_TRANSACTIONS_PATH
+from src.utils.storage import load_columns
+
+
+BEHAVIORAL_FEATURES = [
+    "time_since_last_txn_sec",
+    "txn_count_1h",
+    "txn_count_24h",
+    "avg_amount_24h",
+    "travel_speed_kmh",
+]
+
+
+def make_transactions(n: int = 3000, n_customers: int = 40, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-01-01")
+
+    return pd.DataFrame(
+        {
+            "transaction_id": [f"TXN_{i:08d}" for i in range(n)],
+            "customer_id": rng.choice(
+                [f"CUST_{i:05d}" for i in range(n_customers)], size=n
+            ),
+            # Minute-level gaps so 1h / 24h windows see real history
+            "timestamp": start + pd.to_timedelta(
+                rng.integers(0, 14 * 24 * 60, size=n), unit="min"
+            ),
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+            "merchant_lat": rng.uniform(11, 29, size=n),
+            "merchant_long": rng.uniform(72, 81, size=n),
+            "hour": 0,
+        }
+    )
+
+
+def test_online_state_matches_batch_features():
+    df = make_transactions()
+    batch = add_behavioral_features(df)
+
+    # Stream in the same (customer, timestamp) order the batch path uses
+    store = CustomerStateStore()
+    online = pd.DataFrame(
+        [
+            store.update(
+                row.customer_id,
+                row.timestamp.to_pydatetime(),
+                row.amount,
+                row.merchant_lat,
+                row.merchant_long,
+            )
+            for row in batch.sort_values("timestamp", kind="stable").itertuples()
+        ],
+        index=batch.sort_values("timestamp", kind="stable").index,
+    ).sort_index()
+
+    for col in BEHAVIORAL_FEATURES:
+        np.testing.assert_allclose(
+            online[col].values, batch[col].values, rtol=1e-9, atol=1e-6
+        )
+
+
+def test_lru_cap_evicts_least_recent_customer():
+    store = CustomerStateStore(max_customers=2)
+    ts = pd.Timestamp("2025-01-01").to_pydatetime()
+
+    store.update("CUST_00001", ts, 100.0)
+    store.update("CUST_00002", ts, 100.0)
+    store.update("CUST_00001", ts, 100.0)
+    store.update("CUST_00003", ts, 100.0)
+
+    assert len(store) == 2
+    assert "CUST_00001" in store
+    assert "CUST_00002" not in store
+
+
+def test_missing_coordinates_keep_last_known_location():
+    store = CustomerStateStore()
+    start = pd.Timestamp("2025-01-01 10:00")
+
+    store.update("CUST_00001", start, 100.0, 19.07, 72.87)
+    unknown = store.update("CUST_00001", start + pd.Timedelta(minutes=10), 100.0)
+    # Next known location is compared with Mumbai, not with (0, 0)
+    nearby = store.update(
+        "CUST_00001", start + pd.Timedelta(minutes=30), 100.0, 19.08, 72.88
+    )
+
+    assert unknown["travel_speed_kmh"] == 0.0
+    assert unknown["time_since_last_txn_sec"] == 600
+    assert 0 < nearby["travel_speed_kmh"] < 10
+
+
+def test_feature_vector_builder_matches_build_features():
+    features = [
+        "amount_dev_log",
+        "avg_amount_24h",
+        "txn_count_1h",
+        "txn_count_24h",
+        "time_since_last_txn_sec",
+        "distance_from_home",
+        "travel_speed_kmh",
+        "hour_sin",
+        "hour_cos",
+    ]
+    df = make_transactions()
+    df["hour"] = df["timestamp"].dt.hour
+    df["distance_from_home"] = np.arange(len(df), dtype=np.float64)
+    batch = build_features(df)[features].to_numpy()
+
+    # build_features returns rows in (customer, timestamp) order
+    ordered = df.sort_values(["customer_id", "timestamp"]).reset_index(drop=True)
+    builder = FeatureVectorBuilder(features, CustomerStateStore())
+    online = np.empty_like(batch)
+    for i in ordered.sort_values("timestamp", kind="stable").index:
+        txn = ordered.loc[i].to_dict()
+        txn["timestamp"] = txn["timestamp"].to_pydatetime()
+        builder.build(txn, out=online[i])
+
+    np.testing.assert_allclose(online, batch, rtol=1e-9, atol=1e-6)
+
+
+def test_feature_vector_builder_rejects_missing_fields():
+    store = CustomerStateStore()
+    builder = FeatureVectorBuilder(["hour_sin", "distance_from_home"], store)
+    txn = {
+        "customer_id": "CUST_00001",
+        "timestamp": pd.Timestamp("2025-01-01").to_pydatetime(),
+        "amount": 10.0,
+        "hour": 0,
+    }
+
+    with pytest.raises(ValueError):
+        builder.build(txn)
+    assert "CUST_00001" not in store
+
+
+def test_online_features_match_processed_dataset():
+    features = BEHAVIORAL_FEATURES + ["amount_dev_log", "hour_sin", "hour_cos"]
+    processed = load_columns(PROCESSED_DATA_DIR / "transactions_features.csv", features)
+    raw = pd.read_csv(RAW_TRANSACTIONS_PATH)
+    raw["timestamp"] = pd.to_datetime(raw["timestamp"])
+
+    # Processed rows are in the (customer, timestamp) order build_features sorts to
+    raw = raw.sort_values(["customer_id", "timestamp"], kind="stable")
+    txns = [
+        {**row, "timestamp": row["timestamp"].to_pydatetime()}
+        for row in raw.to_dict("records")
+    ]
+    online = build_online_feature_matrix(txns, CustomerStateStore(), features)
+
+    np.testing.assert_allclose(
+        online, processed[features].to_numpy(), rtol=1e-9, atol=1e-6
+    )
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering.behavioral_features import add_behavioral_features
+
+
+def test_parallel_features_match_serial():
+    rng = np.random.default_rng(11)
+    n = 4000
+
+    df = pd.DataFrame(
+        {
+            "transaction_id": np.arange(n),
+            "customer_id": [f"CUST_{c:05d}" for c in rng.integers(0, 200, size=n)],
+            "timestamp": pd.Timestamp("2025-01-01")
+            + pd.to_timedelta(rng.integers(0, 5 * 24 * 60, size=n), unit="min"),
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+            "merchant_lat": rng.uniform(11, 29, size=n),
+            "merchant_long": rng.uniform(72, 81, size=n),
+            "hour": rng.integers(0, 24, size=n),
+        }
+    )
+
+    serial = add_behavioral_features(df)
+    parallel = add_behavioral_features(df, n_jobs=3)
+
+    pd.testing.assert_frame_equal(parallel, serial, check_exact=True)
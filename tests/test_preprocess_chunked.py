@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering.preprocess import (
+    build_features,
+    run_feature_engineering_chunked,
+)
+
+
+def test_chunked_pipeline_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 5000
+
+    # Raw file in arbitrary (non customer-sorted) order
+    raw = pd.DataFrame(
+        {
+            "transaction_id": [f"TXN_{i:08d}" for i in range(n)],
+            "customer_id": [f"CUST_{c:05d}" for c in rng.integers(0, 300, size=n)],
+            "card_number": "abc",
+            "timestamp": (
+                pd.Timestamp("2025-01-01")
+                + pd.to_timedelta(rng.integers(0, 10 * 24 * 60, size=n), unit="min")
+            ).astype(str),
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+            "merchant_lat": rng.uniform(11, 29, size=n),
+            "merchant_long": rng.uniform(72, 81, size=n),
+            "distance_from_home": rng.uniform(0, 50, size=n).round(2),
+            "hour": rng.integers(0, 24, size=n),
+            "is_fraud": 0,
+            "fraud_type": "none",
+        }
+    )
+    raw_path = tmp_path / "transactions_raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    in_memory_path = tmp_path / "in_memory.csv"
+    build_features(pd.read_csv(raw_path)).to_csv(in_memory_path, index=False)
+
+    chunked_path = tmp_path / "chunked.csv"
+    run_feature_engineering_chunked(raw_path, chunked_path, chunksize=700, tmp_dir=tmp_path)
+
+    assert chunked_path.read_bytes() == in_memory_path.read_bytes()
@@ -0,0 +1,98 @@
+import pytest
+
+from src.data_generation.entity_tables import (
+    generate_customer_table,
+    generate_merchant_table,
+    merchant_table_from_records,
+)
+from src.feature_engineering.reference_index import ReferenceIndex
+from src.utils.geo_utils import haversine_distance
+
+
+@pytest.fixture
+def index(tmp_path):
+    generate_customer_table(300, seed=1).save(tmp_path / "customers")
+    generate_merchant_table(200, seed=1).save(tmp_path / "merchants")
+    return ReferenceIndex.load(tmp_path / "customers", tmp_path / "merchants")
+
+
+def test_enrich_derives_geo_features(index):
+    txn = index.enrich(
+        {"customer_id": "CUST_00042", "merchant_id": "MERCHANT_00107", "amount": 10.0}
+    )
+
+    merchants = index.merchants
+    assert txn["merchant_lat"] == merchants["merchant_lat"][107]
+    assert txn["merchant_category"] in merchants.meta["category_code"]
+
+    home_lat, home_lon = index.customer_home("CUST_00042")
+    expected = haversine_distance(home_lat, home_lon, txn["merchant_lat"], txn["merchant_long"])
+    assert txn["distance_from_home"] == round(float(expected), 2)
+
+
+def test_client_distance_is_kept(index):
+    txn = index.enrich(
+        {"customer_id": "CUST_99999", "merchant_id": "MERCHANT_00001", "distance_from_home": 3.5}
+    )
+    assert txn["distance_from_home"] == 3.5
+
+
+def test_generated_tables_use_positional_lookup(index):
+    # Flag saved in meta.json: no id → row dict is built at startup
+    assert index._customer_rows._rows is None
+    assert index._merchant_rows._rows is None
+    assert index.merchant("MERCHANT_00199") is not None
+
+
+def test_unknown_ids_are_rejected(index):
+    assert index.customer_home("CUST_00300") is None
+    assert index.merchant("MERCHANT_0001X") is None
+
+    with pytest.raises(ValueError):
+        index.enrich({"customer_id": "CUST_00001", "merchant_id": "MERCHANT_09999"})
+    with pytest.raises(ValueError):
+        index.enrich({"customer_id": "CUST_00001", "merchant_id": None})
+
+
+def test_non_positional_ids_use_hash_lookup():
+    merchants = merchant_table_from_records(
+        [
+            {
+                "merchant_id": name,
+                "merchant_category": "grocery",
+                "city": "Mumbai",
+                "merchant_lat": 19.0 + i,
+                "merchant_long": 72.8,
+            }
+            for i, name in enumerate(["M_B", "M_A"])
+        ]
+    )
+    index = ReferenceIndex(merchants=merchants)
+
+    assert index.merchant("M_A")["merchant_lat"] == 20.0
+    assert index.merchant("M_C") is None
+
+
+def test_mismatch_inside_positional_ids_uses_hash_lookup():
+    names = [f"M_{i:02d}" for i in range(6)]
+    names[2], names[3] = names[3], names[2]
+    merchants = merchant_table_from_records(
+        [
+            {
+                "merchant_id": name,
+                "merchant_category": "grocery",
+                "city": "Mumbai",
+                "merchant_lat": 19.0 + i,
+                "merchant_long": 72.8,
+            }
+            for i, name in enumerate(names)
+        ]
+    )
+    index = ReferenceIndex(merchants=merchants)
+
+    # Tables built from records are not flagged positional, even when the
+    # first and last ids look it
+    assert index._merchant_rows._rows is not None
+    assert index.merchant("M_03")["merchant_lat"] == 21.0
+    assert index.merchant("M_02")["merchant_lat"] == 22.0
+    assert index.merchant("M_05")["merchant_lat"] == 24.0
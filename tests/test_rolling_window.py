@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import rolling_window
+from src.feature_engineering.rolling_window import (
+    WINDOW_FEATURES,
+    _pandas_window_features,
+    compute_window_features,
+    timestamps_to_ns,
+)
+
+
+def make_sorted_transactions(n: int = 20000, n_customers: int = 500, seed: int = 7):
+    rng = np.random.default_rng(seed)
+
+    customer = rng.integers(0, n_customers, size=n)
+    # Second-level timestamps over a week: plenty of ties and dense windows
+    ts = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 7 * 24 * 3600, size=n) // 600 * 600, unit="s"
+    )
+
+    df = pd.DataFrame(
+        {
+            "customer_id": [f"CUST_{c:05d}" for c in customer],
+            "transaction_id": np.arange(n),
+            "timestamp": ts,
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+            "merchant_lat": rng.uniform(11, 29, size=n),
+            "merchant_long": rng.uniform(72, 81, size=n),
+        }
+    )
+    return df.sort_values(["customer_id", "timestamp"]).reset_index(drop=True)
+
+
+def test_sweep_matches_pandas_rolling(monkeypatch):
+    df = make_sorted_transactions()
+    expected = _pandas_window_features(df)
+
+    # Tiny blocks so the block splitting is exercised too
+    monkeypatch.setattr(rolling_window, "_BLOCK_ROWS", 1000)
+
+    out = {name: np.full(len(df), np.nan) for name in WINDOW_FEATURES}
+    result = compute_window_features(
+        pd.factorize(df["customer_id"])[0],
+        timestamps_to_ns(df["timestamp"]),
+        df["amount"].to_numpy(),
+        df["merchant_lat"].to_numpy(),
+        df["merchant_long"].to_numpy(),
+        out=out,
+    )
+
+    assert result is out
+    for name in WINDOW_FEATURES:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-9, atol=1e-6)
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import numpy as np
+
+from app.model_loader import ModelService
+
+
+def test_service_import_skips_heavy_modules():
+    # Fresh interpreter: the serving path must not pull in pandas / sklearn
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('pandas', 'sklearn', 'tensorflow') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_fused_forest_is_memory_mapped():
+    service = ModelService("v1")
+
+    assert isinstance(service.model.threshold, np.memmap)
+    # Traversal reads the saved interleaved children, not a private copy
+    assert isinstance(service.model.children, np.memmap)
+    assert service.model.input_dtype == "float64"
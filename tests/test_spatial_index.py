@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.utils.geo_utils import pairwise_haversine
+from src.utils.spatial_index import GeoIndex
+
+
+def _points(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(8, 32, size=n), rng.uniform(70, 90, size=n)
+
+
+def test_knn_matches_brute_force():
+    lat, lon = _points(500, 0)
+    q_lat, q_lon = _points(50, 1)
+
+    distances, rows = GeoIndex(lat, lon).query_knn(q_lat, q_lon, k=5)
+
+    brute = pairwise_haversine(q_lat, q_lon, lat, lon)
+    expected = np.argsort(brute, axis=1)[:, :5]
+    np.testing.assert_array_equal(rows, expected)
+    np.testing.assert_allclose(distances, np.take_along_axis(brute, expected, axis=1))
+
+
+def test_radius_query_is_csr():
+    lat, lon = _points(500, 2)
+    q_lat, q_lon = _points(40, 3)
+
+    rows, distances, offsets = GeoIndex(lat, lon).query_radius(q_lat, q_lon, 150.0, sort=True)
+
+    brute = pairwise_haversine(q_lat, q_lon, lat, lon)
+    assert len(offsets) == 41
+    for i in range(40):
+        found = rows[offsets[i] : offsets[i + 1]]
+        assert set(found) == set(np.flatnonzero(brute[i] <= 150.0))
+        assert np.all(np.diff(distances[offsets[i] : offsets[i + 1]]) >= 0)
+
+
+def test_k_is_capped_and_empty_radius():
+    index = GeoIndex([19.0, 28.6], [72.8, 77.2])
+
+    distances, rows = index.query_knn([19.0], [72.8], k=10)
+    assert rows.shape == (1, 2)
+    assert rows[0, 0] == 0 and distances[0, 0] < 1e-6
+
+    rows, _, offsets = index.query_radius([0.0], [0.0], 1.0)
+    assert len(rows) == 0 and offsets.tolist() == [0, 0]
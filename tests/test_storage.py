@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.utils.storage import load_columns, read_dataset, write_dataset
+
+
+def make_frame(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    timestamp = pd.Timestamp("2025-01-01") + pd.to_timedelta(
+        rng.integers(0, 90 * 24 * 60, size=n), unit="min"
+    )
+    return pd.DataFrame(
+        {
+            "transaction_id": [f"TXN_{i:08d}" for i in range(n)],
+            "customer_id": [f"CUST_{c:05d}" for c in rng.integers(0, 100, size=n)],
+            "merchant_id": [f"MERCHANT_{m:05d}" for m in rng.integers(0, 50, size=n)],
+            "timestamp": timestamp,
+            "amount": rng.lognormal(6.5, 0.6, size=n).round(2),
+            "hour": timestamp.hour,
+            "txn_count_24h": rng.integers(1, 9, size=n).astype(float),
+            "is_fraud": 0,
+        }
+    )
+
+
+def test_round_trip_with_compact_dtypes(tmp_path):
+    df = make_frame()
+    path = tmp_path / "transactions.parquet"
+    write_dataset(df, path)
+
+    # Rows come back in written order, not partition order
+    out = read_dataset(path)
+
+    assert set(out.columns) == set(df.columns)
+    assert isinstance(out["customer_id"].dtype, pd.CategoricalDtype)
+    assert out["hour"].dtype == np.int8
+    assert out["txn_count_24h"].dtype == np.float32
+    assert out["amount"].dtype == np.float64
+
+    pd.testing.assert_series_equal(out["amount"], df["amount"])
+    assert out["customer_id"].astype(str).tolist() == df["customer_id"].tolist()
+
+    # Partitioned by customer bucket and month
+    assert len(list(path.glob("customer_bucket=*/txn_date=2025-0*"))) > 8
+
+
+def test_projection_and_partition_filters(tmp_path):
+    df = make_frame()
+    path = tmp_path / "transactions.parquet"
+    write_dataset(df, path)
+
+    projected = read_dataset(path, columns=["amount", "hour"])
+    assert list(projected.columns) == ["amount", "hour"]
+    assert len(projected) == len(df)
+
+    bucket = read_dataset(path, filters=[("customer_bucket", "=", 3)])
+    assert 0 < len(bucket) < len(df)
+    assert bucket["customer_id"].nunique() < df["customer_id"].nunique()
+
+
+def test_load_columns_reads_parquet_only_on_request(tmp_path):
+    df = make_frame()
+    csv_path = tmp_path / "transactions.csv"
+    df.to_csv(csv_path, index=False)
+    write_dataset(df, tmp_path / "transactions.parquet")
+
+    from_csv = load_columns(csv_path, ["txn_count_24h"])
+    assert from_csv["txn_count_24h"].dtype == np.float64
+
+    # Parquet copy comes back in CSV row order, as float32 features
+    from_parquet = load_columns(csv_path, ["amount", "txn_count_24h"], parquet=True)
+    assert from_parquet["txn_count_24h"].dtype == np.float32
+    np.testing.assert_array_equal(from_parquet["amount"], df["amount"])
+    np.testing.assert_array_equal(from_parquet["txn_count_24h"], from_csv["txn_count_24h"])
+
+    # A copy older than the CSV is refused
+    csv_path.touch()
+    parquet_mtime = csv_path.stat().st_mtime - 60
+    os.utime(tmp_path / "transactions.parquet", (parquet_mtime, parquet_mtime))
+    with pytest.raises(ValueError, match="older"):
+        load_columns(csv_path, ["amount"], parquet=True)
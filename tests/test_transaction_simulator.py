@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from src.data_generation.entity_tables import (
+    generate_customer_table,
+    generate_merchant_table,
+)
+from src.data_generation.transaction_simulator import (
+    TRANSACTION_COLUMNS,
+    iter_transaction_chunks,
+    simulate_transactions_sharded,
+    write_transactions,
+    write_transactions_sharded,
+)
+from src.utils.config import SIMULATION_DAYS, START_DATE
+
+
+def _profiles(n_customers=50, n_merchants=40):
+    cities = ["Mumbai", "Delhi", "Pune"]
+    coords = {"Mumbai": (19.08, 72.88), "Delhi": (28.70, 77.10), "Pune": (18.52, 73.86)}
+    customers = [
+        {
+            "customer_id": f"CUST_{i:05d}",
+            "card_number": f"{i:016d}",
+            "home_city": cities[i % 3],
+            "home_lat": coords[cities[i % 3]][0] + 0.05,
+            "home_lon": coords[cities[i % 3]][1],
+            "avg_amount": 800.0,
+            "amount_std": 200.0,
+            "daily_txn_rate": 1 + i % 4,
+        }
+        for i in range(n_customers)
+    ]
+    merchants = [
+        {
+            "merchant_id": f"MERCHANT_{i:05d}",
+            "merchant_category": "retail",
+            "city": cities[i % 3],
+            "merchant_lat": coords[cities[i % 3]][0] + i * 0.001,
+            "merchant_long": coords[cities[i % 3]][1],
+        }
+        for i in range(n_merchants)
+    ]
+    return customers, merchants
+
+
+def test_chunks_stay_in_simulation_window():
+    customers, merchants = _profiles()
+    chunks = list(
+        iter_transaction_chunks(
+            customers, merchants, 25_000, chunk_size=4000, rng=np.random.default_rng(0)
+        )
+    )
+    df = pd.concat(chunks, ignore_index=True)
+
+    assert [len(c) for c in chunks] == [4000] * 6 + [1000]
+    assert list(df.columns) == TRANSACTION_COLUMNS
+    assert df["transaction_id"].is_unique
+
+    start = pd.Timestamp(START_DATE)
+    assert df["timestamp"].min() >= start
+    assert df["timestamp"].max() <= start + pd.Timedelta(days=SIMULATION_DAYS)
+    assert (df["amount"] >= 10.0).all()
+
+    # Most merchants are the ones near the customer's home
+    home = df["customer_id"].str[-5:].astype(int) % 3
+    merchant_city = df["merchant_id"].str[-5:].astype(int) % 3
+    assert 0.9 < (home == merchant_city).mean() < 0.96
+
+
+def test_write_transactions_streams_all_rows(tmp_path):
+    customers, merchants = _profiles()
+    out_path = tmp_path / "transactions.csv"
+
+    rows = write_transactions(customers, merchants, out_path, 10_000, chunk_size=3000)
+
+    df = pd.read_csv(out_path)
+    assert rows == len(df) == 10_000
+    assert df["transaction_id"].iloc[-1] == "TXN_00009999"
+
+
+def test_sharded_generation_is_independent_of_workers(tmp_path):
+    customers = generate_customer_table(200, seed=7)
+    merchants = generate_merchant_table(100, seed=7)
+
+    assert generate_customer_table(200, seed=8)["avg_amount"][0] != customers["avg_amount"][0]
+
+    serial = simulate_transactions_sharded(customers, merchants, 5000, n_shards=4, seed=7)
+    parallel = simulate_transactions_sharded(
+        customers, merchants, 5000, n_shards=4, n_jobs=2, seed=7
+    )
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["transaction_id"].tolist() == [f"TXN_{i:08d}" for i in range(5000)]
+
+    rows = write_transactions_sharded(
+        customers, merchants, tmp_path, 5000, n_shards=4, n_jobs=2, seed=7
+    )
+    streamed = pd.concat(
+        [pd.read_csv(path) for path in sorted(tmp_path.glob("part-*.csv"))],
+        ignore_index=True,
+    )
+    assert rows == 5000
+    assert streamed["amount"].tolist() == serial["amount"].tolist()